@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+
+# pylint: disable=line-too-long
+"""
+
+Converts the save of a Clan between the directory layout (one JSON file per cat record)
+and the packed layout (a single clan_data.db file in the Clan folder).
+The game uses the packed layout for every Clan which has a clan_data.db file.
+
+Usage:
+    python convert_save.py Thunder --to packed
+    python convert_save.py Thunder --to directory
+
+"""  # pylint: enable=line-too-long
+# The dummy drivers have to be set before pygame is imported anywhere.
+import os
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import argparse
+import sys
+
+from scripts.housekeeping.datadir import get_save_dir, setup_data_dir
+
+try:
+    directory = os.path.dirname(__file__)
+except NameError:
+    directory = os.getcwd()
+if directory:
+    os.chdir(directory)
+
+setup_data_dir()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Convert a Clan save between the directory and packed layout."
+    )
+    parser.add_argument("clan", help="name of the Clan, as in the save folder")
+    parser.add_argument(
+        "--to", choices=["packed", "directory"], required=True, help="target layout"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    from scripts.game_structure.game_essentials import Game
+    from scripts.game_structure.save_storage import (
+        convert_to_directory,
+        convert_to_packed,
+    )
+
+    clan_dir = f"{get_save_dir()}/{args.clan}"
+    if not os.path.isdir(clan_dir):
+        print(f"Clan {args.clan} not found in {get_save_dir()}.")
+        return 1
+
+    if args.to == "packed":
+        convert_to_packed(clan_dir)
+    else:
+        convert_to_directory(clan_dir, Game.safe_save)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
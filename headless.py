@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+
+# pylint: disable=line-too-long
+"""
+
+Headless moon-skip simulator.
+
+Loads a save, runs Events.one_moon() for a number of moons and writes the resulting save, without opening
+a window, playing the loading animation or building any screens. Sprite sheets are never loaded.
+Reports moons per second and per-phase timings (see scripts/housekeeping/profiler.py),
+so simulation throughput can be tracked.
+
+Usage:
+    python headless.py -n 1000
+    python headless.py -n 200 --clan Thunder --save-every 50 --seed 42
+    python headless.py -n 100 --no-save
+    python headless.py -n 100 --no-save --profile-report
+
+"""  # pylint: enable=line-too-long
+# The dummy drivers have to be set before pygame is imported anywhere.
+import os
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import argparse
+import logging
+import random
+import sys
+import time
+
+from scripts.housekeeping.datadir import setup_data_dir
+
+try:
+    directory = os.path.dirname(__file__)
+except NameError:
+    directory = os.getcwd()
+if directory:
+    os.chdir(directory)
+
+setup_data_dir()
+
+logging.basicConfig(
+    format="%(name)s - %(levelname)s - %(filename)s / %(funcName)s / %(lineno)d - %(message)s",
+    level=logging.WARNING,
+)
+logger = logging.getLogger("headless")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run moon skips on a save without the game window."
+    )
+    parser.add_argument(
+        "-n", "--moons", type=int, default=1, help="number of moons to skip"
+    )
+    parser.add_argument(
+        "--clan", default=None, help="name of the Clan to load (default: current Clan)"
+    )
+    parser.add_argument(
+        "--save-every",
+        type=int,
+        default=0,
+        help="also save after every N moons (default: only at the end)",
+    )
+    parser.add_argument(
+        "--no-save", action="store_true", help="don't write the save afterwards"
+    )
+    parser.add_argument("--seed", type=int, default=None, help="seed for random")
+    parser.add_argument(
+        "--profile-report",
+        action="store_true",
+        help="also write the phase timings as JSON and CSV to the log folder",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    # Load game
+    from scripts.game_structure.game_essentials import game
+    from scripts.game_structure.load_cat import load_cats, version_convert
+    from scripts.cat.cats import Cat
+    from scripts.clan import clan_class
+    from scripts.events import events_class
+    from scripts.housekeeping.profiler import profiler
+
+    clan_list = game.read_clans()
+    if not clan_list:
+        print("No Clans found in the save directory.")
+        return 1
+    if args.clan:
+        if args.clan not in clan_list:
+            print(f"Clan {args.clan} not found. Available: {', '.join(clan_list)}")
+            return 1
+        clan_list.remove(args.clan)
+        clan_list.insert(0, args.clan)
+    game.switches["clan_list"] = clan_list
+
+    start = time.perf_counter()
+    load_cats()
+    version_info = clan_class.load_clan()
+    version_convert(version_info)
+    game.load_events()
+    print(
+        f"Loaded {game.clan.name}Clan ({len(Cat.all_cats)} cats, moon {game.clan.age}) "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+
+    profiler.enable(write_reports=False)
+
+    def save():
+        game.save_cats()
+        game.clan.save_clan()
+        game.clan.save_pregnancy(game.clan)
+        game.save_events()
+
+    moon_time = 0.0
+    try:
+        for i in range(1, args.moons + 1):
+            start = time.perf_counter()
+            events_class.one_moon()
+            moon_time += time.perf_counter() - start
+
+            if args.save_every and i % args.save_every == 0 and not args.no_save:
+                save()
+            if not game.clan.age % 50:
+                print(f"moon {game.clan.age}: {len(Cat.all_cats)} cats")
+
+        if not args.no_save:
+            save()
+    finally:
+        profiler.disable()
+
+    print(
+        f"{args.moons} moons in {moon_time:.2f}s "
+        f"({args.moons / moon_time if moon_time else 0:.2f} moons/s), "
+        f"{len(Cat.all_cats)} cats now"
+    )
+    print(profiler.report(args.moons))
+    if args.profile_report:
+        for path in profiler.write_report():
+            print(f"Wrote {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -62,7 +62,7 @@ del find_spec
 
 from scripts.housekeeping.log_cleanup import prune_logs
 from scripts.housekeeping.stream_duplexer import UnbufferedStreamDuplexer
-from scripts.housekeeping.datadir import get_log_dir, setup_data_dir
+from scripts.housekeeping.datadir import get_log_dir, get_save_dir, setup_data_dir
 from scripts.housekeeping.version import get_version_info, VERSION_NAME
 
 try:
@@ -161,10 +161,15 @@ from scripts.game_structure.windows import SaveCheck
 from scripts.game_structure.game_essentials import game
 from scripts.game_structure.screen_settings import screen_scale, MANAGER, screen
 from scripts.game_structure.discord_rpc import _DiscordRPC
+from scripts.cat.cats import Cat
+from scripts.cat.sprite_atlas import SPRITE_ATLAS_FILE_NAME, sprite_atlas
 from scripts.cat.sprites import sprites
 from scripts.clan import clan_class
 from scripts.utility import (
     quit,
+    prerender_sprites,
+    prewarm_sprite_sheets,
+    ui_scale_dimensions,
 )  # pylint: disable=redefined-builtin
 from scripts.debug_menu import debugmode
 import pygame
@@ -200,7 +205,20 @@ def load_data():
             version_info = clan_class.load_clan()
             version_convert(version_info)
             game.load_events()
+            # compose the sprites here, instead of on the main thread when the first screen is built
+            sprite_atlas.load(
+                f"{get_save_dir()}/{game.clan.name}/{SPRITE_ATLAS_FILE_NAME}"
+            )
+            # the sheets of living cats are needed as soon as they age, the others are loaded when needed
+            prewarm_sprite_sheets(
+                cat for cat in Cat.all_cats.values() if not cat.dead
+            )
+            prerender_sprites(
+                Cat.all_cats.values(), button_sizes=[ui_scale_dimensions((50, 50))]
+            )
             scripts.screens.screens_core.screens_core.rebuild_core()
+            # the backgrounds are processed when first shown, except for the one of the current season
+            scripts.screens.screens_core.screens_core.prewarm_bgs()
         except Exception as e:
             logging.exception("File failed to load")
             if not game.switches["error_message"]:
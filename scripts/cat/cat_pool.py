@@ -0,0 +1,82 @@
+"""
+Contains the CatPool class, used to keep track of which cats are where
+"""
+
+from random import randrange
+from typing import Iterable, Iterator, Optional
+
+
+class CatPool:
+    """
+    An unordered collection of cats, which allows adding, removing and picking a random cat in constant time.
+    The cats are kept in a list, with a dictionary holding the position of every ID in that list.
+    """
+
+    __slots__ = ("_cats", "_positions")
+
+    def __init__(self):
+        self._cats = []
+        self._positions = {}
+
+    def __len__(self) -> int:
+        return len(self._cats)
+
+    def __contains__(self, cat) -> bool:
+        return cat.ID in self._positions
+
+    def __iter__(self) -> Iterator:
+        return iter(self._cats.copy())
+
+    def add(self, cat):
+        if cat.ID in self._positions:
+            return
+        self._positions[cat.ID] = len(self._cats)
+        self._cats.append(cat)
+
+    def discard(self, cat):
+        position = self._positions.pop(cat.ID, None)
+        if position is None:
+            return
+        last = self._cats.pop()
+        if position < len(self._cats):
+            # fill the gap with the last cat
+            self._cats[position] = last
+            self._positions[last.ID] = position
+
+    def clear(self):
+        self._cats.clear()
+        self._positions.clear()
+
+    def choice(self, exclude=None):
+        """Returns a random cat from the pool which isn't `exclude`, or None if there is no such cat."""
+        return choice_from((self,), exclude)
+
+
+def choice_from(pools: Iterable[CatPool], exclude=None) -> Optional:
+    """
+    Returns a random cat out of all given pools, each cat having the same chance.
+    The cat `exclude` is never chosen. Returns None if there is no cat to choose.
+    """
+    pools = tuple(pools)
+    total = 0
+    skip = None
+    for pool in pools:
+        if exclude is not None and skip is None:
+            position = pool._positions.get(exclude.ID)
+            if position is not None:
+                skip = total + position
+        total += len(pool._cats)
+
+    if skip is not None:
+        total -= 1
+    if total <= 0:
+        return None
+
+    index = randrange(total)
+    if skip is not None and index >= skip:
+        index += 1
+    for pool in pools:
+        if index < len(pool._cats):
+            return pool._cats[index]
+        index -= len(pool._cats)
+    return None
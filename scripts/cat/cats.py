@@ -13,14 +13,18 @@ from typing import Dict, List, Any
 
 import ujson  # type: ignore
 
+from scripts.cat.cat_pool import CatPool, choice_from
+from scripts.cat.mate_index import MateIndex
+from scripts.cat.faded_cat_cache import FadedCatCache
 from scripts.cat.history import History
 from scripts.cat.names import Name
 from scripts.cat.pelts import Pelt
 from scripts.cat.personality import Personality
 from scripts.cat.skills import CatSkills
+from scripts.cat.sprite_cache import sprite_cache
 from scripts.cat.thoughts import Thoughts
 from scripts.cat_relations.inheritance import Inheritance
-from scripts.cat_relations.relationship import Relationship
+from scripts.cat_relations.relationship import Relationship, RelationshipRow
 from scripts.conditions import (
     Illness,
     Injury,
@@ -132,8 +136,19 @@ class Cat:
     all_cats_list: List[Cat] = []
     ordered_cat_list: List[Cat] = []
 
+    # Every cat in all_cats is in exactly one of these, kept up to date when dead, outside, exiled or df change.
+    clan_pool = CatPool()  # living cats in the clan
+    outside_pool = CatPool()  # living cats outside the clan, including exiled cats
+    starclan_pool = CatPool()
+    darkforest_pool = CatPool()
+    unknown_pool = CatPool()  # dead cats in the Unknown Residence
+    # the cats of clan_pool by age, kept up to date together with the pools
+    mate_index = MateIndex()
+
     grief_strings = {}
 
+    faded_cache = FadedCatCache()  # faded cats loaded by load_faded_cat
+
     def __init__(
         self,
         prefix=None,
@@ -175,6 +190,14 @@ class Cat:
         """
 
         self.history = None
+        self._pool = None  # The CatPool this cat is in, None until the cat is added to all_cats
+        # names of the fields which changed since the cat was last saved or loaded
+        self.changed_fields = set()
+        self._saved_relationship_count = None
+        self._relationships = RelationshipRow(self)
+        self._parent1 = None
+        self._parent2 = None
+        self._adoptive_parents = []
 
         if (
             faded
@@ -206,7 +229,6 @@ class Cat:
         self.patrol_with_mentor = 0
         self.apprentice = []
         self.former_apprentices = []
-        self.relationships = {}
         self.mate = []
         self.previous_mates = []
         self.pronouns = [self.default_pronouns[0].copy()]
@@ -353,6 +375,8 @@ class Cat:
 
         # SAVE CAT INTO ALL_CATS DICTIONARY IN CATS-CLASS
         self.all_cats[self.ID] = self
+        self.update_pool()
+        Inheritance.family_graph.add_cat(self)
 
         if self.ID not in ["0", None]:
             Cat.insert_cat(self)
@@ -520,6 +544,141 @@ class Cat:
                 "\nCat.mentor has to be either None (no mentor) or the mentor's ID as a string."
             )
 
+    @property
+    def parent1(self):
+        return self._parent1
+
+    @parent1.setter
+    def parent1(self, value):
+        self._parent1 = value
+        if self._pool is not None:
+            Inheritance.family_graph.update_cat(self)
+
+    @property
+    def parent2(self):
+        return self._parent2
+
+    @parent2.setter
+    def parent2(self, value):
+        self._parent2 = value
+        if self._pool is not None:
+            Inheritance.family_graph.update_cat(self)
+
+    @property
+    def relationships(self) -> RelationshipRow:
+        return self._relationships
+
+    @relationships.setter
+    def relationships(self, value):
+        if value is self._relationships:
+            return
+        self._relationships.clear()
+        self._relationships.update(value)
+
+    @property
+    def adoptive_parents(self):
+        """IDs of the adoptive parents. If the list is changed in place, Inheritance.family_graph has to be updated."""
+        return self._adoptive_parents
+
+    @adoptive_parents.setter
+    def adoptive_parents(self, value):
+        self._adoptive_parents = value
+        if self._pool is not None:
+            Inheritance.family_graph.update_cat(self)
+
+    @property
+    def dead(self):
+        return self._dead
+
+    @dead.setter
+    def dead(self, value):
+        if value != getattr(self, "_dead", None):
+            # the relationships of dead cats aren't saved, they have to be written again if the cat returns
+            self.changed_fields.update(("dead", "relationships"))
+        self._dead = value
+        if self._pool is not None:
+            self.update_pool()
+
+    @property
+    def outside(self):
+        return self._outside
+
+    @outside.setter
+    def outside(self, value):
+        if value != getattr(self, "_outside", None):
+            self.changed_fields.add("outside")
+        self._outside = value
+        if self._pool is not None:
+            self.update_pool()
+
+    @property
+    def exiled(self):
+        return self._exiled
+
+    @exiled.setter
+    def exiled(self, value):
+        if value != getattr(self, "_exiled", None):
+            self.changed_fields.add("exiled")
+        self._exiled = value
+        if self._pool is not None:
+            self.update_pool()
+
+    @property
+    def df(self):
+        return self._df
+
+    @df.setter
+    def df(self, value):
+        if value != getattr(self, "_df", None):
+            self.changed_fields.add("df")
+        self._df = value
+        if self._pool is not None:
+            self.update_pool()
+
+    def current_pool(self) -> CatPool:
+        """Returns the CatPool this cat belongs in, based on dead, outside, exiled and df."""
+        if self._dead:
+            if self._df:
+                return Cat.darkforest_pool
+            if self._outside:
+                return Cat.unknown_pool
+            return Cat.starclan_pool
+        if self._outside or self._exiled:
+            return Cat.outside_pool
+        return Cat.clan_pool
+
+    def update_pool(self):
+        """Moves the cat to the CatPool it belongs in."""
+        new_pool = self.current_pool()
+        if new_pool is self._pool:
+            return
+        if self._pool is not None:
+            self._pool.discard(self)
+        new_pool.add(self)
+        self._pool = new_pool
+        self.update_mate_index()
+
+    def remove_from_pool(self):
+        """Takes the cat out of its CatPool, for cats which are removed from all_cats."""
+        if self._pool is not None:
+            self._pool.discard(self)
+            self._pool = None
+        Cat.mate_index.discard(self)
+
+    def update_mate_index(self):
+        """Moves the cat in the mate index, after its pool or moons changed."""
+        Cat.mate_index.update(self, self._pool is Cat.clan_pool)
+
+    @staticmethod
+    def all_pools():
+        return (
+            Cat.clan_pool,
+            Cat.outside_pool,
+            Cat.starclan_pool,
+            Cat.darkforest_pool,
+            Cat.unknown_pool,
+        )
+
     def is_alive(self):
         """Check if this cat is alive
 
@@ -875,6 +1034,7 @@ class Cat:
         old_status = self.status
         self.status = new_status
         self.name.status = new_status
+        self.changed_fields.add("status")
 
         self.update_mentor()
         for app in self.apprentice.copy():
@@ -1037,58 +1197,58 @@ class Cat:
             print("WARNING: History failed to load, no Clan in game.switches?")
             return
 
-        history_directory = f"{get_save_dir()}/{clanname}/history/"
-        cat_history_directory = history_directory + self.ID + "_history.json"
-
-        if not os.path.exists(cat_history_directory):
-            self.history = History(
-                beginning={},
-                mentor_influence={},
-                app_ceremony={},
-                lead_ceremony=None,
-                possible_history={},
-                died_by=[],
-                scar_events=[],
-                murder={},
-            )
-            return
         try:
-            with open(cat_history_directory, "r", encoding="utf-8") as read_file:
-                history_data = ujson.loads(read_file.read())
+            history_data = game.get_save_storage(clanname).read_record(
+                "history", self.ID
+            )
+            if history_data is None:
                 self.history = History(
-                    beginning=(
-                        history_data["beginning"] if "beginning" in history_data else {}
-                    ),
-                    mentor_influence=(
-                        history_data["mentor_influence"]
-                        if "mentor_influence" in history_data
-                        else {}
-                    ),
-                    app_ceremony=(
-                        history_data["app_ceremony"]
-                        if "app_ceremony" in history_data
-                        else {}
-                    ),
-                    lead_ceremony=(
-                        history_data["lead_ceremony"]
-                        if "lead_ceremony" in history_data
-                        else None
-                    ),
-                    possible_history=(
-                        history_data["possible_history"]
-                        if "possible_history" in history_data
-                        else {}
-                    ),
-                    died_by=(
-                        history_data["died_by"] if "died_by" in history_data else []
-                    ),
-                    scar_events=(
-                        history_data["scar_events"]
-                        if "scar_events" in history_data
-                        else []
-                    ),
-                    murder=history_data["murder"] if "murder" in history_data else {},
+                    beginning={},
+                    mentor_influence={},
+                    app_ceremony={},
+                    lead_ceremony=None,
+                    possible_history={},
+                    died_by=[],
+                    scar_events=[],
+                    murder={},
                 )
+                return
+
+            self.history = History(
+                beginning=(
+                    history_data["beginning"] if "beginning" in history_data else {}
+                ),
+                mentor_influence=(
+                    history_data["mentor_influence"]
+                    if "mentor_influence" in history_data
+                    else {}
+                ),
+                app_ceremony=(
+                    history_data["app_ceremony"]
+                    if "app_ceremony" in history_data
+                    else {}
+                ),
+                lead_ceremony=(
+                    history_data["lead_ceremony"]
+                    if "lead_ceremony" in history_data
+                    else None
+                ),
+                possible_history=(
+                    history_data["possible_history"]
+                    if "possible_history" in history_data
+                    else {}
+                ),
+                died_by=(
+                    history_data["died_by"] if "died_by" in history_data else []
+                ),
+                scar_events=(
+                    history_data["scar_events"]
+                    if "scar_events" in history_data
+                    else []
+                ),
+                murder=history_data["murder"] if "murder" in history_data else {},
+            )
+            self.history.changed = False
         except Exception:
             self.history = None
             print(
@@ -1097,18 +1257,14 @@ class Cat:
                 f"you'd like to preserve!"
             )
 
-    def save_history(self, history_dir):
+    def save_history(self, storage):
         """Save this cat's history.
 
-        :param history_dir: Directory to save cat's history to
-        :type history_dir: str
+        :param storage: The save storage of the Clan, from game.get_save_storage
         """
-        if not os.path.exists(history_dir):
-            os.makedirs(history_dir)
-
         history_dict = History.make_dict(self)
         try:
-            game.safe_save(f"{history_dir}/{self.ID}_history.json", history_dict)
+            storage.write_record("history", self.ID, history_dict)
         except:
             self.history = History(
                 beginning={},
@@ -1518,8 +1674,6 @@ class Cat:
 
     def thoughts(self):
         """Generates a thought for the cat, which displays on their profile."""
-        all_cats = self.all_cats
-        other_cat = choice(list(all_cats.keys()))
         game_mode = game.switches["game_mode"]
         biome = game.switches["biome"]
         camp = game.switches["camp_bg"]
@@ -1541,45 +1695,21 @@ class Cat:
         else:
             where_kitty = "outside"
         # get other cat
-        i = 0
+        other_cat = None
         # for cats inside the clan
         if where_kitty == "inside":
-            dead_chance = getrandbits(4)
-            while (
-                other_cat == self.ID
-                and len(all_cats) > 1
-                or (all_cats.get(other_cat).dead and dead_chance != 1)
-                or (other_cat not in self.relationships)
-            ):
-                other_cat = choice(list(all_cats.keys()))
-                i += 1
-                if i > 100:
-                    other_cat = None
-                    break
+            if getrandbits(4) == 1:
+                pools = Cat.all_pools()
+            else:
+                pools = (Cat.clan_pool, Cat.outside_pool)
+            other_cat = self.random_known_cat(pools)
         # for dead cats
         elif where_kitty in ["starclan", "hell", "UR"]:
-            while other_cat == self.ID and len(all_cats) > 1:
-                other_cat = choice(list(all_cats.keys()))
-                i += 1
-                if i > 100:
-                    other_cat = None
-                    break
+            other_cat = choice_from(Cat.all_pools(), exclude=self)
         # for cats currently outside
         # it appears as for now, kittypets and loners can only think about outsider cats
         elif where_kitty == "outside":
-            while (
-                other_cat == self.ID
-                and len(all_cats) > 1
-                or (other_cat not in self.relationships)
-            ):
-                # or (self.status in ['kittypet', 'loner'] and not all_cats.get(other_cat).outside):
-                other_cat = choice(list(all_cats.keys()))
-                i += 1
-                if i > 100:
-                    other_cat = None
-                    break
-
-        other_cat = all_cats.get(other_cat)
+            other_cat = self.random_known_cat(Cat.all_pools())
 
         # get chosen thought
         chosen_thought = Thoughts.get_chosen_thought(
@@ -1593,21 +1723,24 @@ class Cat:
         # insert thought
         self.thought = str(chosen_thought)
 
+    def random_known_cat(self, pools, tries: int = 100):
+        """Returns a random cat out of the given CatPools which this cat has a relationship with,
+        or None if none was found within `tries` picks."""
+        for _ in range(tries):
+            other_cat = choice_from(pools, exclude=self)
+            if other_cat is None:
+                return None
+            if other_cat.ID in self.relationships:
+                return other_cat
+        return None
+
     def relationship_interaction(self):
         """Randomly choose a cat of the Clan and have an interaction with them."""
-        cats_to_choose = [
-            iter_cat
-            for iter_cat in Cat.all_cats.values()
-            if iter_cat.ID != self.ID
-            and not iter_cat.outside
-            and not iter_cat.exiled
-            and not iter_cat.dead
-        ]
+        chosen_cat = Cat.clan_pool.choice(exclude=self)
         # if there are no cats to interact, stop
-        if not cats_to_choose:
+        if chosen_cat is None:
             return
 
-        chosen_cat = choice(cats_to_choose)
         if chosen_cat.ID not in self.relationships:
             self.create_one_relationship(chosen_cat)
         relevant_relationship = self.relationships[chosen_cat.ID]
@@ -1811,8 +1944,8 @@ class Cat:
         if not self.inheritance:
             self.inheritance = Inheritance(self)
         if cousin_allowed:
-            return other_cat.ID in self.inheritance.all_but_cousins
-        return other_cat.ID in self.inheritance.all_involved
+            return other_cat.ID in self.inheritance.relatives_but_cousins
+        return other_cat.ID in self.inheritance.relatives
 
     def get_relatives(self, cousin_allowed=True) -> list:
         """Returns a list of ids of all nearly related ancestors."""
@@ -2197,26 +2330,17 @@ class Cat:
                 )
                 self.get_ill(illness_name)
 
-    def save_condition(self):
-        # save conditions for each cat
-        clanname = None
-        if game.switches["clan_name"] != "":
-            clanname = game.switches["clan_name"]
-        elif len(game.switches["clan_name"]) > 0:
-            clanname = game.switches["clan_list"][0]
-        elif game.clan is not None:
-            clanname = game.clan.name
-
-        condition_directory = get_save_dir() + "/" + clanname + "/conditions"
-        condition_file_path = condition_directory + "/" + self.ID + "_conditions.json"
+    def save_condition(self, storage):
+        """Save conditions of the cat.
 
+        :param storage: The save storage of the Clan, from game.get_save_storage
+        """
         if (
             (not self.is_ill() and not self.is_injured() and not self.is_disabled())
             or self.dead
             or self.outside
         ):
-            if os.path.exists(condition_file_path):
-                os.remove(condition_file_path)
+            storage.delete_record("conditions", self.ID)
             return
 
         conditions = {}
@@ -2230,7 +2354,7 @@ class Cat:
         if self.is_disabled():
             conditions["permanent conditions"] = self.permanent_condition
 
-        game.safe_save(condition_file_path, conditions)
+        storage.write_record("conditions", self.ID, conditions)
 
     def load_conditions(self):
         if game.switches["clan_name"] != "":
@@ -2238,17 +2362,15 @@ class Cat:
         else:
             clanname = game.switches["clan_list"][0]
 
-        condition_directory = get_save_dir() + "/" + clanname + "/conditions/"
-        condition_cat_directory = condition_directory + self.ID + "_conditions.json"
-        if not os.path.exists(condition_cat_directory):
-            return
-
         try:
-            with open(condition_cat_directory, "r", encoding="utf-8") as read_file:
-                rel_data = ujson.loads(read_file.read())
-                self.illnesses = rel_data.get("illnesses", {})
-                self.injuries = rel_data.get("injuries", {})
-                self.permanent_condition = rel_data.get("permanent conditions", {})
+            rel_data = game.get_save_storage(clanname).read_record(
+                "conditions", self.ID
+            )
+            if rel_data is None:
+                return
+            self.illnesses = rel_data.get("illnesses", {})
+            self.injuries = rel_data.get("injuries", {})
+            self.permanent_condition = rel_data.get("permanent conditions", {})
 
             if "paralyzed" in self.permanent_condition and not self.pelt.paralyzed:
                 self.pelt.paralyzed = True
@@ -2388,16 +2510,14 @@ class Cat:
             if "unittest" not in sys.modules:
                 raise
 
-        # just to be sure, check if it is not the same cat
-        if self.ID == other_cat.ID:
-            return False
-
         # No Mates Check
         if not ignore_no_mates and (self.no_mates or other_cat.no_mates):
             return False
 
-        # Inheritance check
-        if self.is_related(other_cat, first_cousin_mates):
+        # Inheritance check, this includes the cat itself
+        if not self.inheritance:
+            self.inheritance = Inheritance(self)
+        if other_cat.ID in self.inheritance.forbidden_mates(first_cousin_mates):
             return False
 
         # check dead cats
@@ -2443,6 +2563,21 @@ class Cat:
             or game.clan.clan_settings["romantic with former mentor"]
         )
 
+    def mate_candidates(
+        self, age_restriction: bool = True, include_no_mates: bool = False
+    ) -> List[Cat]:
+        """
+        The living Clan cats which can be mates with this cat as far as their age is concerned.
+        is_potential_mate still has to be checked for each of them.
+        """
+        return Cat.mate_index.candidates(
+            self,
+            age_restriction,
+            game.config["mates"]["age_range"],
+            not game.config["mates"].get("override_same_age_group", False),
+            include_no_mates,
+        )
+
     def unset_mate(self, other_cat: Cat, breakup: bool = False, fight: bool = False):
         """Unset the mate from both self and other_cat"""
         if not other_cat:
@@ -2465,12 +2600,12 @@ class Cat:
             if not self.dead:
                 if other_cat.ID not in self.relationships:
                     self.create_one_relationship(other_cat)
-                    self.relationships[other_cat.ID].mate = True
+                    self.relationships[other_cat.ID].mates = True
                 self_relationship = self.relationships[other_cat.ID]
                 self_relationship.romantic_love -= randint(20, 60)
                 self_relationship.comfortable -= randint(10, 30)
                 self_relationship.trust -= randint(5, 15)
-                self_relationship.mate = False
+                self_relationship.mates = False
                 if fight:
                     self_relationship.romantic_love -= randint(10, 30)
                     self_relationship.platonic_like -= randint(15, 45)
@@ -2478,12 +2613,12 @@ class Cat:
             if not other_cat.dead:
                 if self.ID not in other_cat.relationships:
                     other_cat.create_one_relationship(self)
-                    other_cat.relationships[self.ID].mate = True
+                    other_cat.relationships[self.ID].mates = True
                 other_relationship = other_cat.relationships[self.ID]
                 other_relationship.romantic_love -= 40
                 other_relationship.comfortable -= 20
                 other_relationship.trust -= 10
-                other_relationship.mate = False
+                other_relationship.mates = False
                 if fight:
                     self_relationship.romantic_love -= 20
                     other_relationship.platonic_like -= 30
@@ -2524,26 +2659,27 @@ class Cat:
         if not self.dead:
             if other_cat.ID not in self.relationships:
                 self.create_one_relationship(other_cat)
-                self.relationships[other_cat.ID].mate = True
+                self.relationships[other_cat.ID].mates = True
             self_relationship = self.relationships[other_cat.ID]
             self_relationship.romantic_love += 20
             self_relationship.comfortable += 20
             self_relationship.trust += 10
-            self_relationship.mate = True
+            self_relationship.mates = True
 
         if not other_cat.dead:
             if self.ID not in other_cat.relationships:
                 other_cat.create_one_relationship(self)
-                other_cat.relationships[self.ID].mate = True
+                other_cat.relationships[self.ID].mates = True
             other_relationship = other_cat.relationships[self.ID]
             other_relationship.romantic_love += 20
             other_relationship.comfortable += 20
             other_relationship.trust += 10
-            other_relationship.mate = True
+            other_relationship.mates = True
 
     def unset_adoptive_parent(self, other_cat: Cat):
         """Unset the adoptive parent from self"""
         self.adoptive_parents.remove(other_cat.ID)
+        Inheritance.family_graph.update_cat(self)
         self.create_inheritance_new_cat()
         other_cat.create_inheritance_new_cat()
         if not self.dead:
@@ -2565,6 +2701,7 @@ class Cat:
     def set_adoptive_parent(self, other_cat: Cat):
         """Sets up a parent-child relationship between self and other_cat."""
         self.adoptive_parents.append(other_cat.ID)
+        Inheritance.family_graph.update_cat(self)
         self.create_inheritance_new_cat()
 
         # Set starting relationship values
@@ -2729,8 +2866,11 @@ class Cat:
                 )
                 self.relationships[the_cat.ID] = rel
 
-    def save_relationship_of_cat(self, relationship_dir):
-        # save relationships for each cat
+    def save_relationship_of_cat(self, storage):
+        """Save the relationships of the cat.
+
+        :param storage: The save storage of the Clan, from game.get_save_storage
+        """
 
         rel = []
         for r in self.relationships.values():
@@ -2750,7 +2890,30 @@ class Cat:
             }
             rel.append(r_data)
 
-        game.safe_save(f"{relationship_dir}/{self.ID}_relations.json", rel)
+        storage.write_record("relationships", self.ID, rel)
+        self.mark_relationships_saved()
+
+    def relationships_changed(self) -> bool:
+        """Returns True if the relationships of the cat changed since they were last saved or loaded."""
+        return (
+            "relationships" in self.changed_fields
+            or len(self.relationships) != self._saved_relationship_count
+        )
+
+    def mark_saved(self):
+        """Marks the cat as unchanged after it was saved. Relationships are tracked separately."""
+        self.changed_fields.intersection_update(("relationships",))
+
+    def mark_relationships_saved(self, saved_count=None):
+        """Marks all relationships of the cat as unchanged.
+
+        :param saved_count: Number of relationships in the save, defaults to the current number
+        """
+        self.changed_fields.discard("relationships")
+        self.relationships.clear_changes()
+        self._saved_relationship_count = (
+            len(self.relationships) if saved_count is None else saved_count
+        )
 
     def load_relationship_of_cat(self):
         if game.switches["clan_name"] != "":
@@ -2758,38 +2921,43 @@ class Cat:
         else:
             clanname = game.switches["clan_list"][0]
 
-        relation_directory = get_save_dir() + "/" + clanname + "/relationships/"
-        relation_cat_directory = relation_directory + self.ID + "_relations.json"
+        storage = game.get_save_storage(clanname)
 
         self.relationships = {}
-        if os.path.exists(relation_directory):
-            if not os.path.exists(relation_cat_directory):
+        if storage.has_relationships():
+            try:
+                rel_data = storage.read_record("relationships", self.ID)
+            except Exception:
+                print(
+                    f"WARNING: There was an error reading the relationship file of cat #{self}."
+                )
+                return
+            if rel_data is None:
                 self.init_all_relationships()
                 for cat in Cat.all_cats.values():
                     cat.create_one_relationship(self)
                 return
             try:
-                with open(relation_cat_directory, "r", encoding="utf-8") as read_file:
-                    rel_data = ujson.loads(read_file.read())
-                    for rel in rel_data:
-                        cat_to = self.all_cats.get(rel["cat_to_id"])
-                        if cat_to is None or rel["cat_to_id"] == self.ID:
-                            continue
-                        new_rel = Relationship(
-                            cat_from=self,
-                            cat_to=cat_to,
-                            mates=rel["mates"] or False,
-                            family=rel["family"] or False,
-                            romantic_love=(rel["romantic_love"] or 0),
-                            platonic_like=(rel["platonic_like"] or 0),
-                            dislike=rel["dislike"] or 0,
-                            admiration=rel["admiration"] or 0,
-                            comfortable=rel["comfortable"] or 0,
-                            jealousy=rel["jealousy"] or 0,
-                            trust=rel["trust"] or 0,
-                            log=rel["log"],
-                        )
-                        self.relationships[rel["cat_to_id"]] = new_rel
+                for rel in rel_data:
+                    cat_to = self.all_cats.get(rel["cat_to_id"])
+                    if cat_to is None or rel["cat_to_id"] == self.ID:
+                        continue
+                    new_rel = Relationship(
+                        cat_from=self,
+                        cat_to=cat_to,
+                        mates=rel["mates"] or False,
+                        family=rel["family"] or False,
+                        romantic_love=(rel["romantic_love"] or 0),
+                        platonic_like=(rel["platonic_like"] or 0),
+                        dislike=rel["dislike"] or 0,
+                        admiration=rel["admiration"] or 0,
+                        comfortable=rel["comfortable"] or 0,
+                        jealousy=rel["jealousy"] or 0,
+                        trust=rel["trust"] or 0,
+                        log=rel["log"],
+                    )
+                    self.relationships[rel["cat_to_id"]] = new_rel
+                self.mark_relationships_saved(saved_count=len(rel_data))
             except:
                 print(
                     f"WARNING: There was an error reading the relationship file of cat #{self}."
@@ -3105,6 +3273,7 @@ class Cat:
     def set_faded(self):
         """This function is for cats that are faded. It will set the sprite and the faded tag"""
         self.faded = True
+        sprite_cache.invalidate(self.ID)
 
         # Silhouette sprite
         if self.age == "newborn":
@@ -3141,12 +3310,29 @@ class Cat:
 
     @staticmethod
     def load_faded_cat(cat: str):
-        """Loads a faded cat, returning the cat object. This object is saved nowhere else."""
+        """Loads a faded cat, returning the cat object. The object is kept in Cat.faded_cache,
+        so it's shared by everyone loading the same faded cat and must not be changed."""
 
         # just preventing any attempts to load something that isn't a cat ID
         if not cat.isdigit():
             return
 
+        try:
+            clan = (
+                game.switches["clan_list"][0] if game.clan is None else game.clan.name
+            )
+        except AttributeError:
+            clan = game.switches["clan_list"][0]
+
+        found, cat_ob = Cat.faded_cache.get(clan, cat)
+        if not found:
+            cat_ob = Cat.read_faded_cat(cat)
+            Cat.faded_cache.put(clan, cat, cat_ob)
+        return cat_ob
+
+    @staticmethod
+    def read_faded_cat(cat: str):
+        """Reads the file of a faded cat, returning a new cat object, or False if it couldn't be read."""
         try:
             clan = (
                 game.switches["clan_list"][0] if game.clan is None else game.clan.name
@@ -3336,6 +3522,9 @@ class Cat:
         except AttributeError:
             print(f"ERROR: cat has no age attribute! Cat ID: {self.ID}")
 
+        if self._pool is not None:
+            self.update_mate_index()
+
     @property
     def sprite(self):
         # Update the sprite
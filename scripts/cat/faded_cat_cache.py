@@ -0,0 +1,58 @@
+"""
+Contains the FadedCatCache class, which keeps recently loaded faded cats in memory
+"""
+
+from collections import OrderedDict
+from typing import Any, Tuple
+
+
+class FadedCatCache:
+    """
+    A bounded LRU cache for faded cats, keyed by (clan name, cat ID).
+    Failed loads are cached as well, so missing files aren't opened again and again.
+    Entries have to be invalidated whenever the faded cat file is written.
+    """
+
+    def __init__(self, max_size: int = 512):
+        self.max_size = max_size
+        self._cats = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._cats)
+
+    def get(self, clan: str, cat_id: str) -> Tuple[bool, Any]:
+        """Returns (True, entry) if the cat is cached, (False, None) otherwise."""
+        key = (clan, cat_id)
+        if key not in self._cats:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        self._cats.move_to_end(key)
+        return True, self._cats[key]
+
+    def put(self, clan: str, cat_id: str, cat_ob):
+        key = (clan, cat_id)
+        self._cats[key] = cat_ob
+        self._cats.move_to_end(key)
+        while len(self._cats) > self.max_size:
+            self._cats.popitem(last=False)
+
+    def invalidate(self, clan: str, cat_id: str):
+        self._cats.pop((clan, cat_id), None)
+
+    def clear(self):
+        self._cats.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __repr__(self):
+        return (
+            f"FadedCatCache: {len(self._cats)}/{self.max_size} cats, "
+            f"{self.hits} hits, {self.misses} misses ({self.hit_rate():.0%} hit rate)"
+        )
@@ -27,6 +27,8 @@ class History:
         self.died_by = died_by if died_by else []
         self.scar_events = scar_events if scar_events else []
         self.murder = murder if murder else {}
+        # False while the history is the same as the saved one, so saving it can be skipped
+        self.changed = True
 
         # fix 'old' history save bugs
         if type(self.mentor_influence["trait"]) is type(None):
@@ -165,6 +167,7 @@ class History:
         if not game.clan:
             return
         History.check_load(cat)
+        cat.history.changed = True
 
         cat.history.beginning = {
             "clan_born": clan_born,
@@ -180,6 +183,7 @@ class History:
         :param cat: cat object
         """
         History.check_load(cat)
+        cat.history.changed = True
 
         if not cat.history.mentor_influence["trait"]:
             return
@@ -240,6 +244,7 @@ class History:
         :param cat: cat object
         """
         History.check_load(cat)
+        cat.history.changed = True
 
         if not cat.history.mentor_influence["skill"]:
             return
@@ -289,6 +294,7 @@ class History:
         """Adds the history information for a single mentor facet change, that occurs after a patrol. """
 
         History.check_load(cat)
+        cat.history.changed = True
         if mentor_id not in cat.history.mentor_influence["trait"]:
             cat.history.mentor_influence["trait"][mentor_id] = {}
         if facet not in cat.history.mentor_influence["trait"][mentor_id]:
@@ -300,6 +306,7 @@ class History:
         """ Adds mentor influence on skills """
 
         History.check_load(cat)
+        cat.history.changed = True
 
         if not isinstance(path, SkillPath):
             path = SkillPath[path]
@@ -320,6 +327,7 @@ class History:
         if not game.clan:
             return
         History.check_load(cat)
+        cat.history.changed = True
 
         cat.history.app_ceremony = {
             "honor": honor,
@@ -338,6 +346,7 @@ class History:
         :param other_cat: cat object of other cat involved.
         """
         History.check_load(cat)
+        cat.history.changed = True
 
         # If the condition already exists, we don't want to overwrite it
         if condition in cat.history.possible_history:
@@ -375,6 +384,7 @@ class History:
         """
 
         History.check_load(cat)
+        cat.history.changed = True
 
         if condition in cat.history.possible_history:
             cat.history.possible_history.pop(condition)
@@ -389,6 +399,7 @@ class History:
         if not game.clan:
             return
         History.check_load(cat)
+        cat.history.changed = True
 
         if other_cat is not None:
             other_cat = other_cat.ID
@@ -409,6 +420,7 @@ class History:
         if not game.clan:
             return
         History.check_load(cat)
+        cat.history.changed = True
 
         if other_cat is not None:
             other_cat = other_cat.ID
@@ -439,6 +451,8 @@ class History:
             return
         History.check_load(cat)
         History.check_load(other_cat)
+        cat.history.changed = True
+        other_cat.history.changed = True
         if "is_murderer" not in other_cat.history.murder:
             other_cat.history.murder["is_murderer"] = []
         if 'is_victim' not in cat.history.murder:
@@ -463,6 +477,7 @@ class History:
         generates and adds lead ceremony to history
         """
         History.check_load(cat)
+        cat.history.changed = True
 
         cat.history.lead_ceremony = cat.generate_lead_ceremony()
 
@@ -666,6 +681,8 @@ class History:
 
         if murder_history:
             if "is_murderer" in murder_history:
+                cat.history.changed = True
+                victim.history.changed = True
                 murder_history = murder_history["is_murderer"][murder_index]
                 murder_history["revealed"] = True
                 murder_history["revealed_by"] = other_cat.ID if other_cat else None
@@ -0,0 +1,108 @@
+"""
+Contains the MateIndex class, which keeps the living Clan cats sorted by age, to find possible mates
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+# cats of these ages can only be mates with cats of the same age, see Cat.is_potential_mate
+AGE_RESTRICTED_AGES = ("newborn", "kitten", "adolescent")
+
+
+class MateIndex:
+    """
+    The living cats in the Clan (Cat.clan_pool), by age and by moons.
+    Cat keeps it up to date whenever moons, dead, outside or exiled change.
+
+    candidates() returns the cats which can be a mate of a cat as far as their age is concerned,
+    so a scan for possible mates only has to call is_potential_mate for those.
+    """
+
+    def __init__(self):
+        self._by_age: Dict[str, Dict[str, object]] = {}  # age: cat ID: cat
+        self._by_moons: Dict[int, Dict[str, object]] = {}  # moons: cat ID: cat
+        self._keys: Dict[str, Tuple[str, int]] = {}  # cat ID: (age, moons) it's stored under
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, cat) -> bool:
+        return cat.ID in self._keys
+
+    def update(self, cat, eligible: bool):
+        """Move the cat to the buckets of its current age and moons, or take it out if it isn't eligible."""
+        key = (cat.age, cat.moons) if eligible else None
+        old_key = self._keys.get(cat.ID)
+        if key == old_key:
+            return
+
+        if old_key is not None:
+            self._remove(self._by_age, old_key[0], cat.ID)
+            self._remove(self._by_moons, old_key[1], cat.ID)
+            del self._keys[cat.ID]
+        if key is not None:
+            self._by_age.setdefault(key[0], {})[cat.ID] = cat
+            self._by_moons.setdefault(key[1], {})[cat.ID] = cat
+            self._keys[cat.ID] = key
+
+    @staticmethod
+    def _remove(buckets: dict, key, cat_id: str):
+        bucket = buckets.get(key)
+        if bucket is None:
+            return
+        bucket.pop(cat_id, None)
+        if not bucket:
+            del buckets[key]
+
+    def discard(self, cat):
+        self.update(cat, False)
+
+    def clear(self):
+        self._by_age.clear()
+        self._by_moons.clear()
+        self._keys.clear()
+
+    def candidates(
+        self,
+        cat,
+        age_restriction: bool = True,
+        age_range: Optional[int] = None,
+        same_age_group: bool = True,
+        include_no_mates: bool = False,
+    ) -> List:
+        """
+        The cats in the index which can be a mate of the cat judging by their age, without the cat itself.
+        The rules are the ones of Cat.is_potential_mate, which still has to be checked for each of them.
+
+        :param age_restriction: same as in is_potential_mate, if False only the age restricted ages are excluded
+        :param age_range: the maximum difference in moons, game.config["mates"]["age_range"]
+        :param same_age_group: if cats of the same age may be mates regardless of their moons,
+            False if game.config["mates"]["override_same_age_group"] is set
+        :param include_no_mates: include the cats which are set to have no mates
+        """
+        if cat.age in AGE_RESTRICTED_AGES:
+            buckets = [self._by_age.get(cat.age, {})]
+        elif not age_restriction:
+            buckets = [
+                bucket
+                for age, bucket in self._by_age.items()
+                if age not in AGE_RESTRICTED_AGES
+            ]
+        else:
+            buckets = [self._by_age.get(cat.age, {})] if same_age_group else []
+            # the +1 is the same as in is_potential_mate
+            max_difference = age_range + 1
+            for moons in range(cat.moons - max_difference, cat.moons + max_difference + 1):
+                bucket = self._by_moons.get(moons)
+                if bucket is not None:
+                    buckets.append(bucket)
+
+        candidates = {}
+        for bucket in buckets:
+            for other_id, other_cat in bucket.items():
+                if other_cat.age in AGE_RESTRICTED_AGES and other_cat.age != cat.age:
+                    continue
+                if other_cat.no_mates and not include_no_mates:
+                    continue
+                candidates[other_id] = other_cat
+        candidates.pop(cat.ID, None)
+        return list(candidates.values())
@@ -0,0 +1,93 @@
+"""
+Contains the NameIndex class, used by the cat list to search names without going through every cat
+"""
+
+from typing import Dict, Iterable, Set
+
+# names are indexed by every piece of them up to this length
+GRAM_LENGTH = 3
+
+
+def name_grams(name: str) -> Set[str]:
+    """Every piece of the name which is at most GRAM_LENGTH letters long."""
+    return {
+        name[start : start + length]
+        for length in range(1, GRAM_LENGTH + 1)
+        for start in range(len(name) - length + 1)
+    }
+
+
+class NameIndex:
+    """
+    The lower-cased names of cats, by cat ID, and the IDs of the cats whose name contains each piece
+    of up to GRAM_LENGTH letters. Only cats whose name changed are indexed again on `refresh`.
+    """
+
+    def __init__(self):
+        self._names: Dict[str, str] = {}  # cat ID: lower-cased name
+        self._grams: Dict[str, Set[str]] = {}  # piece of a name: cat IDs
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, cat_id: str) -> bool:
+        return cat_id in self._names
+
+    def update(self, cat):
+        """Index the current name of the cat."""
+        name = str(cat.name).lower()
+        old_name = self._names.get(cat.ID)
+        if name == old_name:
+            return
+        if old_name is not None:
+            self.discard(cat.ID)
+
+        self._names[cat.ID] = name
+        for gram in name_grams(name):
+            self._grams.setdefault(gram, set()).add(cat.ID)
+
+    def discard(self, cat_id: str):
+        name = self._names.pop(cat_id, None)
+        if name is None:
+            return
+        for gram in name_grams(name):
+            ids = self._grams[gram]
+            ids.discard(cat_id)
+            if not ids:
+                del self._grams[gram]
+
+    def refresh(self, cats: Iterable, known_ids=None):
+        """
+        Index the names of the given cats again, after they could have changed.
+        :param known_ids: if given, cats whose ID isn't in it are forgotten, e.g. Cat.all_cats
+        """
+        for cat in cats:
+            self.update(cat)
+        if known_ids is not None:
+            for cat_id in [i for i in self._names if i not in known_ids]:
+                self.discard(cat_id)
+
+    def matches(self, cat_id: str, text: str) -> bool:
+        """If the indexed name of the cat contains the lower-cased text."""
+        return text in self._names.get(cat_id, "")
+
+    def search(self, text: str) -> Set[str]:
+        """The IDs of the cats whose name contains the text, ignoring case."""
+        text = text.lower()
+        if not text:
+            return set(self._names)
+
+        grams = {
+            text[start : start + GRAM_LENGTH]
+            for start in range(max(len(text) - GRAM_LENGTH + 1, 1))
+        }
+        id_sets = sorted((self._grams.get(gram, set()) for gram in grams), key=len)
+        found = set(id_sets[0])
+        for ids in id_sets[1:]:
+            found &= ids
+            if not found:
+                break
+        if len(text) > GRAM_LENGTH:
+            # the pieces can be in a different order in the name
+            found = {cat_id for cat_id in found if text in self._names[cat_id]}
+        return found
@@ -0,0 +1,179 @@
+"""
+
+Contains the SpriteAtlas class, which keeps the composed sprites of a Clan on disk.
+
+The atlas is a single file in the Clan folder (sprite_atlas.bin), which is read in one go when the Clan
+is loaded. Sprites are stored by a digest of their sprite cache key (see sprite_cache_key in utility.py),
+so a cat only has to be composed again once its appearance changed.
+
+File layout: the magic line, the length of the header as 4 byte big endian integer, the JSON header,
+then the raw RGBA pixels of all sprites, one after another.
+The header holds the sprite size, the signature of the sprite sheets the sprites were made from
+(set by Sprites.load_all), the digest of every cat's sprite and the position of every sprite in the pixel data.
+If the sprite sheets changed, the whole atlas is ignored.
+
+"""
+
+import hashlib
+import os
+from typing import Dict, Hashable, Iterable, Optional
+
+import pygame
+import ujson
+
+SPRITE_ATLAS_FILE_NAME = "sprite_atlas.bin"
+ATLAS_MAGIC = b"CLANGEN SPRITE ATLAS 1\n"
+
+
+class SpriteAtlas:
+    def __init__(self):
+        # signature of the loaded sprite sheets, sprites are only stored once it is set
+        self.signature: Optional[str] = None
+        self.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self.path: Optional[str] = None
+        self._data = b""  # the pixel data of the loaded file
+        self._offsets: Dict[str, int] = {}  # digest: position in _data
+        self._new: Dict[str, bytes] = {}  # digest: pixels of sprites added since the file was loaded
+        self._cats: Dict[str, str] = {}  # cat ID: digest of its current sprite
+        self._size = None
+        self._dirty = False
+
+    @staticmethod
+    def digest(key: Hashable) -> str:
+        return hashlib.sha1(repr(key).encode()).hexdigest()
+
+    def _sprite_bytes(self) -> int:
+        return self._size[0] * self._size[1] * 4
+
+    def load(self, path: str):
+        """Load the atlas of a Clan in one read. A missing or outdated file gives an empty atlas."""
+        self.clear()
+        self.path = path
+        if self.signature is None or not os.path.exists(path):
+            return
+
+        try:
+            with open(path, "rb") as read_file:
+                content = read_file.read()
+            if not content.startswith(ATLAS_MAGIC):
+                raise ValueError("not a sprite atlas")
+            start = len(ATLAS_MAGIC)
+            header_length = int.from_bytes(content[start : start + 4], "big")
+            header = ujson.loads(content[start + 4 : start + 4 + header_length])
+        except (OSError, ValueError) as e:
+            print(f"WARNING: couldn't read the sprite atlas {path}: {e}")
+            return
+
+        if header["signature"] != self.signature:
+            # the sprites were made from different sprite sheets, they are made again
+            self._dirty = True
+            return
+        self._size = tuple(header["size"])
+        self._data = memoryview(content)[start + 4 + header_length :]
+        self._offsets = {
+            digest: index * self._sprite_bytes()
+            for digest, index in header["sprites"].items()
+        }
+        self._cats = header["cats"]
+
+    def get(self, cat_id: str, key: Hashable) -> Optional[pygame.Surface]:
+        """Returns the stored sprite for the key, or None if it has to be composed."""
+        digest = self.digest(key)
+        pixels = self._new.get(digest)
+        if pixels is None and digest in self._offsets:
+            offset = self._offsets[digest]
+            pixels = self._data[offset : offset + self._sprite_bytes()]
+        if pixels is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if self._cats.get(cat_id) != digest:
+            self._cats[cat_id] = digest
+            self._dirty = True
+        return pygame.image.frombytes(bytes(pixels), self._size, "RGBA")
+
+    def put(self, cat_id: str, key: Hashable, surface: pygame.Surface):
+        """Store a newly composed sprite. It's written with the next save."""
+        if self.signature is None:
+            return
+        if self._size is None:
+            self._size = surface.get_size()
+        elif surface.get_size() != self._size:
+            # e.g. the error placeholder
+            return
+        digest = self.digest(key)
+        self._new[digest] = pygame.image.tobytes(surface, "RGBA")
+        self._cats[cat_id] = digest
+        self._dirty = True
+
+    def save(self, path: str, cat_ids: Iterable[str]):
+        """Write the sprites of the given cats, if anything changed since the atlas was loaded."""
+        if not self._dirty and path == self.path:
+            return
+        if self._size is None or self.signature is None:
+            return
+
+        cats = {}
+        sprites = {}
+        chunks = []
+        sprite_bytes = self._sprite_bytes()
+        for cat_id in cat_ids:
+            digest = self._cats.get(cat_id)
+            if digest is None:
+                continue
+            if digest not in sprites:
+                if digest in self._new:
+                    chunks.append(self._new[digest])
+                elif digest in self._offsets:
+                    offset = self._offsets[digest]
+                    chunks.append(self._data[offset : offset + sprite_bytes])
+                else:
+                    continue
+                sprites[digest] = len(sprites)
+            cats[cat_id] = digest
+
+        header = ujson.dumps(
+            {
+                "size": list(self._size),
+                "signature": self.signature,
+                "cats": cats,
+                "sprites": sprites,
+            }
+        ).encode()
+
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as write_file:
+            write_file.write(ATLAS_MAGIC)
+            write_file.write(len(header).to_bytes(4, "big"))
+            write_file.write(header)
+            for chunk in chunks:
+                write_file.write(chunk)
+        os.replace(temp_path, path)
+
+        # the written file is the loaded atlas now
+        self.path = path
+        self._data = b"".join(chunks)
+        self._offsets = {
+            digest: index * sprite_bytes for digest, index in sprites.items()
+        }
+        self._new.clear()
+        self._cats = cats
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._offsets.keys() | self._new.keys())
+
+    def __repr__(self):
+        total = self.hits + self.misses
+        return (
+            f"SpriteAtlas: {len(self)} sprites, {self.hits} hits, {self.misses} misses "
+            f"({self.hits / total if total else 0:.0%} hit rate)"
+        )
+
+
+sprite_atlas = SpriteAtlas()
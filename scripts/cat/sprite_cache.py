@@ -0,0 +1,148 @@
+"""
+Contains the SpriteCache class, which keeps the generated sprites of cats in memory
+"""
+
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+import pygame
+
+
+class SpriteCache:
+    """
+    A bounded LRU cache for the sprites made by generate_sprite, one entry per cat ID.
+    Every entry remembers the key it was generated for, a tuple of everything which affects the image
+    (see sprite_cache_key in utility.py). If the key of the cat changed, the entry is outdated and dropped.
+    Scaled versions of a cached sprite, as shown by UISpriteButton, are kept in the same entry.
+    Entries are dropped as well if the cached sprites use more than max_bytes.
+    The cached surfaces are shared, they must not be drawn on. Copy them first.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        # cat ID: [key, surface, size in bytes, {(size, smooth): scaled surface}]
+        self._sprites = OrderedDict()
+        self._owners: Dict[int, str] = {}  # id of a cached surface: cat ID
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+    @staticmethod
+    def surface_bytes(surface: pygame.Surface) -> int:
+        width, height = surface.get_size()
+        return width * height * surface.get_bytesize()
+
+    @staticmethod
+    def make_scaled(
+        surface: pygame.Surface, size: Tuple[int, int], smooth: bool
+    ) -> pygame.Surface:
+        """Returns the sprite with premultiplied alpha, scaled to the size."""
+        surface = surface.premul_alpha()
+        if smooth:
+            return pygame.transform.smoothscale(surface, size)
+        return pygame.transform.scale(surface, size)
+
+    def get(self, cat_id: str, key: Hashable) -> Optional[pygame.Surface]:
+        """Returns the sprite of the cat if it was generated for this key, None otherwise."""
+        entry = self._sprites.get(cat_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[0] != key:
+            self.misses += 1
+            self.invalidate(cat_id)
+            return None
+        self.hits += 1
+        self._sprites.move_to_end(cat_id)
+        return entry[1]
+
+    def put(
+        self,
+        cat_id: str,
+        key: Hashable,
+        surface: pygame.Surface,
+        scaled: Dict[Tuple[Tuple[int, int], bool], pygame.Surface] = None,
+    ):
+        """Store the sprite of the cat, and optionally scaled versions of it, keyed by (size, smooth)."""
+        self.invalidate(cat_id, count=False)
+        scaled = dict(scaled) if scaled else {}
+        size = self.surface_bytes(surface) + sum(
+            self.surface_bytes(variant) for variant in scaled.values()
+        )
+        self._sprites[cat_id] = [key, surface, size, scaled]
+        self._owners[id(surface)] = cat_id
+        self.bytes_used += size
+        self._evict()
+
+    def scaled(
+        self, surface: pygame.Surface, size: Tuple[int, int], smooth: bool
+    ) -> pygame.Surface:
+        """
+        Returns the sprite scaled to the size, see make_scaled.
+        If the sprite is in the cache, the scaled version is kept with it.
+        """
+        cat_id = self._owners.get(id(surface))
+        entry = self._sprites.get(cat_id) if cat_id is not None else None
+        if entry is None or entry[1] is not surface:
+            return self.make_scaled(surface, size, smooth)
+
+        variant = entry[3].get((size, smooth))
+        if variant is not None:
+            self.hits += 1
+            return variant
+        self.misses += 1
+        variant = entry[3][(size, smooth)] = self.make_scaled(surface, size, smooth)
+        variant_size = self.surface_bytes(variant)
+        entry[2] += variant_size
+        self.bytes_used += variant_size
+        self._evict()
+        return variant
+
+    def _evict(self):
+        while self.bytes_used > self.max_bytes and len(self._sprites) > 1:
+            _, (_, surface, evicted_size, _) = self._sprites.popitem(last=False)
+            self._owners.pop(id(surface), None)
+            self.bytes_used -= evicted_size
+
+    def invalidate(self, cat_id: str, count=True):
+        """Drop the sprite of the cat, it's generated again the next time it's needed."""
+        entry = self._sprites.pop(cat_id, None)
+        if entry is None:
+            return
+        self._owners.pop(id(entry[1]), None)
+        self.bytes_used -= entry[2]
+        if count:
+            self.invalidations += 1
+
+    def contains(self, cat_id: str, key: Hashable) -> bool:
+        """True if the sprite of the cat is cached for this key. Doesn't count as a hit or miss."""
+        entry = self._sprites.get(cat_id)
+        return entry is not None and entry[0] == key
+
+    def clear(self):
+        """Drop all sprites, e.g. after the sprite sheets were loaded again."""
+        self._sprites.clear()
+        self._owners.clear()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __repr__(self):
+        return (
+            f"SpriteCache: {len(self._sprites)} sprites, "
+            f"{self.bytes_used / 1024:.0f}/{self.max_bytes / 1024:.0f} KiB, "
+            f"{self.hits} hits, {self.misses} misses ({self.hit_rate():.0%} hit rate), "
+            f"{self.invalidations} invalidations"
+        )
+
+
+sprite_cache = SpriteCache()
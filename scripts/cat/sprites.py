@@ -1,12 +1,37 @@
+import hashlib
 import os
+import threading
 from copy import copy
 
 import pygame
 import ujson
 
+from scripts.cat.sprite_atlas import sprite_atlas
+from scripts.cat.sprite_cache import sprite_cache
 from scripts.game_structure.game_essentials import game
 
 
+class SpriteDict(dict):
+    """The sprites by name. Looking up a sprite of a spritesheet which isn't loaded yet loads the sheet."""
+
+    def __init__(self, owner):
+        super().__init__()
+        self.owner = owner
+
+    def __missing__(self, name):
+        sheet = self.owner._sheet_of.get(name)
+        if sheet is None:
+            raise KeyError(name)
+        # waits for another thread which is loading the sheet right now
+        self.owner.load_sheet(sheet)
+        if not dict.__contains__(self, name):
+            raise KeyError(name)
+        return dict.__getitem__(self, name)
+
+    def __contains__(self, name):
+        return dict.__contains__(self, name) or name in self.owner._sheet_of
+
+
 class Sprites:
     cat_tints = {}
     white_patches_tints = {}
@@ -21,11 +46,22 @@ class Sprites:
         self.size = None
         self.spritesheets = {}
         self.images = {}
-        self.sprites = {}
+        self.sprites = SpriteDict(self)
+
+        # sheets are only loaded once one of their sprites is needed, see load_sheet
+        self._sheet_files = {}  # sheet name: file
+        self._groups = {}  # sheet name: arguments of the make_group calls for the sheet
+        self._sheet_of = {}  # sprite name: sheet name
+        self._sheet_lock = threading.Lock()
 
         # Shared empty sprite for placeholders
         self.blank_sprite = None
 
+        # pre-tinted and combined layers used by generate_sprite, see get_layer
+        self.layers = {}
+        self.layer_hits = 0
+        self.layer_misses = 0
+
         self.load_tints()
 
     def load_tints(self):
@@ -43,13 +79,36 @@ class Sprites:
 
     def spritesheet(self, a_file, name):
         """
-        Add spritesheet called name from a_file.
+        Add spritesheet called name from a_file. The file is only loaded once a sprite of it is needed.
 
         Parameters:
         a_file -- Path to the file to create a spritesheet from.
         name -- Name to call the new spritesheet.
         """
-        self.spritesheets[name] = pygame.image.load(a_file).convert_alpha()
+        self._sheet_files[name] = a_file
+        self._groups[name] = []
+        self.spritesheets.pop(name, None)
+
+    def load_sheet(self, name):
+        """Load the spritesheet and make all of its groups, if it isn't loaded yet."""
+        with self._sheet_lock:
+            if name in self.spritesheets:
+                return
+            sheet = pygame.image.load(self._sheet_files[name]).convert_alpha()
+            # the sprites are cut first, the sheet counts as loaded once all of them are there
+            cut = {}
+            for args in self._groups[name]:
+                cut.update(self._cut_group(sheet, name, *args))
+            self.sprites.update(cut)
+            self.spritesheets[name] = sheet
+
+    def prewarm(self, sprite_names):
+        """Load the spritesheets of these sprites now, instead of when they are needed first."""
+        sheets = {
+            self._sheet_of[name] for name in sprite_names if name in self._sheet_of
+        }
+        for sheet in sheets:
+            self.load_sheet(sheet)
 
     def make_group(self,
                    spritesheet,
@@ -69,6 +128,27 @@ class Sprites:
         :param no_index: default False, set True if sprite name does not require cat pose index
         """
 
+        for i in range(sprites_x * sprites_y):
+            full_name = f"{name}" if no_index else f"{name}{i}"
+            self._sheet_of[full_name] = spritesheet
+        self._groups[spritesheet].append((pos, name, sprites_x, sprites_y, no_index))
+        if spritesheet in self.spritesheets:
+            self.sprites.update(
+                self._cut_group(
+                    self.spritesheets[spritesheet],
+                    spritesheet,
+                    pos,
+                    name,
+                    sprites_x,
+                    sprites_y,
+                    no_index,
+                )
+            )
+
+    def _cut_group(self, sheet, spritesheet, pos, name, sprites_x, sprites_y, no_index):
+        """Split a group of a loaded spritesheet into single sprites, see make_group.
+        Returns the sprites by name."""
+        cut = {}
         group_x_ofs = pos[0] * sprites_x * self.size
         group_y_ofs = pos[1] * sprites_y * self.size
         i = 0
@@ -83,7 +163,7 @@ class Sprites:
 
                 try:
                     new_sprite = pygame.Surface.subsurface(
-                        self.spritesheets[spritesheet],
+                        sheet,
                         group_x_ofs + x * self.size,
                         group_y_ofs + y * self.size,
                         self.size, self.size
@@ -99,10 +179,17 @@ class Sprites:
                         )
                     new_sprite = self.blank_sprite
 
-                self.sprites[full_name] = new_sprite
+                # if several groups have the same name, the last one made wins
+                if self._sheet_of.get(full_name) == spritesheet:
+                    cut[full_name] = new_sprite
                 i += 1
+        return cut
 
     def load_all(self):
+        """Register all spritesheets and groups. The sheets themselves are loaded when they are needed."""
+        self.sprites.clear()
+        self._sheet_of.clear()
+
         # get the width and height of the spritesheet
         lineart = pygame.image.load('sprites/lineart.png')
         width, height = lineart.get_size()
@@ -508,6 +595,11 @@ class Sprites:
         self.load_scars()
         self.load_symbols()
 
+        # cached cat sprites and layers were made from the old sheets
+        self.layers.clear()
+        sprite_cache.clear()
+        sprite_atlas.signature = self.sheet_signature()
+
     def load_scars(self):
         """
         Loads scar sprites and puts them into groups.
@@ -647,6 +739,50 @@ class Sprites:
 
             y_pos += 1
 
+    @staticmethod
+    def sheet_signature():
+        """Changes whenever the sprite sheets, the tints, or the settings which change how they are loaded, change."""
+        files = sorted(
+            (entry.name, entry.stat().st_size, int(entry.stat().st_mtime))
+            for entry in os.scandir("sprites")
+            if entry.is_file() and entry.name.endswith(".png")
+        )
+        for path in ("sprites/dicts/tint.json", "sprites/dicts/white_patches_tint.json"):
+            if os.path.exists(path):
+                with open(path, "rb") as read_file:
+                    files.append((path, hashlib.sha1(read_file.read()).hexdigest()))
+        return hashlib.sha1(
+            repr(
+                (
+                    files,
+                    game.config["fun"]["april_fools"],
+                    game.config["fun"]["all_cats_are_newborn"],
+                )
+            ).encode()
+        ).hexdigest()
+
+    def get_layer(self, key, build, *args):
+        """
+        Returns the layer for the key, made with build(*args) the first time it's needed.
+        Layers are shared between all sprites, so they must not be drawn on.
+        """
+        layer = self.layers.get(key)
+        if layer is None:
+            self.layer_misses += 1
+            layer = self.layers[key] = build(*args)
+        else:
+            self.layer_hits += 1
+        return layer
+
+    def tint_layer(self, colour):
+        """Returns a sprite-sized surface filled with the colour, to blend tints onto sprites."""
+        return self.get_layer(("tint", tuple(colour)), self._make_tint_layer, colour)
+
+    def _make_tint_layer(self, colour):
+        tint = pygame.Surface((self.size, self.size)).convert_alpha()
+        tint.fill(tuple(colour))
+        return tint
+
     def dark_mode_symbol(self, symbol):
         """Change the color of the symbol to dark mode, then return it
         :param Surface symbol: The clan symbol to convert"""
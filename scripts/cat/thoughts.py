@@ -1,10 +1,106 @@
 import traceback
 from random import choice
+from typing import Dict, List, Set, Tuple
 
 import ujson
 
 
+class ThoughtIndex:
+    """
+    A list of thoughts, bucketed by the constraints that only depend on the main cat and the clan
+    (see Thoughts.thought_fulfill_indexed_constraints). Looking up a cat returns the same thoughts as checking
+    those constraints one by one, in the same order.
+    """
+
+    # thought key -> value in the thought that means "no constraint"
+    INDEXED_KEYS = {
+        "biome": None,
+        "season": None,
+        "camp": None,
+        "not_working": None,
+        "main_status_constraint": "any",
+        "main_age_constraint": None,
+        "main_trait_constraint": None,
+        "main_backstory_constraint": None,
+    }
+
+    def __init__(self, thoughts: List[dict]):
+        self.thoughts = thoughts
+        # thought key -> (positions without that constraint, value -> positions allowing that value)
+        self._buckets: Dict[str, Tuple[Set[int], Dict]] = {}
+        # (thought key, value) -> positions allowed for that value
+        self._matching: Dict[Tuple[str, object], Set[int]] = {}
+
+        for key, any_value in self.INDEXED_KEYS.items():
+            unconstrained = set()
+            by_value = {}
+            for i, thought in enumerate(thoughts):
+                if key not in thought:
+                    unconstrained.add(i)
+                    continue
+                values = thought[key] if isinstance(thought[key], list) else [thought[key]]
+                if any_value is not None and any_value in values:
+                    unconstrained.add(i)
+                    continue
+                for value in values:
+                    by_value.setdefault(value, set()).add(i)
+            self._buckets[key] = (unconstrained, by_value)
+
+    def _positions(self, key, value) -> Set[int]:
+        if (key, value) not in self._matching:
+            unconstrained, by_value = self._buckets[key]
+            try:
+                self._matching[(key, value)] = unconstrained | by_value.get(value, set())
+            except TypeError:
+                # unhashable value, nothing can match it
+                return unconstrained
+        return self._matching[(key, value)]
+
+    def get_thoughts(self, main_cat, biome, season, camp) -> List[dict]:
+        """Returns the thoughts whose main cat and clan constraints are fulfilled."""
+        values = {
+            "biome": biome,
+            "season": season,
+            "camp": camp,
+            "not_working": main_cat.not_working(),
+            "main_status_constraint": main_cat.status,
+            "main_age_constraint": main_cat.age,
+            "main_trait_constraint": main_cat.personality.trait,
+            "main_backstory_constraint": main_cat.backstory,
+        }
+        found = None
+        for key, value in values.items():
+            positions = self._positions(key, value)
+            found = positions if found is None else found & positions
+            if not found:
+                return []
+        return [self.thoughts[i] for i in sorted(found)]
+
+
 class Thoughts:
+    # path(s) of the thought files -> ThoughtIndex
+    thought_indexes: Dict[Tuple[str, ...], ThoughtIndex] = {}
+    # path -> list of thoughts in the file
+    loaded_thought_files: Dict[str, list] = {}
+
+    @staticmethod
+    def load_thought_file(path: str) -> list:
+        """Returns the thoughts in the file. Each file is only read once."""
+        if path not in Thoughts.loaded_thought_files:
+            with open(path, 'r') as read_file:
+                Thoughts.loaded_thought_files[path] = ujson.loads(read_file.read())
+        return Thoughts.loaded_thought_files[path]
+
+    @staticmethod
+    def get_thought_index(*paths: str) -> ThoughtIndex:
+        """Returns the index over all thoughts in the given files, building it on first use."""
+        if paths not in Thoughts.thought_indexes:
+            thoughts = []
+            for path in paths:
+                thoughts += Thoughts.load_thought_file(path)
+            Thoughts.thought_indexes[paths] = ThoughtIndex(thoughts)
+        return Thoughts.thought_indexes[paths]
+
     @staticmethod
     def thought_fulfill_rel_constraints(main_cat, random_cat, constraint) -> bool:
         """Check if the relationship fulfills the interaction relationship constraints."""
@@ -50,6 +146,15 @@ class Thoughts:
     @staticmethod
     def cats_fulfill_thought_constraints(main_cat, random_cat, thought, game_mode, biome, season, camp) -> bool:
         """Check if the two cats fulfills the thought constraints."""
+        if not Thoughts.thought_fulfill_indexed_constraints(main_cat, thought, biome, season, camp):
+            return False
+
+        return Thoughts.cats_fulfill_other_constraints(main_cat, random_cat, thought)
+
+    @staticmethod
+    def thought_fulfill_indexed_constraints(main_cat, thought, biome, season, camp) -> bool:
+        """Check the constraints which only depend on the main cat and the clan. These are the ones
+        ThoughtIndex can look up, so they don't have to be checked for every thought."""
 
         # This is for checking biome
         if "biome" in thought:
@@ -71,6 +176,32 @@ class Thoughts:
             if thought["not_working"] != main_cat.not_working():
                 return False
 
+        # Constraints for the status of the main cat
+        if 'main_status_constraint' in thought:
+            if (main_cat.status not in thought['main_status_constraint'] and
+                    'any' not in thought['main_status_constraint']):
+                return False
+
+        # main cat age constraint
+        if 'main_age_constraint' in thought:
+            if main_cat.age not in thought['main_age_constraint']:
+                return False
+
+        if 'main_trait_constraint' in thought:
+            if main_cat.personality.trait not in thought['main_trait_constraint']:
+                return False
+
+        if 'main_backstory_constraint' in thought:
+            if main_cat.backstory not in thought['main_backstory_constraint']:
+                return False
+
+        return True
+
+    @staticmethod
+    def cats_fulfill_other_constraints(main_cat, random_cat, thought) -> bool:
+        """Check the constraints which are not handled by thought_fulfill_indexed_constraints,
+        mostly the ones about the random cat, relationships, skills and conditions."""
+
         # This is for checking if another cat is needed and there is another cat
         r_c_in = [thought_str for thought_str in thought["thoughts"] if "r_c" in thought_str]
         if len(r_c_in) > 0 and not random_cat:
@@ -81,12 +212,6 @@ class Thoughts:
             if not Thoughts.thought_fulfill_rel_constraints(main_cat, random_cat, thought["relationship_constraint"]):
                 return False
 
-        # Constraints for the status of the main cat
-        if 'main_status_constraint' in thought:
-            if (main_cat.status not in thought['main_status_constraint'] and
-                    'any' not in thought['main_status_constraint']):
-                return False
-
         # Constraints for the status of the random cat
         if 'random_status_constraint' in thought and random_cat:
             if (random_cat.status not in thought['random_status_constraint'] and
@@ -95,19 +220,10 @@ class Thoughts:
         elif 'random_status_constraint' in thought and not random_cat:
             pass
 
-        # main cat age constraint
-        if 'main_age_constraint' in thought:
-            if main_cat.age not in thought['main_age_constraint']:
-                return False
-
         if 'random_age_constraint' in thought and random_cat:
             if random_cat.age not in thought['random_age_constraint']:
                 return False
 
-        if 'main_trait_constraint' in thought:
-            if main_cat.personality.trait not in thought['main_trait_constraint']:
-                return False
-
         if 'random_trait_constraint' in thought and random_cat:
             if random_cat.personality.trait not in thought['random_trait_constraint']:
                 return False
@@ -144,10 +260,6 @@ class Thoughts:
             if not _flag:
                 return False
 
-        if 'main_backstory_constraint' in thought:
-            if main_cat.backstory not in thought['main_backstory_constraint']:
-                return False
-
         if 'random_backstory_constraint' in thought:
             if random_cat and random_cat.backstory not in thought['random_backstory_constraint']:
                 return False
@@ -297,18 +409,14 @@ class Thoughts:
         # newborns only pull from their status thoughts. this is done for convenience
         try:
             if main_cat.age == 'newborn':
-                with open(f"{base_path}{life_dir}{spec_dir}/newborn.json", 'r') as read_file:
-                    thoughts = ujson.loads(read_file.read())
-                loaded_thoughts = thoughts
+                thought_index = Thoughts.get_thought_index(f"{base_path}{life_dir}{spec_dir}/newborn.json")
             else:
-                with open(f"{base_path}{life_dir}{spec_dir}/{status}.json", 'r') as read_file:
-                    thoughts = ujson.loads(read_file.read())
-                with open(f"{base_path}{life_dir}{spec_dir}/general.json", 'r') as read_file:
-                    genthoughts = ujson.loads(read_file.read())
-                loaded_thoughts = thoughts + genthoughts
-
-            final_thoughts = Thoughts.create_thoughts(loaded_thoughts, main_cat, other_cat, game_mode, biome,
-                                                      season, camp)
+                thought_index = Thoughts.get_thought_index(f"{base_path}{life_dir}{spec_dir}/{status}.json",
+                                                           f"{base_path}{life_dir}{spec_dir}/general.json")
+
+            # the index already took care of the main cat constraints
+            final_thoughts = [thought for thought in thought_index.get_thoughts(main_cat, biome, season, camp)
+                              if Thoughts.cats_fulfill_other_constraints(main_cat, other_cat, thought)]
             return final_thoughts
         except IOError:
             print("ERROR: loading thoughts")
@@ -350,15 +458,13 @@ class Thoughts:
         THOUGHTS: []
         try:
             if lives_left > 0:
-                with open(f"{base_path}{spec_dir}/leader_life.json", 'r') as read_file:
-                    THOUGHTS = ujson.loads(read_file.read())
+                THOUGHTS = Thoughts.load_thought_file(f"{base_path}{spec_dir}/leader_life.json")
                 loaded_thoughts = THOUGHTS
                 thought_group = choice(Thoughts.create_death_thoughts(self, loaded_thoughts))
                 chosen_thought = choice(thought_group["thoughts"])
                 return chosen_thought
             else:
-                with open(f"{base_path}{spec_dir}/leader_death.json", 'r') as read_file:
-                    THOUGHTS = ujson.loads(read_file.read())
+                THOUGHTS = Thoughts.load_thought_file(f"{base_path}{spec_dir}/leader_death.json")
                 loaded_thoughts = THOUGHTS
                 thought_group = choice(Thoughts.create_death_thoughts(self, loaded_thoughts))
                 chosen_thought = choice(thought_group["thoughts"])
@@ -377,8 +483,7 @@ class Thoughts:
             spec_dir = "/darkforest"
         THOUGHTS: []
         try:
-            with open(f"{base_path}{spec_dir}/general.json", 'r') as read_file:
-                THOUGHTS = ujson.loads(read_file.read())
+            THOUGHTS = Thoughts.load_thought_file(f"{base_path}{spec_dir}/general.json")
             loaded_thoughts = THOUGHTS
             thought_group = choice(Thoughts.create_death_thoughts(self, loaded_thoughts))
             chosen_thought = choice(thought_group["thoughts"])
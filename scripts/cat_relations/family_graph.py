@@ -0,0 +1,104 @@
+"""
+
+This file contains the family graph, which is shared by all inheritances.
+It holds the parent -> child edges of all cats in Cat.all_cats (blood and adoptive parents),
+so the inheritance of a cat can find its relatives by walking the graph, instead of checking every cat.
+The graph is updated whenever a cat is added, removed or gets different parents.
+
+"""
+
+import itertools
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class FamilyGraph:
+    def __init__(self):
+        self._parents: Dict[str, Tuple[str, ...]] = {}  # child ID: parent IDs
+        self._children: Dict[str, Set[str]] = {}  # parent ID: child IDs
+        # ID: position, in the same order the cats were added to Cat.all_cats
+        self._order: Dict[str, int] = {}
+        self._counter = itertools.count()
+
+        # cat ID: IDs of the cats whose inheritance lists this cat as involved or as other mate
+        self._listed_by: Dict[str, Set[str]] = {}
+        self._listing: Dict[str, Set[str]] = {}  # cat ID: IDs listed in the inheritance of this cat
+
+    @staticmethod
+    def parents_of(cat) -> Tuple[str, ...]:
+        """Returns the IDs of the blood and adoptive parents of the cat."""
+        parent_ids = [parent_id for parent_id in (cat.parent1, cat.parent2) if parent_id]
+        parent_ids.extend(cat.adoptive_parents)
+        return tuple(parent_ids)
+
+    def add_cat(self, cat):
+        """Add a cat, which was just added to Cat.all_cats."""
+        if cat.ID not in self._order:
+            self._order[cat.ID] = next(self._counter)
+        self.update_cat(cat, force=True)
+
+    def update_cat(self, cat, force=False):
+        """Update the edges of the cat to its parents. Cats which were never added are ignored."""
+        if not force and cat.ID not in self._order:
+            return
+        new_parents = self.parents_of(cat)
+        old_parents = self._parents.get(cat.ID, ())
+        if new_parents == old_parents:
+            return
+
+        for parent_id in old_parents:
+            children = self._children.get(parent_id)
+            if children:
+                children.discard(cat.ID)
+        for parent_id in new_parents:
+            self._children.setdefault(parent_id, set()).add(cat.ID)
+        self._parents[cat.ID] = new_parents
+
+    def remove_cat(self, cat_id: str):
+        """Remove a cat, which was removed from Cat.all_cats. The edges to its children are kept."""
+        for parent_id in self._parents.pop(cat_id, ()):
+            children = self._children.get(parent_id)
+            if children:
+                children.discard(cat_id)
+        self._order.pop(cat_id, None)
+
+    def clear(self):
+        self._parents.clear()
+        self._children.clear()
+        self._order.clear()
+        self._listed_by.clear()
+        self._listing.clear()
+
+    def children(self, parent_id: str) -> Set[str]:
+        """Returns the IDs of all cats which have the given cat as blood or adoptive parent."""
+        return self._children.get(parent_id, set())
+
+    def children_of(self, parent_ids: Iterable[str]) -> Set[str]:
+        """Returns the IDs of all cats which have one of the given cats as blood or adoptive parent."""
+        found = set()
+        for parent_id in parent_ids:
+            found |= self._children.get(parent_id, set())
+        return found
+
+    def in_order(self, cat_ids: Iterable[str]) -> List[str]:
+        """Returns the given IDs sorted in the order of Cat.all_cats."""
+        return sorted(cat_ids, key=self._order.__getitem__)
+
+    # ---------------------------------------------------------------------------- #
+    #                          reverse index of inheritances                       #
+    # ---------------------------------------------------------------------------- #
+
+    def set_listed(self, owner_id: str, cat_ids: Iterable[str]):
+        """Record which cats are listed in the inheritance of `owner_id`."""
+        new_ids = set(cat_ids)
+        old_ids = self._listing.get(owner_id, set())
+        for cat_id in old_ids - new_ids:
+            listed_by = self._listed_by.get(cat_id)
+            if listed_by:
+                listed_by.discard(owner_id)
+        for cat_id in new_ids - old_ids:
+            self._listed_by.setdefault(cat_id, set()).add(owner_id)
+        self._listing[owner_id] = new_ids
+
+    def listed_by(self, cat_id: str) -> Set[str]:
+        """Returns the IDs of the cats whose inheritance lists the given cat."""
+        return set(self._listed_by.get(cat_id, ()))
@@ -10,6 +10,8 @@ while mating and for the display of the family tree screen.
 
 from strenum import StrEnum  # pylint: disable=no-name-in-module
 
+from scripts.cat_relations.family_graph import FamilyGraph
+
 
 class RelationType(StrEnum):
     """An enum representing the possible relationships of a cat"""
@@ -30,6 +32,7 @@ BLOOD_RELATIVE_TYPES = [
 
 class Inheritance:
     all_inheritances = {}  # ID: object
+    family_graph = FamilyGraph()  # parent/child edges of all cats in Cat.all_cats
 
     def __init__(self, cat, born=False):
         self.need_update = False
@@ -47,6 +50,10 @@ class Inheritance:
         self.grand_kits = {}
         self.all_involved = []
         self.all_but_cousins = []
+        # frozen versions of all_involved and all_but_cousins for the relation checks, see freeze_relatives
+        self.relatives = frozenset()
+        self.relatives_but_cousins = frozenset()
+        self._forbidden_mates = {}
 
         self.cat = cat
         self.update_inheritance()
@@ -87,9 +94,19 @@ class Inheritance:
         # mates
         self.init_mates()
 
-        for inter_id, inter_cat in self.cat.all_cats.items():
-            if inter_id == self.cat.ID:
-                continue
+        # only kits, siblings, parents_siblings and cousins can be found in the next loop,
+        # so only the children of the cat, its parents, its grandparents and its parents' siblings are checked
+        graph = self.family_graph
+        grandparents_kits = graph.children_of(self.grand_parents)
+        candidates = (
+            graph.children_of([self.cat.ID, *graph.parents_of(self.cat)])
+            | grandparents_kits
+            | graph.children_of(grandparents_kits)
+        )
+        candidates.discard(self.cat.ID)
+
+        for inter_id in graph.in_order(candidates):
+            inter_cat = self.cat.all_cats[inter_id]
 
             # kits + their mates
             self.init_kits(inter_id, inter_cat)
@@ -104,12 +121,11 @@ class Inheritance:
             self.init_cousins(inter_id, inter_cat)
 
         # since grand kits depending on kits, ALL KITS HAVE TO BE SET FIRST!
-        for inter_id, inter_cat in self.cat.all_cats.items():
-            if inter_id == self.cat.ID:
-                continue
-
+        candidates = graph.children_of(self.kits)
+        candidates.discard(self.cat.ID)
+        for inter_id in graph.in_order(candidates):
             # grand kits
-            self.init_grand_kits(inter_id, inter_cat)
+            self.init_grand_kits(inter_id, self.cat.all_cats[inter_id])
 
         # relations to faded cats - these must occur after all non-faded
         # cats have been handled, and in the following order.
@@ -130,6 +146,27 @@ class Inheritance:
                     # if the inheritance is updated, remove the id of the need_update list
                     self.need_update.remove(update_id)
 
+        graph.set_listed(self.cat.ID, self.all_involved + self.other_mates)
+        self.freeze_relatives()
+
+    def freeze_relatives(self):
+        """Rebuild the sets of relatives, called whenever all_involved or all_but_cousins changed."""
+        self.relatives = frozenset(self.all_involved)
+        self.relatives_but_cousins = frozenset(self.all_but_cousins)
+        self._forbidden_mates.clear()
+
+    def forbidden_mates(self, first_cousin_mates: bool) -> frozenset:
+        """The IDs of all cats which can't be a mate of this cat because of their relation, including its own ID."""
+        forbidden = self._forbidden_mates.get(first_cousin_mates)
+        if forbidden is None:
+            relatives = (
+                self.relatives_but_cousins if first_cousin_mates else self.relatives
+            )
+            forbidden = self._forbidden_mates[first_cousin_mates] = relatives | {
+                self.cat.ID
+            }
+        return forbidden
+
     def update_all_related_inheritance(self):
         """Update all the inheritances of the cats, which are related to the current cat."""
         # only adding/removing parents or kits will use this function, because all inheritances are based on parents
@@ -149,12 +186,9 @@ class Inheritance:
         It renews all inheritances, where this cat is listed as a mate of a kit or sibling.
         """
         self.update_inheritance()
-        for inter_inheritances in self.all_inheritances.values():
-            if (
-                self.cat.ID in inter_inheritances.other_mates
-                or self.cat.ID in inter_inheritances.all_involved
-            ):
-                inter_inheritances.update_inheritance()
+        for inter_id in self.family_graph.listed_by(self.cat.ID):
+            if inter_id in self.all_inheritances:
+                self.all_inheritances[inter_id].update_inheritance()
 
     def get_cat_info(self, cat_id) -> dict:
         """Returns a list of the additional information of the given cat id."""
@@ -218,8 +252,11 @@ class Inheritance:
             and parent.ID not in self.cat.adoptive_parents
         ):
             self.cat.adoptive_parents.append(parent.ID)
+            self.family_graph.update_cat(self.cat)
         self.all_involved.append(parent.ID)
         self.all_but_cousins.append(parent.ID)
+        self.family_graph.set_listed(self.cat.ID, self.all_involved + self.other_mates)
+        self.freeze_relatives()
         self.update_all_related_inheritance()
 
     # ---------------------------------------------------------------------------- #
@@ -482,8 +519,10 @@ class Inheritance:
                 }
                 self.other_mates.append(mate_id)
 
-            # iterate over all cats, to get the children of the sibling
-            for _c in self.cat.all_cats.values():
+            # get the children of the sibling
+            graph = self.family_graph
+            for _c_id in graph.in_order(graph.children(inter_id)):
+                _c = self.cat.all_cats[_c_id]
                 _c_parents = self.get_parents(_c)
                 _c_adoptive = self.get_adoptive_parents(_c)
                 if inter_id in _c_parents:
@@ -27,8 +27,8 @@ class SingleInteraction:
     ):
         self.id = interact_id
         self.intensity = intensity
-        self.biome = biome if biome else ["Any"]
-        self.season = season if season else ["Any"]
+        self.biome = frozenset(biome) if biome else frozenset(["Any"])
+        self.season = frozenset(season) if season else frozenset(["Any"])
         self.interactions = (
             interactions
             if interactions
@@ -438,3 +438,76 @@ for rel in rel_types:
 with open(os.path.join(base_path, "neutral.json"), "r") as read_file:
     loaded_list = ujson.loads(read_file.read())
     NEUTRAL_INTERACTIONS = create_interaction(loaded_list)
+
+
+# ---------------------------------------------------------------------------- #
+#                              INTERACTION INDEX                               #
+# ---------------------------------------------------------------------------- #
+
+ANY_TAGS = frozenset(["Any", "any"])
+INTENSITIES = ["low", "medium", "high"]
+
+
+def build_interaction_index(master_dict, neutral, biomes, seasons) -> dict:
+    """
+    Sort the interactions into buckets by everything which doesn't depend on the cats:
+    (rel_type, "increase"/"decrease"/"neutral", intensity, biome, season).
+    Neutral interactions are stored with None as rel_type and intensity, as any intensity is allowed for them.
+    Biomes and seasons which aren't in `biomes` and `seasons` are stored under None,
+    their buckets only hold the interactions which are allowed everywhere.
+    """
+    groups = [
+        ((rel_type, direction), interactions)
+        for rel_type, directions in master_dict.items()
+        for direction, interactions in directions.items()
+    ]
+    groups.append(((None, "neutral"), neutral))
+
+    index = {}
+    for (rel_type, direction), interactions in groups:
+        intensities = [None] if direction == "neutral" else INTENSITIES
+        for intensity in intensities:
+            for biome in [None, *biomes]:
+                allowed_biome = ANY_TAGS | {biome} if biome else ANY_TAGS
+                for season in [None, *seasons]:
+                    allowed_season = ANY_TAGS | {season} if season else ANY_TAGS
+                    index[(rel_type, direction, intensity, biome, season)] = tuple(
+                        interaction
+                        for interaction in interactions
+                        if (intensity is None or interaction.intensity == intensity)
+                        and interaction.biome <= allowed_biome
+                        and interaction.season <= allowed_season
+                    )
+    return index
+
+
+def get_interactions(rel_type, direction, intensity, biome, season) -> tuple:
+    """
+    The interactions of the type and direction ("increase", "decrease" or "neutral")
+    which are allowed for the intensity, biome and season. Only the constraints on the cats are left to check.
+    """
+    if direction == "neutral":
+        rel_type = intensity = None
+    if biome not in INTERACTION_BIOMES:
+        biome = None
+    if season not in INTERACTION_SEASONS:
+        season = None
+    return INTERACTION_INDEX[(rel_type, direction, intensity, biome, season)]
+
+
+_all_interactions = NEUTRAL_INTERACTIONS + [
+    interaction
+    for directions in INTERACTION_MASTER_DICT.values()
+    for interactions in directions.values()
+    for interaction in interactions
+]
+INTERACTION_BIOMES = frozenset().union(*(i.biome for i in _all_interactions)) - ANY_TAGS
+INTERACTION_SEASONS = (
+    frozenset().union(*(i.season for i in _all_interactions)) - ANY_TAGS
+)
+INTERACTION_INDEX = build_interaction_index(
+    INTERACTION_MASTER_DICT,
+    NEUTRAL_INTERACTIONS,
+    INTERACTION_BIOMES,
+    INTERACTION_SEASONS,
+)
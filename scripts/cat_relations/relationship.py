@@ -1,14 +1,22 @@
 import random
+from array import array
+from collections.abc import MutableMapping
 from random import choice
 
 from scripts.cat.history import History
 from scripts.cat_relations.interaction import (
     SingleInteraction,
-    NEUTRAL_INTERACTIONS,
-    INTERACTION_MASTER_DICT,
+    get_interactions,
     rel_fulfill_rel_constraints,
     cats_fulfill_single_interaction_constraints,
 )
+from scripts.cat_relations.relationship_matrix import (
+    RelationshipLog,
+    RelationshipMatrix,
+    STRIDE,
+    ValueCondition,
+    VALUE_NAMES,
+)
 from scripts.event_class import Single_Event
 from scripts.game_structure.game_essentials import game
 from scripts.utility import get_personality_compatibility, process_text
@@ -20,7 +28,30 @@ from scripts.utility import get_personality_compatibility, process_text
 
 
 class Relationship:
+    """
+    The relationship of cat_from towards cat_to.
+
+    A new relationship holds its own values, until it is added to the relationships of cat_from.
+    From then on it is a view into the relationship matrix, like all relationships taken out of
+    `cat.relationships`. Views are created on access, so they shouldn't be used to keep other state.
+    """
+
+    __slots__ = (
+        "cat_from",
+        "cat_to",
+        "chosen_interaction",
+        "_key",
+        "_values",
+        "_base",
+        "_mates",
+        "_family",
+        "_log",
+        "_opposite",
+        "_changed",
+    )
+
     used_interaction_ids = []
+    matrix = RelationshipMatrix()
 
     def __init__(
         self,
@@ -37,21 +68,25 @@ class Relationship:
         trust=0,
         log=None,
     ) -> None:
-        self.chosen_interaction = None
-        self.history = History()
         self.cat_from = cat_from
         self.cat_to = cat_to
+        self.chosen_interaction = None
+
+        # (from slot, to slot) in the matrix, None while the relationship isn't added to cat_from
+        self._key = None
+        self._values = array("B", bytes(STRIDE))
+        self._base = 0
+        self._mates = False
+        self._family = False
+        self._log = RelationshipLog(self)
+        self._opposite = None  # link to opposite relationship will be created later
+        # names of the fields which changed since this relationship was last saved or loaded
+        self._changed = set()
+
         self.mates = mates
         self.family = family
-        self.opposite_relationship = (
-            None  # link to opposite relationship will be created later
-        )
-        self.interaction_str = ""
-        self.triggered_event = False
         if log:
             self.log = log
-        else:
-            self.log = []
 
         # each stat can go from 0 to 100
         self.romantic_love = romantic_love
@@ -62,6 +97,64 @@ class Relationship:
         self.jealousy = jealousy
         self.trust = trust
 
+    @classmethod
+    def view(cls, cat_from, cat_to, key, row):
+        """Returns a relationship which reads and writes the values at `key` in the matrix."""
+        relationship = cls.__new__(cls)
+        relationship.cat_from = cat_from
+        relationship.cat_to = cat_to
+        relationship.chosen_interaction = None
+        relationship._key = key
+        relationship._values = row
+        relationship._base = key[1] * STRIDE
+        return relationship
+
+    def attach(self, key, row):
+        """Move the values of this relationship into the matrix, called when it's added to cat_from."""
+        base = key[1] * STRIDE
+        row[base : base + STRIDE] = self._values[self._base : self._base + STRIDE]
+        self.matrix.set_mate(key, self.mates)
+        self.matrix.set_family(key, self.family)
+        log = self.log if self._key is None else RelationshipLog(None, self.log)
+        self.matrix.store_log(key, log)
+        self.matrix.add(*key)
+        if self._key is None:
+            self._key = key
+            self._values = row
+            self._base = base
+
+    def __eq__(self, other):
+        if self._key is None or not isinstance(other, Relationship):
+            return self is other
+        return self._key == other._key
+
+    def __hash__(self):
+        return hash((id(self.cat_from), id(self.cat_to)))
+
+    def __repr__(self):
+        return f"Relationship({self.cat_from.ID} -> {self.cat_to.ID})"
+
+    @property
+    def changed_fields(self):
+        """The names of the fields which changed since this relationship was last saved or loaded."""
+        if self._key is None:
+            return self._changed
+        return self.matrix.changed_fields(self._key)
+
+    def mark_changed(self, field: str):
+        """Remember that a field changed, so the relationships of cat_from are saved again."""
+        if self._key is None:
+            self._changed.add(field)
+            self.cat_from.changed_fields.add("relationships")
+        else:
+            self.matrix.mark_changed(self._key, field)
+
+    def log_changed(self, log):
+        """Called by the log of this relationship when an entry is added."""
+        if self._key is not None:
+            self.matrix.store_log(self._key, log)
+        self.mark_changed("log")
+
     def link_relationship(self):
         """Add the other relationship object to this easily access and change the other side."""
         if self.cat_from.ID in self.cat_to.relationships:
@@ -112,17 +205,12 @@ class Relationship:
         biome = str(game.clan.biome).casefold()
         game_mode = game.clan.game_mode
 
-        all_interactions = NEUTRAL_INTERACTIONS.copy()
-        if in_de_crease != "neutral":
-            all_interactions = INTERACTION_MASTER_DICT[rel_type][in_de_crease].copy()
-            possible_interactions = self.get_relevant_interactions(
-                all_interactions, intensity, biome, season, game_mode
-            )
-        else:
+        if in_de_crease == "neutral":
             intensity = None
-            possible_interactions = self.get_relevant_interactions(
-                all_interactions, intensity, biome, season, game_mode
-            )
+        possible_interactions = self.get_relevant_interactions(
+            get_interactions(rel_type, in_de_crease, intensity, biome, season),
+            game_mode,
+        )
 
         # return if there are no possible interactions.
         if len(possible_interactions) <= 0:
@@ -145,7 +233,7 @@ class Relationship:
 
         # if the chosen_interaction is still in the TRIGGERED_SINGLE_INTERACTIONS, clean the list
         if chosen_interaction in self.used_interaction_ids:
-            self.used_interaction_ids = []
+            self.used_interaction_ids.clear()
 
         # add the chosen interaction id to the TRIGGERED_SINGLE_INTERACTIONS
         self.chosen_interaction = chosen_interaction
@@ -192,7 +280,7 @@ class Relationship:
 
                 if possible_scar or possible_death:
                     for condition in injuries:
-                        self.history.add_possible_history(
+                        History.add_possible_history(
                             injured_cat,
                             condition,
                             scar_text=possible_scar,
@@ -444,27 +532,15 @@ class Relationship:
         rel_type = choice(types)
         return rel_type
 
-    def get_relevant_interactions(
-        self,
-        interactions: list,
-        intensity: str,
-        biome: str,
-        season: str,
-        game_mode: str,
-    ) -> list:
+    def get_relevant_interactions(self, interactions, game_mode: str) -> list:
         """
-        Filter interactions based on the status and other constraints.
+        Filter interactions based on the status and other constraints of the cats.
+        The intensity, biome and season are already sorted out by get_interactions.
 
             Parameters
             ----------
-            interactions : list
+            interactions : Iterable[SingleInteraction]
                 the interactions which need to be filtered
-            intensity : str
-                the intensity of the interactions
-            biome : str
-                biome of the clan
-            season : str
-                current season of the clan
             game_mode : str
                 game mode of the clan
 
@@ -474,33 +550,7 @@ class Relationship:
                 a list of interactions, which fulfill the criteria
         """
         filtered = []
-        _season = [season, "Any", "any"]
-        _biome = [biome, "Any", "any"]
-        # if there are no loaded interactions, return empty list
-        if not interactions:
-            return filtered
-
         for interact in interactions:
-            in_tags = list(
-                filter(
-                    lambda interact_biome: interact_biome not in _biome, interact.biome
-                )
-            )
-            if len(in_tags) > 0:
-                continue
-
-            in_tags = list(
-                filter(
-                    lambda interact_season: interact_season not in _season,
-                    interact.season,
-                )
-            )
-            if len(in_tags) > 0:
-                continue
-
-            if intensity is not None and interact.intensity != intensity:
-                continue
-
             cats_fulfill_conditions = cats_fulfill_single_interaction_constraints(
                 self.cat_from, self.cat_to, interact, game_mode
             )
@@ -616,9 +666,66 @@ class Relationship:
     #                                   property                                   #
     # ---------------------------------------------------------------------------- #
 
+    @property
+    def opposite_relationship(self):
+        if self._key is None:
+            return self._opposite
+        return self.cat_to.relationships.get(self.cat_from.ID)
+
+    @opposite_relationship.setter
+    def opposite_relationship(self, value):
+        if self._key is None:
+            self._opposite = value
+
+    @property
+    def mates(self):
+        if self._key is None:
+            return self._mates
+        return self.matrix.is_mate(self._key)
+
+    @mates.setter
+    def mates(self, value):
+        if bool(value) != self.mates:
+            if self._key is None:
+                self._mates = bool(value)
+            else:
+                self.matrix.set_mate(self._key, value)
+            self.mark_changed("mates")
+
+    @property
+    def family(self):
+        if self._key is None:
+            return self._family
+        return self.matrix.is_family(self._key)
+
+    @family.setter
+    def family(self, value):
+        if bool(value) != self.family:
+            if self._key is None:
+                self._family = bool(value)
+            else:
+                self.matrix.set_family(self._key, value)
+            self.mark_changed("family")
+
+    @property
+    def log(self):
+        if self._key is None:
+            return self._log
+        log = self.matrix.log(self._key)
+        # empty logs aren't stored, the log stores itself once an entry is added
+        return log if log is not None else RelationshipLog(self)
+
+    @log.setter
+    def log(self, value):
+        if self._key is None:
+            self._log = RelationshipLog(self, value)
+        else:
+            self.matrix.store_log(self._key, RelationshipLog(None, value))
+        self.mark_changed("log")
+
     @property
     def romantic_love(self):
-        return self._romantic_love
+        return self._values[self._base + 0]
 
     @romantic_love.setter
     def romantic_love(self, value):
@@ -626,11 +733,14 @@ class Relationship:
             value = 100
         if value < 0:
             value = 0
-        self._romantic_love = value
+        value = int(value)
+        if value != self._values[self._base + 0]:
+            self._values[self._base + 0] = value
+            self.mark_changed("romantic_love")
 
     @property
     def platonic_like(self):
-        return self._platonic_like
+        return self._values[self._base + 1]
 
     @platonic_like.setter
     def platonic_like(self, value):
@@ -638,11 +748,14 @@ class Relationship:
             value = 100
         if value < 0:
             value = 0
-        self._platonic_like = value
+        value = int(value)
+        if value != self._values[self._base + 1]:
+            self._values[self._base + 1] = value
+            self.mark_changed("platonic_like")
 
     @property
     def dislike(self):
-        return self._dislike
+        return self._values[self._base + 2]
 
     @dislike.setter
     def dislike(self, value):
@@ -650,11 +763,14 @@ class Relationship:
             value = 100
         if value < 0:
             value = 0
-        self._dislike = value
+        value = int(value)
+        if value != self._values[self._base + 2]:
+            self._values[self._base + 2] = value
+            self.mark_changed("dislike")
 
     @property
     def admiration(self):
-        return self._admiration
+        return self._values[self._base + 3]
 
     @admiration.setter
     def admiration(self, value):
@@ -662,11 +778,14 @@ class Relationship:
             value = 100
         if value < 0:
             value = 0
-        self._admiration = value
+        value = int(value)
+        if value != self._values[self._base + 3]:
+            self._values[self._base + 3] = value
+            self.mark_changed("admiration")
 
     @property
     def comfortable(self):
-        return self._comfortable
+        return self._values[self._base + 4]
 
     @comfortable.setter
     def comfortable(self, value):
@@ -674,11 +793,14 @@ class Relationship:
             value = 100
         if value < 0:
             value = 0
-        self._comfortable = value
+        value = int(value)
+        if value != self._values[self._base + 4]:
+            self._values[self._base + 4] = value
+            self.mark_changed("comfortable")
 
     @property
     def jealousy(self):
-        return self._jealousy
+        return self._values[self._base + 5]
 
     @jealousy.setter
     def jealousy(self, value):
@@ -686,11 +808,14 @@ class Relationship:
             value = 100
         if value < 0:
             value = 0
-        self._jealousy = value
+        value = int(value)
+        if value != self._values[self._base + 5]:
+            self._values[self._base + 5] = value
+            self.mark_changed("jealousy")
 
     @property
     def trust(self):
-        return self._trust
+        return self._values[self._base + 6]
 
     @trust.setter
     def trust(self, value):
@@ -698,4 +823,178 @@ class Relationship:
             value = 100
         if value < 0:
             value = 0
-        self._trust = value
+        value = int(value)
+        if value != self._values[self._base + 6]:
+            self._values[self._base + 6] = value
+            self.mark_changed("trust")
+
+
+class RelationshipRow(MutableMapping):
+    """
+    The relationships of a cat, as `cat.relationships`. Works like a dictionary of cat ID: Relationship,
+    the relationships are views into the relationship matrix which are created when accessed.
+    """
+
+    __slots__ = ("cat",)
+
+    matrix = Relationship.matrix
+
+    def __init__(self, cat):
+        self.cat = cat
+
+    def _key(self, cat_id):
+        from_slot = self.matrix.slot(self.cat)
+        to_slot = self.matrix.slot_of_id(cat_id)
+        if (
+            from_slot is None
+            or to_slot is None
+            or not self.matrix.exists(from_slot, to_slot)
+        ):
+            return None
+        return from_slot, to_slot
+
+    def _view(self, key):
+        cat_to = self.matrix.cat(key[1])
+        if cat_to is None:
+            return None
+        return Relationship.view(self.cat, cat_to, key, self.matrix.row(key[0]))
+
+    def __getitem__(self, cat_id) -> Relationship:
+        key = self._key(cat_id)
+        relationship = self._view(key) if key else None
+        if relationship is None:
+            raise KeyError(cat_id)
+        return relationship
+
+    def get(self, cat_id, default=None):
+        key = self._key(cat_id)
+        relationship = self._view(key) if key else None
+        return default if relationship is None else relationship
+
+    def __contains__(self, cat_id) -> bool:
+        return self._key(cat_id) is not None
+
+    def __setitem__(self, cat_id, relationship: Relationship):
+        from_slot = self.matrix.slot(self.cat, create=True)
+        to_slot = self.matrix.slot(relationship.cat_to, create=True)
+        key = (from_slot, to_slot)
+        if relationship._key != key:
+            if relationship.cat_from is self.cat:
+                relationship.attach(key, self.matrix.row(from_slot))
+            else:
+                # the relationship of another cat, only the values are copied
+                base = relationship._base
+                Relationship(
+                    self.cat,
+                    relationship.cat_to,
+                    relationship.mates,
+                    relationship.family,
+                    *relationship._values[base : base + STRIDE],
+                    log=list(relationship.log),
+                ).attach(key, self.matrix.row(from_slot))
+        self.matrix.add(from_slot, to_slot)
+        self.cat.changed_fields.add("relationships")
+
+    def __delitem__(self, cat_id):
+        key = self._key(cat_id)
+        if key is None:
+            raise KeyError(cat_id)
+        self.matrix.discard(*key)
+        self.cat.changed_fields.add("relationships")
+
+    def _targets(self):
+        from_slot = self.matrix.slot(self.cat)
+        if from_slot is None:
+            return from_slot, []
+        return from_slot, self.matrix.targets(from_slot)
+
+    def __iter__(self):
+        _, targets = self._targets()
+        cats = (self.matrix.cat(to_slot) for to_slot in targets)
+        return iter([cat.ID for cat in cats if cat is not None])
+
+    def __len__(self) -> int:
+        from_slot = self.matrix.slot(self.cat)
+        return self.matrix.count(from_slot) if from_slot is not None else 0
+
+    def values(self) -> list:
+        from_slot, targets = self._targets()
+        if not targets:
+            return []
+        row = self.matrix.row(from_slot)
+        view = Relationship.view
+        relationships = []
+        for to_slot in targets:
+            cat_to = self.matrix.cat(to_slot)
+            if cat_to is not None:
+                relationships.append(view(self.cat, cat_to, (from_slot, to_slot), row))
+        return relationships
+
+    def items(self) -> list:
+        return [
+            (relationship.cat_to.ID, relationship) for relationship in self.values()
+        ]
+
+    def keys(self) -> list:
+        return list(self)
+
+    def clear(self):
+        from_slot = self.matrix.slot(self.cat)
+        if from_slot is not None:
+            self.matrix.clear_row(from_slot)
+            self.cat.changed_fields.add("relationships")
+
+    def copy(self) -> dict:
+        return dict(self.items())
+
+    # ---------------------------------------------------------------------------- #
+    #                                    queries                                   #
+    # ---------------------------------------------------------------------------- #
+
+    def select(self, conditions=(), mates=None) -> list:
+        """
+        Returns all cats this cat has a relationship with, which fulfills all conditions.
+        The conditions are checked for the whole row at once, without creating the relationships.
+
+        :param conditions: ValueConditions, e.g. from compile_value_constraints
+        :param mates: If True, only mates are returned, if False only cats which aren't mates
+        """
+        from_slot = self.matrix.slot(self.cat)
+        if from_slot is None:
+            return []
+        cats = (
+            self.matrix.cat(to_slot)
+            for to_slot in self.matrix.select(from_slot, conditions, mates)
+        )
+        return [cat for cat in cats if cat is not None]
+
+    def fulfills(self, cat_id, conditions) -> bool:
+        """True if this cat has a relationship towards the given cat, which fulfills all conditions."""
+        key = self._key(cat_id)
+        return key is not None and self.matrix.fulfills(*key, conditions)
+
+    def sorted_by(self, value: str, minimum: int = 1):
+        """
+        Yields the relationships where the value is at least minimum, highest value first.
+        Relationships with the same value are in the order of the row.
+        """
+        from_slot = self.matrix.slot(self.cat)
+        if from_slot is None:
+            return
+        row = self.matrix.row(from_slot)
+        index = VALUE_NAMES.index(value)
+        to_slots = self.matrix.select(from_slot, (ValueCondition(value, minimum),))
+        to_slots.sort(key=lambda to_slot: row[to_slot * STRIDE + index], reverse=True)
+        for to_slot in to_slots:
+            relationship = self._view((from_slot, to_slot))
+            if relationship is not None:
+                yield relationship
+
+    def clear_changes(self):
+        """Marks all relationships of the cat as unchanged."""
+        from_slot = self.matrix.slot(self.cat)
+        if from_slot is not None:
+            self.matrix.clear_changes(from_slot)
+
+    def __repr__(self):
+        return f"RelationshipRow({self.cat.ID}: {len(self)} relationships)"
@@ -0,0 +1,381 @@
+"""
+
+This file contains the relationship matrix, which stores the relationships of all cats.
+Every cat which has or is the target of a relationship gets a slot. The seven relationship values
+of a cat towards all other cats are kept in one byte array per cat (its row), indexed by the slot of
+the other cat. Which relationships exist and the mates and family flags are bitsets per row,
+the logs are only stored for relationships which have log entries.
+
+`Relationship` objects are lightweight views into this matrix, see relationship.py.
+Slots are given back once the cat object is garbage collected.
+
+"""
+
+import weakref
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# the values of a relationship, in the order they are stored in a row
+VALUE_NAMES = (
+    "romantic_love",
+    "platonic_like",
+    "dislike",
+    "admiration",
+    "comfortable",
+    "jealousy",
+    "trust",
+)
+STRIDE = len(VALUE_NAMES)
+
+# the names used for the values in event and patrol constraints like "platonic_50"
+VALUE_TAGS = {
+    "romantic": "romantic_love",
+    "platonic": "platonic_like",
+    "dislike": "dislike",
+    "admiration": "admiration",
+    "comfortable": "comfortable",
+    "jealousy": "jealousy",
+    "trust": "trust",
+}
+
+
+class ValueCondition(NamedTuple):
+    """A relationship value has to be at least the threshold, or at most the threshold if lower_than is True."""
+
+    value: str
+    threshold: int
+    lower_than: bool = False
+
+    @property
+    def index(self) -> int:
+        return VALUE_NAMES.index(self.value)
+
+    def fulfilled(self, value: int) -> bool:
+        return value <= self.threshold if self.lower_than else value >= self.threshold
+
+
+class ConstraintError(NamedTuple):
+    """Why a relationship value constraint couldn't be parsed. problem is "multiple", "format", "high" or "low"."""
+
+    value_tag: str
+    problem: str
+
+
+@lru_cache(maxsize=None)
+def compile_value_constraints(
+    constraints: Tuple[str, ...], strict: bool = True
+) -> Tuple[Tuple[ValueCondition, ...], Optional[ConstraintError]]:
+    """
+    Parse the relationship value tags out of a tuple of constraints, like ("mates", "platonic_50", "dislike_10_lower_than").
+    The result is cached, so every constraint is only parsed once.
+
+    :param constraints: The constraints of an event, other tags than the value tags are ignored
+    :param strict: If True, only one tag per value is allowed and "lower_than" tags aren't supported (used by events
+    and patrols). Otherwise the first tag of a value is used and tags with more than three parts are "lower_than" tags.
+    :return: The conditions, and the first error or None. Conditions after an invalid tag are left out.
+    """
+    conditions = []
+    for value_tag, value in VALUE_TAGS.items():
+        tags = [constraint for constraint in constraints if value_tag in constraint]
+        if not tags:
+            continue
+        if strict and len(tags) > 1:
+            return tuple(conditions), ConstraintError(value_tag, "multiple")
+
+        split_tag = tags[0].split("_")
+        try:
+            threshold = int(split_tag[1])
+        except (IndexError, ValueError):
+            return tuple(conditions), ConstraintError(value_tag, "format")
+        if threshold > 100:
+            return tuple(conditions), ConstraintError(value_tag, "high")
+        if threshold <= 0:
+            return tuple(conditions), ConstraintError(value_tag, "low")
+
+        lower_than = not strict and len(split_tag) > 3
+        conditions.append(ValueCondition(value, threshold, lower_than))
+    return tuple(conditions), None
+
+
+@lru_cache(maxsize=None)
+def _condition_table(threshold: int, lower_than: bool) -> bytes:
+    """A table for bytes.translate, which turns every value into b"1" if it fulfills the condition, else b"0"."""
+    return bytes(
+        ord("1") if (value <= threshold if lower_than else value >= threshold) else ord("0")
+        for value in range(256)
+    )
+
+
+def set_bits(mask: int) -> List[int]:
+    """Returns the positions of all set bits of the mask, lowest first."""
+    bits = bin(mask)[:1:-1]
+    return [position for position, bit in enumerate(bits) if bit == "1"]
+
+
+class RelationshipLog(list):
+    """
+    The log of a relationship, which marks the relationship as changed whenever an entry is added.
+    Logs of relationships in the matrix are only stored once they have an entry.
+    """
+
+    __slots__ = ("owner", "matrix", "key")
+
+    def __init__(self, owner=None, entries=()):
+        super().__init__(entries)
+        self.owner = owner  # the relationship, until the log is stored in the matrix
+        self.matrix = None
+        self.key = None
+
+    def append(self, entry):
+        super().append(entry)
+        self._changed()
+
+    def extend(self, entries):
+        super().extend(entries)
+        self._changed()
+
+    def _changed(self):
+        if self.key is not None:
+            self.matrix.mark_changed(self.key, "log")
+        elif self.owner is not None:
+            self.owner.log_changed(self)
+
+
+class RelationshipMatrix:
+    def __init__(self):
+        self._slots: Dict[str, int] = {}  # cat ID: slot
+        self._cats: List[Optional[weakref.ref]] = []  # slot: cat
+        self._free: List[int] = []
+        self._capacity = 0
+
+        # per slot, of the relationships from that cat
+        self._rows: List[Optional[array]] = []  # the values, STRIDE bytes for every slot
+        self._exists: List[int] = []
+        self._mates: List[int] = []
+        self._family: List[int] = []
+
+        # (from slot, to slot): ...
+        self._logs: Dict[Tuple[int, int], RelationshipLog] = {}
+        self._changed: Dict[Tuple[int, int], Set[str]] = {}
+
+    def __len__(self) -> int:
+        """The number of cats with a slot."""
+        return len(self._slots)
+
+    # ---------------------------------------------------------------------------- #
+    #                                     slots                                    #
+    # ---------------------------------------------------------------------------- #
+
+    def slot(self, cat, create=False) -> Optional[int]:
+        """Returns the slot of the cat. Cats without one get a slot if `create` is True."""
+        slot = self._slots.get(cat.ID)
+        if slot is not None and self._cats[slot]() is cat:
+            return slot
+        if not create:
+            return None
+
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self._cats)
+            if slot >= self._capacity:
+                self._grow()
+            self._cats.append(None)
+            self._rows.append(None)
+            self._exists.append(0)
+            self._mates.append(0)
+            self._family.append(0)
+        self._cats[slot] = weakref.ref(cat)
+        self._slots[cat.ID] = slot
+
+        finalizer = weakref.finalize(cat, self._release, slot, cat.ID)
+        finalizer.atexit = False
+        return slot
+
+    def slot_of_id(self, cat_id: str) -> Optional[int]:
+        return self._slots.get(cat_id)
+
+    def cat(self, slot: int):
+        """Returns the cat in the slot, or None if it was garbage collected."""
+        ref = self._cats[slot]
+        return ref() if ref is not None else None
+
+    def row(self, slot: int) -> array:
+        """Returns the values of the relationships from the cat in the slot."""
+        row = self._rows[slot]
+        if row is None:
+            row = self._rows[slot] = array("B", bytes(self._capacity * STRIDE))
+        return row
+
+    def _grow(self):
+        old_capacity = self._capacity
+        self._capacity = max(64, old_capacity * 2)
+        extra = bytes((self._capacity - old_capacity) * STRIDE)
+        for row in self._rows:
+            if row is not None:
+                # in place, so relationship views keep pointing at the right row
+                row.frombytes(extra)
+
+    def _release(self, slot: int, cat_id: str):
+        """Called once the cat in the slot is garbage collected."""
+        if self._slots.get(cat_id) == slot:
+            del self._slots[cat_id]
+        bit = 1 << slot
+        for from_slot, exists in enumerate(self._exists):
+            if exists & bit:
+                self._exists[from_slot] &= ~bit
+                self._mates[from_slot] &= ~bit
+                self._family[from_slot] &= ~bit
+        self._cats[slot] = None
+        self._rows[slot] = None
+        self._exists[slot] = 0
+        self._mates[slot] = 0
+        self._family[slot] = 0
+        for pairs in (self._logs, self._changed):
+            for key in [key for key in pairs if slot in key]:
+                del pairs[key]
+        self._free.append(slot)
+
+    # ---------------------------------------------------------------------------- #
+    #                                 relationships                                #
+    # ---------------------------------------------------------------------------- #
+
+    def exists(self, from_slot: int, to_slot: int) -> bool:
+        return bool(self._exists[from_slot] >> to_slot & 1)
+
+    def targets(self, from_slot: int) -> List[int]:
+        """Returns the slots of all cats the cat in the slot has a relationship with."""
+        return set_bits(self._exists[from_slot])
+
+    def count(self, from_slot: int) -> int:
+        return bin(self._exists[from_slot]).count("1")
+
+    def add(self, from_slot: int, to_slot: int):
+        self._exists[from_slot] |= 1 << to_slot
+
+    def discard(self, from_slot: int, to_slot: int):
+        mask = ~(1 << to_slot)
+        self._exists[from_slot] &= mask
+        self._mates[from_slot] &= mask
+        self._family[from_slot] &= mask
+        self._logs.pop((from_slot, to_slot), None)
+        self._changed.pop((from_slot, to_slot), None)
+
+    def clear_row(self, from_slot: int):
+        for to_slot in self.targets(from_slot):
+            self._logs.pop((from_slot, to_slot), None)
+            self._changed.pop((from_slot, to_slot), None)
+        self._exists[from_slot] = 0
+        self._mates[from_slot] = 0
+        self._family[from_slot] = 0
+
+    def is_mate(self, key: Tuple[int, int]) -> bool:
+        return bool(self._mates[key[0]] >> key[1] & 1)
+
+    def set_mate(self, key: Tuple[int, int], value: bool):
+        if value:
+            self._mates[key[0]] |= 1 << key[1]
+        else:
+            self._mates[key[0]] &= ~(1 << key[1])
+
+    def is_family(self, key: Tuple[int, int]) -> bool:
+        return bool(self._family[key[0]] >> key[1] & 1)
+
+    def set_family(self, key: Tuple[int, int], value: bool):
+        if value:
+            self._family[key[0]] |= 1 << key[1]
+        else:
+            self._family[key[0]] &= ~(1 << key[1])
+
+    def log(self, key: Tuple[int, int]) -> Optional[RelationshipLog]:
+        return self._logs.get(key)
+
+    def store_log(self, key: Tuple[int, int], log: RelationshipLog):
+        """Keep the log of a relationship, or drop it if it's empty."""
+        if not log:
+            self._logs.pop(key, None)
+            return
+        log.owner = None
+        log.matrix = self
+        log.key = key
+        self._logs[key] = log
+
+    # ---------------------------------------------------------------------------- #
+    #                                change tracking                               #
+    # ---------------------------------------------------------------------------- #
+
+    def changed_fields(self, key: Tuple[int, int]) -> Set[str]:
+        return self._changed.get(key, set())
+
+    def mark_changed(self, key: Tuple[int, int], field: str):
+        self._changed.setdefault(key, set()).add(field)
+        cat_from = self.cat(key[0])
+        if cat_from is not None:
+            cat_from.changed_fields.add("relationships")
+
+    def clear_changes(self, from_slot: int):
+        for to_slot in self.targets(from_slot):
+            self._changed.pop((from_slot, to_slot), None)
+
+    # ---------------------------------------------------------------------------- #
+    #                                    queries                                   #
+    # ---------------------------------------------------------------------------- #
+
+    def condition_mask(self, from_slot: int, condition: ValueCondition) -> int:
+        """Returns a bitset of the slots whose value in the row fulfills the condition, in one pass over the row."""
+        column = self.row(from_slot).tobytes()[condition.index :: STRIDE]
+        fulfilled = column.translate(
+            _condition_table(condition.threshold, condition.lower_than)
+        )
+        return int(fulfilled[::-1], 2) if fulfilled else 0
+
+    def select(
+        self,
+        from_slot: int,
+        conditions: Iterable[ValueCondition] = (),
+        mates: Optional[bool] = None,
+    ) -> List[int]:
+        """
+        Returns the slots of all cats the cat in from_slot has a relationship with, which fulfills all conditions.
+
+        :param mates: If True, only mates are selected, if False only cats which aren't mates
+        """
+        selected = self._exists[from_slot]
+        if mates is not None:
+            selected &= self._mates[from_slot] if mates else ~self._mates[from_slot]
+        for condition in conditions:
+            if not selected:
+                break
+            selected &= self.condition_mask(from_slot, condition)
+        return set_bits(selected)
+
+    def fulfills(
+        self, from_slot: int, to_slot: int, conditions: Iterable[ValueCondition]
+    ) -> bool:
+        """True if the relationship exists and fulfills all conditions."""
+        if not self.exists(from_slot, to_slot):
+            return False
+        row = self.row(from_slot)
+        base = to_slot * STRIDE
+        return all(
+            condition.fulfilled(row[base + condition.index]) for condition in conditions
+        )
+
+    def value(self, from_slot: int, to_slot: int, value: str) -> int:
+        return self.row(from_slot)[to_slot * STRIDE + VALUE_NAMES.index(value)]
+
+    def count_towards(
+        self, to_slot: int, from_slots: Iterable[int], threshold: int
+    ) -> Dict[str, int]:
+        """Counts for every value, how many relationships from the given slots towards to_slot reach the threshold."""
+        counts = dict.fromkeys(VALUE_NAMES, 0)
+        base = to_slot * STRIDE
+        for from_slot in from_slots:
+            if not self.exists(from_slot, to_slot):
+                continue
+            values = self.row(from_slot)[base : base + STRIDE]
+            for value_name, value in zip(VALUE_NAMES, values):
+                if value >= threshold:
+                    counts[value_name] += 1
+        return counts
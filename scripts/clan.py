@@ -20,6 +20,7 @@ from scripts.cat.cats import Cat, cat_class
 from scripts.cat.history import History
 from scripts.cat.names import names
 from scripts.cat.sprites import sprites
+from scripts.cat_relations.inheritance import Inheritance
 from scripts.clan_resources.freshkill import FreshkillPile, Nutrition
 from scripts.events_module.generate_events import OngoingEvent
 from scripts.game_structure.game_essentials import game
@@ -376,7 +377,8 @@ class Clan:
             Cat.all_cats_list.remove(Cat.all_cats[ID])
 
         if ID in Cat.all_cats:
-            Cat.all_cats.pop(ID)
+            Cat.all_cats.pop(ID).remove_from_pool()
+            Inheritance.family_graph.remove_cat(ID)
 
         if ID in self.clan_cats:
             self.clan_cats.remove(ID)
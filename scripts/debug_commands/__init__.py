@@ -5,7 +5,9 @@ from scripts.debug_commands.command import Command
 from scripts.debug_commands.eval import EvalCommand
 from scripts.debug_commands.fps import FpsCommand
 from scripts.debug_commands.help import HelpCommand
+from scripts.debug_commands.profile import ProfileCommand, CProfileCommand
 from scripts.debug_commands.settings import ToggleCommand, SetCommand, GetCommand
+from scripts.debug_commands.stats import MemoryCommand, CachesCommand
 
 commandList: List[Command] = [
     ToggleCommand(),
@@ -13,7 +15,11 @@ commandList: List[Command] = [
     GetCommand(),
     EvalCommand(),
     FpsCommand(),
-    CatsCommand()
+    CatsCommand(),
+    ProfileCommand(),
+    CProfileCommand(),
+    MemoryCommand(),
+    CachesCommand()
 ]
 
 helpCommand = HelpCommand(commandList)
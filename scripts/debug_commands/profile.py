@@ -0,0 +1,164 @@
+from typing import List
+
+from scripts.cat.cats import Cat
+from scripts.debug_commands.command import Command
+from scripts.debug_commands.utils import add_output_line_to_log, add_multiple_lines_to_log
+from scripts.housekeeping.profiler import code_profiler, profiler
+
+
+class StartProfileCommand(Command):
+    name = "start"
+    description = "Start timing the phases of every moon skip"
+    aliases = ["on"]
+
+    def callback(self, args: List[str]):
+        if profiler.enabled:
+            add_output_line_to_log("Profiling is already running")
+            return
+        profiler.enable()
+        add_output_line_to_log(
+            f"Profiling moon skips, the report is written to {profiler.report_name}.json/.csv in the log folder"
+        )
+
+
+class StopProfileCommand(Command):
+    name = "stop"
+    description = "Stop timing moon skips, the recorded times are kept"
+    aliases = ["off"]
+
+    def callback(self, args: List[str]):
+        profiler.disable()
+        add_output_line_to_log(f"Profiling stopped after {profiler.moons} moons")
+
+
+class ShowProfileCommand(Command):
+    name = "show"
+    description = "Show the slowest phases, or the slowest cats of a phase"
+    usage = "[phase] [number of cats]"
+    aliases = ["s"]
+
+    def callback(self, args: List[str]):
+        if not profiler.totals:
+            add_output_line_to_log("Nothing recorded yet, use 'profile start' and skip a moon")
+            return
+        if len(args) == 0:
+            add_multiple_lines_to_log(profiler.report())
+            return
+
+        phase = args[0]
+        if phase not in profiler.totals:
+            add_output_line_to_log(f"No times recorded for {phase}")
+            return
+        amount = int(args[1]) if len(args) > 1 and args[1].isnumeric() else 5
+        slowest = profiler.slowest_cats(phase, amount)
+        if not slowest:
+            add_output_line_to_log(f"{phase} isn't timed per cat")
+            return
+        for cat_id, calls, total in slowest:
+            cat = Cat.all_cats.get(cat_id)
+            add_output_line_to_log(
+                f"{cat_id} - {cat.name if cat else '?'}: {total * 1000:.1f} ms in {calls} calls"
+            )
+
+
+class SaveProfileCommand(Command):
+    name = "save"
+    description = "Write the report to the log folder now"
+
+    def callback(self, args: List[str]):
+        json_path, csv_path = profiler.write_report()
+        add_output_line_to_log(f"Wrote {json_path} and {csv_path}")
+
+
+class ResetProfileCommand(Command):
+    name = "reset"
+    description = "Forget the recorded times"
+
+    def callback(self, args: List[str]):
+        profiler.reset()
+        add_output_line_to_log("Profile reset")
+
+
+class ProfileCommand(Command):
+    name = "profile"
+    description = "Time the phases of moon skips"
+    aliases = ["prof"]
+
+    sub_commands = [
+        StartProfileCommand(),
+        StopProfileCommand(),
+        ShowProfileCommand(),
+        SaveProfileCommand(),
+        ResetProfileCommand(),
+    ]
+
+    def callback(self, args: List[str]):
+        add_output_line_to_log(
+            f"Profiling is {'running' if profiler.enabled else 'stopped'}, {profiler.moons} moons recorded"
+        )
+        add_output_line_to_log("Please specify a subcommand: start, stop, show, save or reset")
+
+
+class FramesCProfileCommand(Command):
+    name = "frames"
+    description = "Run cProfile for the next frames and show the slowest functions"
+    usage = "[number of frames]"
+    aliases = ["f"]
+
+    def callback(self, args: List[str]):
+        frames = int(args[0]) if len(args) > 0 and args[0].isnumeric() else 60
+        code_profiler.start_frames(frames)
+        add_output_line_to_log(f"Profiling the next {frames} frames")
+
+
+class MoonCProfileCommand(Command):
+    name = "moon"
+    description = "Run cProfile for the next moon skip and show the slowest functions"
+    aliases = ["timeskip", "m"]
+
+    def callback(self, args: List[str]):
+        code_profiler.start_moon()
+        add_output_line_to_log("Profiling the next moon skip")
+
+
+class StopCProfileCommand(Command):
+    name = "stop"
+    description = "Stop the running cProfile session"
+
+    def callback(self, args: List[str]):
+        report = code_profiler.stop()
+        if report:
+            add_multiple_lines_to_log(report)
+        else:
+            add_output_line_to_log("Stopped")
+
+
+class ShowCProfileCommand(Command):
+    name = "show"
+    description = "Show the result of the last cProfile session again"
+    aliases = ["s"]
+
+    def callback(self, args: List[str]):
+        if not code_profiler.last_report:
+            add_output_line_to_log("Nothing profiled yet")
+            return
+        add_multiple_lines_to_log(code_profiler.last_report)
+
+
+class CProfileCommand(Command):
+    name = "cprofile"
+    description = "Profile the game with cProfile, the full results are saved in the log folder"
+    aliases = ["cprof"]
+
+    sub_commands = [
+        FramesCProfileCommand(),
+        MoonCProfileCommand(),
+        StopCProfileCommand(),
+        ShowCProfileCommand(),
+    ]
+
+    def callback(self, args: List[str]):
+        add_output_line_to_log(
+            f"cProfile is {'running' if code_profiler.running else 'stopped'}"
+        )
+        add_output_line_to_log("Please specify a subcommand: frames, moon, stop or show")
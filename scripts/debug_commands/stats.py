@@ -0,0 +1,142 @@
+import gc
+import sys
+import tracemalloc
+from typing import List, Tuple
+
+from scripts.cat.cats import Cat
+from scripts.cat.sprite_atlas import sprite_atlas
+from scripts.cat.sprite_cache import sprite_cache
+from scripts.cat.sprites import sprites
+from scripts.cat_relations.inheritance import Inheritance
+from scripts.cat_relations.relationship import Relationship
+from scripts.debug_commands.command import Command
+from scripts.debug_commands.utils import add_output_line_to_log
+from scripts.events_module.generate_events import GenerateEvents
+from scripts.game_structure.game_essentials import game
+from scripts.patrol.patrol_catalog import patrol_catalog
+from scripts.utility import parse_text_template
+
+try:
+    import resource
+except ImportError:  # not on Windows
+    resource = None
+
+
+def count_objects(*classes) -> List[int]:
+    """The number of living instances of each class, including ones no longer in any list."""
+    counts = [0] * len(classes)
+    for obj in gc.get_objects():
+        for index, cls in enumerate(classes):
+            if isinstance(obj, cls):
+                counts[index] += 1
+    return counts
+
+
+def surface_bytes(surfaces) -> int:
+    return sum(
+        surface.get_width() * surface.get_height() * surface.get_bytesize()
+        for surface in surfaces
+    )
+
+
+def memory_stats() -> List[str]:
+    cat_count, relationship_count, inheritance_count = count_objects(
+        Cat, Relationship, Inheritance
+    )
+    alive = sum(1 for cat in Cat.all_cats.values() if not cat.dead)
+    matrix = Relationship.matrix
+    # the values of the relationship matrix are stored as one byte each
+    matrix_bytes = sum(len(row) for row in matrix._rows if row is not None)  # pylint: disable=protected-access
+    event_files = GenerateEvents.loaded_events
+
+    lines = [
+        f"Cats: {len(Cat.all_cats)} loaded ({alive} alive), {len(Cat.faded_cache)} faded cached, "
+        f"{cat_count} objects",
+        f"Relationships: {relationship_count} objects, matrix of {len(matrix)} cats, "
+        f"{matrix_bytes / 1024:.0f} KiB values",
+        f"Inheritance: {len(Inheritance.all_inheritances)} loaded, {inheritance_count} objects",
+        f"Sprite sheets: {len(sprites.spritesheets)} loaded, "
+        f"{surface_bytes(sprites.spritesheets.values()) / 1024 ** 2:.1f} MiB, "
+        f"{len(sprites.sprites)} sprites, {len(sprites.layers)} shared layers "
+        f"({surface_bytes(sprites.layers.values()) / 1024 ** 2:.1f} MiB)",
+        str(sprite_cache),
+        str(sprite_atlas),
+        f"Event dicts: {len(event_files)} files, "
+        f"{sum(len(events) for events in event_files.values())} events loaded",
+    ]
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        peak_mib = peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+        lines.append(f"Peak memory of the game: {peak_mib:.0f} MiB")
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        lines.append(
+            f"Traced since 'memory trace': {current / 1024 ** 2:.1f} MiB now, "
+            f"{peak / 1024 ** 2:.1f} MiB peak"
+        )
+        lines.append("Most memory allocated by:")
+        for stat in tracemalloc.take_snapshot().statistics("lineno")[:10]:
+            lines.append(f"  {stat}")
+    return lines
+
+
+def hit_rate(hits: int, misses: int) -> str:
+    total = hits + misses
+    return f"{hits} hits, {misses} misses ({hits / total if total else 0:.0%} hit rate)"
+
+
+def cache_stats() -> List[Tuple[str, str]]:
+    template_info = parse_text_template.cache_info()
+    rows = [
+        ("Faded cats", hit_rate(Cat.faded_cache.hits, Cat.faded_cache.misses)),
+        ("Patrol files", hit_rate(patrol_catalog.hits, patrol_catalog.loads)),
+        (
+            "Cat sprites",
+            f"{hit_rate(sprite_cache.hits, sprite_cache.misses)}, "
+            f"{sprite_cache.invalidations} invalidations",
+        ),
+        ("Sprite atlas", hit_rate(sprite_atlas.hits, sprite_atlas.misses)),
+        ("Sprite layers", hit_rate(sprites.layer_hits, sprites.layer_misses)),
+        ("Text templates", hit_rate(template_info.hits, template_info.misses)),
+    ]
+    for clan_dir, storage in game.save_storages.items():
+        rows.append(
+            (
+                f"Save records of {clan_dir}",
+                f"{storage.records_written} written, {storage.records_skipped} unchanged",
+            )
+        )
+    return rows
+
+
+class MemoryCommand(Command):
+    name = "memory"
+    description = "Show object counts and memory use. 'memory trace' starts or stops tracing allocations"
+    usage = "[trace]"
+    aliases = ["mem"]
+
+    def callback(self, args: List[str]):
+        if len(args) > 0 and args[0] == "trace":
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+                add_output_line_to_log("Stopped tracing allocations")
+            else:
+                tracemalloc.start()
+                add_output_line_to_log(
+                    "Tracing allocations, this slows the game down. Use 'memory' to see them"
+                )
+            return
+
+        for line in memory_stats():
+            add_output_line_to_log(line)
+
+
+class CachesCommand(Command):
+    name = "caches"
+    description = "Show the hit rates of the caches"
+    aliases = ["cache"]
+
+    def callback(self, args: List[str]):
+        for name, stats in cache_stats():
+            add_output_line_to_log(f"{name}: {stats}")
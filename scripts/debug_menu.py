@@ -11,6 +11,7 @@ import scripts.game_structure.screen_settings
 import scripts.game_structure.screen_settings
 from scripts.debug_commands import commandList
 from scripts.debug_commands.utils import set_debug_class
+from scripts.housekeeping.profiler import code_profiler
 from scripts.game_structure.game_essentials import game
 from scripts.game_structure.screen_settings import MANAGER
 from scripts.utility import get_text_box_theme
@@ -147,6 +148,12 @@ class debugMode:
         This is called BEFORE pygame_gui updates elements
         """
 
+        # a cProfile session started from the console finished
+        report = code_profiler.frame()
+        if report:
+            for line in report.split("\n"):
+                self.console.add_output_line_to_log(line)
+
         # Showcoords
         if game.debug_settings["showcoords"]:
             if self.coords_display.visible == 0:
@@ -142,33 +142,7 @@ class Events:
         # self.disaster_events.handle_disasters()
 
         # Handle grief events.
-        if Cat.grief_strings:
-            # Grab all the dead or outside cats, who should not have grief text
-            for ID in Cat.grief_strings.copy():
-                check_cat = Cat.all_cats.get(ID)
-                if isinstance(check_cat, Cat):
-                    if check_cat.dead or check_cat.outside:
-                        Cat.grief_strings.pop(ID)
-
-            # Generate events
-
-            for cat_id, values in Cat.grief_strings.items():
-                for _val in values:
-                    if _val[2] == "minor":
-                        # Apply the grief message as a thought to the cat
-                        text = event_text_adjust(
-                            Cat,
-                            _val[0],
-                            main_cat=Cat.fetch_cat(cat_id),
-                            random_cat=Cat.fetch_cat(_val[1][0]))
-
-                        Cat.fetch_cat(cat_id).thought = text
-                    else:
-                        game.cur_events_list.append(
-                            Single_Event(_val[0], ["birth_death", "relation"], _val[1])
-                        )
-
-            Cat.grief_strings.clear()
+        self.handle_grief()
 
         if Cat.dead_cats:
             ghost_names = []
@@ -301,6 +275,40 @@ class Events:
             except:
                 SaveError(traceback.format_exc())
 
+    def handle_grief(self):
+        """
+        Turns the grief collected from this moon's deaths into thoughts and events.
+        """
+        if not Cat.grief_strings:
+            return
+
+        # Grab all the dead or outside cats, who should not have grief text
+        for ID in Cat.grief_strings.copy():
+            check_cat = Cat.all_cats.get(ID)
+            if isinstance(check_cat, Cat):
+                if check_cat.dead or check_cat.outside:
+                    Cat.grief_strings.pop(ID)
+
+        # Generate events
+
+        for cat_id, values in Cat.grief_strings.items():
+            for _val in values:
+                if _val[2] == "minor":
+                    # Apply the grief message as a thought to the cat
+                    text = event_text_adjust(
+                        Cat,
+                        _val[0],
+                        main_cat=Cat.fetch_cat(cat_id),
+                        random_cat=Cat.fetch_cat(_val[1][0]))
+
+                    Cat.fetch_cat(cat_id).thought = text
+                else:
+                    game.cur_events_list.append(
+                        Single_Event(_val[0], ["birth_death", "relation"], _val[1])
+                    )
+
+        Cat.grief_strings.clear()
+
     def handle_lead_den_event(self):
         """
         Handles the events that are chosen in the leaders den the previous moon and resets the relevant clan settings
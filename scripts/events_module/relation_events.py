@@ -5,6 +5,7 @@ from random import choice, randint
 import ujson
 
 from scripts.cat.cats import Cat
+from scripts.cat_relations.relationship_matrix import compile_value_constraints
 from scripts.events_module.relationship.group_events import GroupEvents
 from scripts.events_module.relationship.romantic_events import Romantic_Events
 from scripts.events_module.relationship.welcoming_events import Welcoming_Events
@@ -276,8 +277,29 @@ class Relation_Events:
             )
         )
         cat_list.remove(main_cat)
-        filtered_cat_list = []
 
+        conditions, error = compile_value_constraints(tuple(constraint), strict=False)
+        if error:
+            messages = {
+                "format": f"ERROR: while creating a cat group, the relationship constraint for the value {error.value_tag} follows not the formatting guidelines.",
+                "high": f"ERROR: while creating a cat group, the relationship constraints for the value {error.value_tag}, which is higher than the max value of a relationship.",
+                "low": f"ERROR: while creating a cat group, the relationship constraints for the value {error.value_tag}, which is lower than the min value of a relationship or 0.",
+            }
+            print(messages[error.problem])
+
+        # the value and mate constraints are checked for all relationships of main_cat at once
+        mates = None
+        if "mates" in constraint:
+            mates = True
+        if "not_mates" in constraint:
+            mates = False
+        fulfilling_ids = {
+            cat.ID for cat in main_cat.relationships.select(conditions, mates)
+        }
+        if "mates" in constraint and "not_mates" in constraint:
+            fulfilling_ids = set()
+
+        filtered_cat_list = []
         for inter_cat in cat_list:
             cat_from = main_cat
             cat_to = inter_cat
@@ -290,15 +312,10 @@ class Relation_Events:
                     cat_to.create_one_relationship(cat_from)
                 continue
 
-            relationship = cat_from.relationships[cat_to.ID]
-
-            if "siblings" in constraint and not cat_from.is_sibling(cat_to):
+            if cat_to.ID not in fulfilling_ids:
                 continue
 
-            if "mates" in constraint and not relationship.mates:
-                continue
-
-            if "not_mates" in constraint and relationship.mates:
+            if "siblings" in constraint and not cat_from.is_sibling(cat_to):
                 continue
 
             if "parent/child" in constraint and not cat_from.is_parent(cat_to):
@@ -307,85 +324,6 @@ class Relation_Events:
             if "child/parent" in constraint and not cat_to.is_parent(cat_from):
                 continue
 
-            value_types = [
-                "romantic",
-                "platonic",
-                "dislike",
-                "admiration",
-                "comfortable",
-                "jealousy",
-                "trust",
-            ]
-            fulfilled = True
-            for v_type in value_types:
-                tags = [i for i in constraint if v_type in i]
-                if len(tags) < 1:
-                    continue
-                threshold = 0
-                lower_than = False
-                # try to extract the value/threshold from the text
-                try:
-                    splitted = tags[0].split("_")
-                    threshold = int(splitted[1])
-                    if len(splitted) > 3:
-                        lower_than = True
-                except:
-                    print(
-                        f"ERROR: while creating a cat group, the relationship constraint for the value {v_type} follows not the formatting guidelines."
-                    )
-                    break
-
-                if threshold > 100:
-                    print(
-                        f"ERROR: while creating a cat group, the relationship constraints for the value {v_type}, which is higher than the max value of a relationship."
-                    )
-                    break
-
-                if threshold <= 0:
-                    print(
-                        f"ERROR: while creating a cat group, the relationship constraints for the value {v_type}, which is lower than the min value of a relationship or 0."
-                    )
-                    break
-
-                threshold_fulfilled = False
-                if v_type == "romantic":
-                    if not lower_than and relationship.romantic_love >= threshold:
-                        threshold_fulfilled = True
-                    elif lower_than and relationship.romantic_love <= threshold:
-                        threshold_fulfilled = True
-                if v_type == "platonic":
-                    if not lower_than and relationship.platonic_like >= threshold:
-                        threshold_fulfilled = True
-                    elif lower_than and relationship.platonic_like <= threshold:
-                        threshold_fulfilled = True
-                if v_type == "dislike":
-                    if not lower_than and relationship.dislike >= threshold:
-                        threshold_fulfilled = True
-                    elif lower_than and relationship.dislike <= threshold:
-                        threshold_fulfilled = True
-                if v_type == "comfortable":
-                    if not lower_than and relationship.comfortable >= threshold:
-                        threshold_fulfilled = True
-                    elif lower_than and relationship.comfortable <= threshold:
-                        threshold_fulfilled = True
-                if v_type == "jealousy":
-                    if not lower_than and relationship.jealousy >= threshold:
-                        threshold_fulfilled = True
-                    elif lower_than and relationship.jealousy <= threshold:
-                        threshold_fulfilled = True
-                if v_type == "trust":
-                    if not lower_than and relationship.trust >= threshold:
-                        threshold_fulfilled = True
-                    elif lower_than and relationship.trust <= threshold:
-                        threshold_fulfilled = True
-
-                if not threshold_fulfilled:
-                    fulfilled = False
-                    continue
-
-            if not fulfilled:
-                continue
-
             filtered_cat_list.append(inter_cat)
         return filtered_cat_list
 
@@ -1,6 +1,6 @@
 import os
-from copy import deepcopy
-from random import choice, shuffle
+from random import choice, sample, shuffle
+from typing import Dict, List, Optional
 
 import ujson
 
@@ -55,8 +55,9 @@ class GroupEvents:
     del base_path
 
     abbreviations_cat_id = {}
-    cat_abbreviations_counter = {}
     chosen_interaction = None
+    # the most cats tried for the abbreviations of one interaction, before it counts as not possible
+    assign_node_budget = 200
 
     @staticmethod
     def start_interaction(cat: Cat, interact_cats: list) -> list:
@@ -106,16 +107,12 @@ class GroupEvents:
             possibilities, biome, season, abbreviations_cat_id
         )
 
-        # get possible interactions, considering the possible interacting cats
-        possibilities = GroupEvents.get_filtered_interactions(
-            possibilities, int(cat_amount), interact_cats, abbreviations_cat_id
+        # find an interaction for which the other cats can be assigned to all abbreviations
+        chosen_interaction, abbreviations_cat_id = GroupEvents.choose_interaction(
+            possibilities, interact_cats, abbreviations_cat_id
         )
-
-        # if there is no possibility return
-        if len(possibilities) < 1:
+        if chosen_interaction is None:
             return []
-        # choose one interaction and
-        chosen_interaction = choice(possibilities)
 
         # TRIGGER ALL NEEDED FUNCTIONS TO REFLECT THE INTERACTION
         GroupEvents.injuring_cats(chosen_interaction, abbreviations_cat_id)
@@ -224,221 +221,159 @@ class GroupEvents:
         return filtered_interactions
 
     @staticmethod
-    def get_filtered_interactions(
-        interactions: list, amount: int, interact_cats: list, abbreviations_cat_id: dict
-    ):
-        """First assign which cat is which abbreviation, then filtered interaction list based on all constraints, which include the other cats.
+    def choose_interaction(
+        interactions: list, interact_cats: list, abbreviations_cat_id: dict
+    ) -> tuple:
+        """Choose a random interaction, for which the interact cats can be assigned to all abbreviations.
 
         Parameters
         ----------
         interactions : list
-            the interactions which need to be filtered
-        amount : int
-            the amount of cats which are be needed for these interactions
+            the interactions which are already filtered for the main cat
         interact_cats : list
             a list of cats, which are open to interact with the main cat
+        abbreviations_cat_id : dict
+            the abbreviations of the interaction, only m_c is set
 
         Returns
         -------
-        filtered : list
-            a list of interactions, which fulfill the criteria
-
+        tuple
+            the chosen interaction and the abbreviations with the assigned cat ids,
+            (None, None) if no interaction is possible
         """
-        # first handle the abbreviations possibilities for the cats
-        abbr_per_interaction, cat_abbreviations_counter = (
-            GroupEvents.get_abbreviations_possibilities(
-                interactions, int(amount), interact_cats
-            )
-        )
-        abbr_per_interaction = GroupEvents.remove_abbreviations_missing_cats(
-            abbr_per_interaction
-        )
-        abbreviations_cat_id = GroupEvents.set_abbreviations_cats(
-            interact_cats, abbreviations_cat_id, cat_abbreviations_counter
-        )
-
-        # check if any abbreviations_cat_ids is None, if so return
-        not_none = [abbr != None for abbr in abbreviations_cat_id.values()]
-        if not all(not_none):
-            return []
-
-        # last filter based on relationships between the cats
-        filtered = []
-        for interact in interactions:
-            # if this interaction is not in the  abbreviations dictionary,
-            # there is no solution for the cat-abbreviations problem and thus, this
-            # interaction is not possible
-            if interact.id not in abbr_per_interaction.keys():
+        eligibility = CatEligibility(interact_cats)
+        # the first possible interaction of the shuffled list is a random choice of all possible interactions
+        for interact in sample(interactions, len(interactions)):
+            assigned = GroupEvents.assign_cats(interact, abbreviations_cat_id, eligibility)
+            if assigned is None:
                 continue
-
-            # check how the cats are and if they are fulfill the constraints like: status, trait, skill, ...
-            cat_allow_interaction = GroupEvents.cat_allow_interaction(
-                interact, abbreviations_cat_id
-            )
-            if not cat_allow_interaction:
-                continue
-
-            # now check for relationship constraints
-            relationship_allow_interaction = (
-                GroupEvents.relationship_allow_interaction(
-                    interact, abbreviations_cat_id
-                )
-            )
-            if not relationship_allow_interaction:
-                continue
-
-            filtered.append(interact)
-
-        return filtered
+            # creates the missing relationships between the cats
+            GroupEvents.relationship_allow_interaction(interact, assigned)
+            return interact, assigned
+        return None, None
 
     @staticmethod
-    def get_abbreviations_possibilities(
-        interactions: list, amount: int, interact_cats: list
-    ) -> tuple:
-        """Iterate over all pre-filtered interactions and
-        check which cat fulfills skill/trait/status condition of which abbreviation.
-
-        Parameters
-        ----------
-        interactions : list
-            the interactions which need to be filtered
-        amount : int
-            the amount of cats for the current interaction
-        interact_cats : list
-            a list of cats, which are open to interact with the main cat
-        """
-        cat_abbreviations_counter = {}
-        possibilities = {}
-        # prepare how the base dictionary should look,
-        # this depends on the chosen cat amount -> which abbreviation are needed
-        base_dictionary = {}
-        for integer in range(amount):
-            new_key = "r_c" + str(integer + 1)
-            base_dictionary[new_key] = []
+    def assign_cats(
+        interaction: GroupInteraction,
+        abbreviations_cat_id: dict,
+        eligibility: "CatEligibility",
+    ) -> Optional[Dict[str, str]]:
+        """Assign a different cat to every abbreviation, so all constraints of the interaction are fulfilled.
+        The possible cats of each abbreviation are first filtered by the relationship constraints with the main cat.
+        Then the abbreviation with the fewest possible cats left is assigned next, and every assignment removes the
+        cats which don't fit to it from the abbreviations still to assign. The search gives up after
+        assign_node_budget tried cats. Returns the abbreviations with the cat ids, or None if there is no
+        possible assignment."""
+        main_cat = Cat.all_cats[abbreviations_cat_id["m_c"]]
+        cats = eligibility.cats
+        slots = [abbr for abbr in abbreviations_cat_id if abbr != "m_c"]
+
+        rel_constraints = []
+        for name, constraint in interaction.relationship_constraint.items():
+            abbr_from, abbr_to = name.split("_to_")
+            if abbr_from not in abbreviations_cat_id or abbr_to not in abbreviations_cat_id:
+                return None
+            if abbr_from != abbr_to:
+                rel_constraints.append((abbr_from, abbr_to, constraint))
+
+        def fulfilled(cat_from, cat_to, constraint) -> bool:
+            return GroupEvents.relationship_fulfilled(
+                cat_from, cat_to, constraint, interaction.id
+            )
 
-        # iterate over all interactions and checks for each abbreviation, which cat is possible
-        for interact in interactions:
-            dictionary = deepcopy(base_dictionary)
-
-            for abbreviation in dictionary:
-                dictionary[abbreviation] = []
-                status_ids = []
-                skill_ids = []
-                trait_ids = []
-
-                # if the abbreviation has a status constraint, check in details
-                if abbreviation in interact.status_constraint:
-                    # if the cat status is in the status constraint, add the id to the list
-                    status_ids = [
-                        cat.ID
-                        for cat in interact_cats
-                        if cat.status in interact.status_constraint[abbreviation]
+        candidates = {}
+        for abbr in slots:
+            indices = eligibility.indices(eligibility.slot(interaction, abbr))
+            for abbr_from, abbr_to, constraint in rel_constraints:
+                if abbr_from == "m_c" and abbr_to == abbr:
+                    indices = [
+                        index
+                        for index in indices
+                        if fulfilled(main_cat, cats[index], constraint)
                     ]
-                else:
-                    # if there is no constraint, add all ids to the list
-                    status_ids = [cat.ID for cat in interact_cats]
-
-                # same as status
-                if abbreviation in interact.skill_constraint:
-                    skill_ids = [
-                        cat.ID
-                        for cat in interact_cats
-                        if cat.skill in interact.skill_constraint[abbreviation]
-                    ]
-                else:
-                    skill_ids = [cat.ID for cat in interact_cats]
-
-                if abbreviation in interact.trait_constraint:
-                    trait_ids = [
-                        cat.ID
-                        for cat in interact_cats
-                        if cat.personality.trait
-                        in interact.trait_constraint[abbreviation]
+                elif abbr_from == abbr and abbr_to == "m_c":
+                    indices = [
+                        index
+                        for index in indices
+                        if fulfilled(cats[index], main_cat, constraint)
                     ]
-                else:
-                    trait_ids = [cat.ID for cat in interact_cats]
-
-                # only add the id if it is in all other lists
-                for cat_id in [cat.ID for cat in interact_cats]:
-                    if (
-                        cat_id in status_ids
-                        and cat_id in skill_ids
-                        and cat_id in trait_ids
-                    ):
-                        dictionary[abbreviation].append(cat_id)
-
-                        if (
-                            cat_id in cat_abbreviations_counter
-                            and abbreviation in cat_abbreviations_counter[cat_id]
-                        ):
-                            cat_abbreviations_counter[cat_id][abbreviation] += 1
-                        elif (
-                            cat_id in cat_abbreviations_counter
-                            and abbreviation not in cat_abbreviations_counter[cat_id]
-                        ):
-                            cat_abbreviations_counter[cat_id][abbreviation] = 1
-                        else:
-                            cat_abbreviations_counter[cat_id] = {}
-                            cat_abbreviations_counter[cat_id][abbreviation] = 1
-
-            possibilities[interact.id] = dictionary
-        return possibilities, cat_abbreviations_counter
-
-    @staticmethod
-    def remove_abbreviations_missing_cats(abbreviations_per_interaction: dict):
-        """
-        Check which combinations of abbreviations are allowed and possible and which are not, only return a dictionary,
-        with possible combinations together with the id for the interaction.
-        """
-        filtered_abbreviations = {}
-        for interaction_id, dictionary in abbreviations_per_interaction.items():
-            # check if there is any abbreviation, which is empty
-            abbr_length = [len(val) for abr, val in dictionary.items()]
-            # if one length is 0 the all function returns false
-            if not all(abbr_length):
+            if not indices:
+                return None
+            candidates[abbr] = indices
+
+        # (abbreviation, other abbreviation): constraints between them, as (from abbreviation, constraint)
+        pair_constraints = {}
+        for abbr_from, abbr_to, constraint in rel_constraints:
+            if "m_c" in (abbr_from, abbr_to):
                 continue
+            pair_constraints.setdefault((abbr_from, abbr_to), []).append(
+                (abbr_from, constraint)
+            )
+            pair_constraints.setdefault((abbr_to, abbr_from), []).append(
+                (abbr_from, constraint)
+            )
 
-            filtered_abbreviations[interaction_id] = dictionary
-        return filtered_abbreviations
-
-    @staticmethod
-    def set_abbreviations_cats(
-        interact_cats: list, abbreviations_cat_id: dict, cat_abbreviations_counter: dict
-    ):
-        """Choose which cat is which abbreviations."""
-        free_to_choose = [cat.ID for cat in interact_cats]
-        # shuffle the list to prevent choosing the same cats every time
-        shuffle(free_to_choose)
+        def fits(abbr, cat, other_abbr, other_cat) -> bool:
+            for abbr_from, constraint in pair_constraints.get((abbr, other_abbr), ()):
+                if abbr_from == abbr:
+                    if not fulfilled(cat, other_cat, constraint):
+                        return False
+                elif not fulfilled(other_cat, cat, constraint):
+                    return False
+            return True
+
+        assigned = {"m_c": main_cat}
+        budget = [GroupEvents.assign_node_budget]
+
+        def assign(domains: Dict[str, List[int]]) -> bool:
+            if not domains:
+                return True
+            abbr = min(domains, key=lambda slot: len(domains[slot]))
+            for index in domains[abbr]:
+                budget[0] -= 1
+                if budget[0] < 0:
+                    return False
+                cat = cats[index]
+                narrowed = {}
+                for other_abbr, domain in domains.items():
+                    if other_abbr == abbr:
+                        continue
+                    if (abbr, other_abbr) in pair_constraints:
+                        domain = [
+                            other
+                            for other in domain
+                            if other != index
+                            and fits(abbr, cat, other_abbr, cats[other])
+                        ]
+                    else:
+                        domain = [other for other in domain if other != index]
+                    if not domain:
+                        break
+                    narrowed[other_abbr] = domain
+                else:
+                    assigned[abbr] = cat
+                    if assign(narrowed):
+                        return True
+                    del assigned[abbr]
+            return False
 
-        for abbr_key in list(abbreviations_cat_id.keys()):
-            if abbr_key == "m_c":
-                continue
-            highest_value = 0
-            highest_id = None
-
-            # gets the cat id which fits the abbreviations most of the time
-            for cat_id in free_to_choose:
-                # first set some values if there are none
-                if cat_id not in cat_abbreviations_counter:
-                    cat_abbreviations_counter[cat_id] = {}
-                if abbr_key not in cat_abbreviations_counter[cat_id]:
-                    cat_abbreviations_counter[cat_id][abbr_key] = 0
-
-                # find the highest value
-                curr_value = cat_abbreviations_counter[cat_id][abbr_key]
-                if highest_value < curr_value:
-                    highest_value = curr_value
-                    highest_id = cat_id
-
-            abbreviations_cat_id[abbr_key] = highest_id
-            if highest_id in free_to_choose:
-                free_to_choose.remove(highest_id)
-        return abbreviations_cat_id
+        if not assign(candidates):
+            return None
+        return {abbr: assigned[abbr].ID for abbr in abbreviations_cat_id}
 
     # ---------------------------------------------------------------------------- #
     #                  helper functions for filtering interactions                 #
     # ---------------------------------------------------------------------------- #
 
+    @staticmethod
+    def relationship_fulfilled(cat_from, cat_to, rel_constraint, interaction_id) -> bool:
+        """Check the relationship constraint between two cats. A missing relationship counts as fulfilled."""
+        if cat_to.ID not in cat_from.relationships:
+            return True
+        return rel_fulfill_rel_constraints(
+            cat_from.relationships[cat_to.ID], rel_constraint, interaction_id
+        )
+
     @staticmethod
     def relationship_allow_interaction(
         interaction: GroupInteraction, abbreviations_cat_id: dict
@@ -470,80 +405,6 @@ class GroupEvents:
 
         return all(fulfilled_list)
 
-    @staticmethod
-    def cat_allow_interaction(
-        interaction: GroupInteraction, abbreviations_cat_id: dict
-    ):
-        """Check if the assigned cats fulfill the constraints of the interaction."""
-
-        all_fulfilled = True
-        for abbr, constraint in interaction.status_constraint.items():
-            # main cat is already filtered
-            if abbr == "m_c":
-                continue
-            # check if the current abbreviations cat fulfill the constraint
-            relevant_cat = Cat.all_cats[abbreviations_cat_id[abbr]]
-            if relevant_cat.status not in constraint:
-                all_fulfilled = False
-        if not all_fulfilled:
-            return False
-
-        # check if all cats fulfill the skill constraints
-        all_fulfilled = True
-        for abbr, constraint in interaction.skill_constraint.items():
-            # main cat is already filtered
-            if abbr == "m_c":
-                continue
-            # check if the current abbreviations cat fulfill the constraint
-            relevant_cat = Cat.all_cats[abbreviations_cat_id[abbr]]
-            if not relevant_cat.skills.check_skill_requirement_list(constraint):
-                all_fulfilled = False
-        if not all_fulfilled:
-            return False
-
-        # check if all cats fulfill the trait constraints
-        all_fulfilled = True
-        for abbr, constraint in interaction.trait_constraint.items():
-            # main cat is already filtered
-            if abbr == "m_c":
-                continue
-            # check if the current abbreviations cat fulfill the constraint
-            relevant_cat = Cat.all_cats[abbreviations_cat_id[abbr]]
-            if relevant_cat.personality.trait not in constraint:
-                all_fulfilled = False
-        if not all_fulfilled:
-            return False
-
-        # check if all cats fulfill the backstory constraints
-        all_fulfilled = True
-        for abbr, constraint in interaction.backstory_constraint.items():
-            # main cat is already filtered
-            if abbr == "m_c":
-                continue
-            # check if the current abbreviations cat fulfill the constraint
-            relevant_cat = Cat.all_cats[abbreviations_cat_id[abbr]]
-            if relevant_cat.backstory not in constraint:
-                all_fulfilled = False
-        if not all_fulfilled:
-            return False
-
-        # check if all cats fulfill the injuries constraints
-        all_fulfilled = True
-        for abbr, constraint in interaction.has_injuries.items():
-            # main cat is already filtered
-            if abbr == "m_c":
-                continue
-            # check if the current abbreviations cat fulfill the constraint
-            relevant_cat = Cat.all_cats[abbreviations_cat_id[abbr]]
-            injuries_in_needed = list(
-                filter(lambda inj: inj in constraint, relevant_cat.injuries.keys())
-            )
-            if len(injuries_in_needed) <= 0:
-                all_fulfilled = False
-        if not all_fulfilled:
-            return False
-        return True
-
     # ---------------------------------------------------------------------------- #
     #                      functions after interaction decision                    #
     # ---------------------------------------------------------------------------- #
@@ -727,3 +588,67 @@ class GroupEvents:
             )
 
         return process_text(text, replace_dict)
+
+
+class CatEligibility:
+    """
+    Which of the interact cats fulfill the constraints of an abbreviation, as a bitset: bit i stands for cats[i].
+    The bitsets of every status, trait, backstory and injury are built once per group event,
+    the bitset of a constraint is the union of the bitsets of its values.
+    """
+
+    def __init__(self, cats: list):
+        self.cats = cats
+        self.all = (1 << len(cats)) - 1
+        self.status = self._by_value(lambda cat: [cat.status])
+        self.trait = self._by_value(lambda cat: [cat.personality.trait])
+        self.backstory = self._by_value(lambda cat: [cat.backstory])
+        self.injuries = self._by_value(lambda cat: cat.injuries.keys())
+        self._skills = {}
+
+    def _by_value(self, values) -> Dict[str, int]:
+        bitsets = {}
+        for index, cat in enumerate(self.cats):
+            for value in values(cat):
+                bitsets[value] = bitsets.get(value, 0) | 1 << index
+        return bitsets
+
+    @staticmethod
+    def _any_of(bitsets: Dict[str, int], constraint) -> int:
+        bitset = 0
+        for value in constraint:
+            bitset |= bitsets.get(value, 0)
+        return bitset
+
+    def skills(self, constraint: list) -> int:
+        key = tuple(constraint)
+        if key not in self._skills:
+            bitset = 0
+            for index, cat in enumerate(self.cats):
+                if cat.skills.check_skill_requirement_list(constraint):
+                    bitset |= 1 << index
+            self._skills[key] = bitset
+        return self._skills[key]
+
+    def slot(self, interaction: GroupInteraction, abbr: str) -> int:
+        """The cats which fulfill the status, skill, trait, backstory and injury constraints of the abbreviation."""
+        bitset = self.all
+        if abbr in interaction.status_constraint:
+            bitset &= self._any_of(self.status, interaction.status_constraint[abbr])
+        if abbr in interaction.skill_constraint:
+            bitset &= self.skills(interaction.skill_constraint[abbr])
+        if abbr in interaction.trait_constraint:
+            bitset &= self._any_of(self.trait, interaction.trait_constraint[abbr])
+        if abbr in interaction.backstory_constraint:
+            bitset &= self._any_of(
+                self.backstory, interaction.backstory_constraint[abbr]
+            )
+        if abbr in interaction.has_injuries:
+            bitset &= self._any_of(self.injuries, interaction.has_injuries[abbr])
+        return bitset
+
+    def indices(self, bitset: int) -> List[int]:
+        """The positions of the cats in the bitset, shuffled so the same cats aren't chosen every time."""
+        indices = [index for index in range(len(self.cats)) if bitset >> index & 1]
+        shuffle(indices)
+        return indices
@@ -34,13 +34,12 @@ class Pregnancy_Events:
         """Gets the biggest family of the clan."""
         biggest_family = None
         for cat in Cat.all_cats.values():
+            # the list belongs to the inheritance of the cat, it must not be changed
             ancestors = cat.get_relatives()
             if not biggest_family:
-                biggest_family = ancestors
-                biggest_family.append(cat.ID)
+                biggest_family = ancestors + [cat.ID]
             elif len(biggest_family) < len(ancestors) + 1:
-                biggest_family = ancestors
-                biggest_family.append(cat.ID)
+                biggest_family = ancestors + [cat.ID]
         Pregnancy_Events.biggest_family = biggest_family
 
     @staticmethod
@@ -645,9 +644,10 @@ class Pregnancy_Events:
 
             # "regular" random affair
         if not int(random.random() * chance):
+            # living cats outside the Clan aren't in the mate index
             possible_affair_partners = [
                 i
-                for i in Cat.all_cats_list
+                for i in cat.mate_candidates() + list(Cat.outside_pool)
                 if i.is_potential_mate(cat, for_love_interest=True)
                 and (samesex or i.gender != cat.gender)
                 and i.ID not in cat.mate
@@ -684,7 +684,7 @@ class Pregnancy_Events:
         """
 
         highest_romantic_relation = get_highest_romantic_relation(
-            cat.relationships.values(), exclude_mate=True, potential_mate=True
+            cat.relationships, exclude_mate=True, potential_mate=True
         )
 
         if mate and highest_romantic_relation:
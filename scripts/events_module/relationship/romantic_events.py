@@ -6,7 +6,7 @@ import ujson
 
 from scripts.cat.cats import Cat
 from scripts.cat.history import History
-from scripts.cat_relations.relationship import (
+from scripts.cat_relations.interaction import (
     INTERACTION_MASTER_DICT,
     rel_fulfill_rel_constraints,
     cats_fulfill_single_interaction_constraints,
@@ -192,7 +192,7 @@ class Romantic_Events:
 
         # if the chosen_interaction is still in the TRIGGERED_SINGLE_INTERACTIONS, clean the list
         if chosen_interaction in relationship.used_interaction_ids:
-            relationship.used_interaction_ids = []
+            relationship.used_interaction_ids.clear()
         relationship.used_interaction_ids.append(chosen_interaction.id)
 
         # affect relationship - it should always be in a romantic way
@@ -307,21 +307,30 @@ class Romantic_Events:
 
         # Then, handle more random mating
         # Choose some subset of cats that they have relationships with
-        if not cat.relationships:
+        if not cat.relationships or cat not in Cat.mate_index:
             return
-        subset = [
-            Cat.fetch_cat(x)
-            for x in cat.relationships
-            if isinstance(Cat.fetch_cat(x), Cat)
-            and not (Cat.fetch_cat(x).dead or Cat.fetch_cat(x).outside)
+        # A third of the living Clan cats this cat has relationships with are picked and tried in random order.
+        # Only the ones which can be mates by age can become mates, so instead of sampling all of them,
+        # these get random positions among all of them and the ones in the first third are tried.
+        candidates = [
+            other_cat
+            for other_cat in cat.mate_candidates()
+            if other_cat.ID in cat.relationships
         ]
-        if not subset:
-            return
-
-        subset = random.sample(subset, max(int(len(subset) / 3), 1))
-
-        for other_cat in subset:
-            relationship = cat.relationships.get(other_cat.ID)
+        total = 0
+        for other_id in cat.relationships:
+            other_cat = Cat.all_cats.get(other_id)
+            if other_cat and not (other_cat.dead or other_cat.outside):
+                total += 1
+        total = max(total, len(candidates))
+        picked = max(int(total / 3), 1)
+        positions = random.sample(range(total), len(candidates))
+
+        for position, other_cat in sorted(
+            zip(positions, candidates), key=lambda x: x[0]
+        ):
+            if position >= picked:
+                break
             flag = Romantic_Events.handle_new_mates(cat, other_cat)
             if flag:
                 return
@@ -450,9 +459,8 @@ class Romantic_Events:
         """
 
         # get the highest romantic love relationships and
-        rel_list = cat_from.relationships.values()
         highest_romantic_relation = get_highest_romantic_relation(
-            rel_list, exclude_mate=True
+            cat_from.relationships, exclude_mate=True
         )
         if not highest_romantic_relation:
             return False
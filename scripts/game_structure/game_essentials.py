@@ -6,7 +6,14 @@ from shutil import move as shutil_move
 import pygame
 import ujson
 
+from scripts.cat.sprite_atlas import SPRITE_ATLAS_FILE_NAME, sprite_atlas
 from scripts.event_class import Single_Event
+from scripts.game_structure.save_storage import (
+    DirectoryStorage,
+    PackedStorage,
+    PACKED_FILE_NAME,
+    is_packed,
+)
 from scripts.game_structure.screen_settings import toggle_fullscreen
 from scripts.housekeeping.datadir import get_save_dir, get_temp_dir
 
@@ -192,6 +199,7 @@ class Game:
         self.clicked = False
         self.keyspressed = []
         self.switch_screens = False
+        self.save_storages = {}  # Clan directory: PackedStorage
 
         with open(f"resources/game_config.json", "r") as read_file:
             self.config = ujson.loads(read_file.read())
@@ -416,11 +424,10 @@ class Game:
         if not os.path.exists(directory):
             os.makedirs(directory)
 
-        # Delete all existing relationship files
-        if not os.path.exists(directory + "/relationships"):
-            os.makedirs(directory + "/relationships")
-        for f in os.listdir(directory + "/relationships"):
-            os.remove(os.path.join(directory + "/relationships", f))
+        # Relationships of cats which aren't saved or kept again (e.g. dead cats) are dropped.
+        # Histories and relationships which didn't change since the last save aren't written again.
+        storage = self.get_save_storage(clanname)
+        storage.start_cat_save()
 
         self.save_faded_cats(clanname)  # Fades cat and saves them, if needed
 
@@ -429,16 +436,26 @@ class Game:
             cat_data = inter_cat.get_save_dict()
             clan_cats.append(cat_data)
 
-            inter_cat.save_condition()
+            inter_cat.save_condition(storage)
 
             if inter_cat.history:
-                inter_cat.save_history(directory + "/history")
+                if inter_cat.history.changed:
+                    inter_cat.save_history(storage)
                 # after saving, dump the history info
                 inter_cat.history = None
             if not inter_cat.dead:
-                inter_cat.save_relationship_of_cat(directory + "/relationships")
+                if inter_cat.relationships_changed():
+                    inter_cat.save_relationship_of_cat(storage)
+                else:
+                    storage.keep_record("relationships", inter_cat.ID)
+            inter_cat.mark_saved()
 
-        self.safe_save(f"{get_save_dir()}/{clanname}/clan_cats.json", clan_cats)
+        storage.write_cats(clan_cats)
+        storage.commit()
+
+        sprite_atlas.save(
+            f"{directory}/{SPRITE_ATLAS_FILE_NAME}", self.cat_class.all_cats.keys()
+        )
 
     def save_faded_cats(self, clanname):
         """Deals with fades cats, if needed, adding them as faded"""
@@ -482,6 +499,7 @@ class Game:
             self.safe_save(
                 f"{get_save_dir()}/{clanname}/faded_cats/{cat}.json", cat_data
             )
+            self.cat_class.faded_cache.invalidate(clanname, cat)
 
             # Remove the cat from the active cats lists
             self.clan.remove_cat(cat)
@@ -518,7 +536,9 @@ class Game:
         events_list = []
         for event in game.cur_events_list:
             events_list.append(event.to_dict())
-        game.safe_save(f"{get_save_dir()}/{game.clan.name}/events.json", events_list)
+        storage = self.get_save_storage(game.clan.name)
+        storage.write_events(events_list)
+        storage.commit()
 
     def add_faded_offspring_to_faded_cat(self, parent, offspring):
         """In order to siblings to work correctly, and not to lose relation info on fading, we have to keep track of
@@ -544,6 +564,7 @@ class Game:
         self.safe_save(
             f"{get_save_dir()}/{self.clan.name}/faded_cats/{parent}.json", cat_info
         )
+        self.cat_class.faded_cache.invalidate(self.clan.name, parent)
 
         return True
 
@@ -552,18 +573,32 @@ class Game:
         Load events from events.json and place into game.cur_events_list.
         """
 
-        clanname = self.clan.name
-        events_path = f"{get_save_dir()}/{clanname}/events.json"
-        events_list = []
-        try:
-            with open(events_path, "r") as f:
-                events_list = ujson.loads(f.read())
-            for event_dict in events_list:
-                event_obj = Single_Event.from_dict(event_dict)
-                if event_obj:
-                    game.cur_events_list.append(event_obj)
-        except FileNotFoundError:
-            pass
+        events_list = self.get_save_storage(self.clan.name).read_events()
+        for event_dict in events_list or []:
+            event_obj = Single_Event.from_dict(event_dict)
+            if event_obj:
+                game.cur_events_list.append(event_obj)
+
+    def get_save_storage(self, clanname: str):
+        """Returns the storage for the cats, relationships, histories, conditions and events of the Clan.
+        Clans with a clan_data.db file use the packed format, all others the directory layout."""
+        clan_dir = f"{get_save_dir()}/{clanname}"
+        if not is_packed(clan_dir):
+            if clan_dir in self.save_storages:
+                self.save_storages.pop(clan_dir).close()
+            return DirectoryStorage(clan_dir, self.safe_save)
+
+        if clan_dir not in self.save_storages:
+            self.save_storages[clan_dir] = PackedStorage(
+                f"{clan_dir}/{PACKED_FILE_NAME}"
+            )
+        return self.save_storages[clan_dir]
+
+    def close_save_storages(self):
+        """Close the files of the packed Clans, when the game quits or switches Clans."""
+        for storage in self.save_storages.values():
+            storage.close()
+        self.save_storages.clear()
 
     def get_config_value(self, *args):
         """Fetches a value from the self.config dictionary. Pass each key as a
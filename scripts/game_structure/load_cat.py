@@ -36,9 +36,11 @@ def json_load():
     clan_cats_json_path = f"{get_save_dir()}/{clanname}/clan_cats.json"
     with open(f"resources/dicts/conversion_dict.json", "r") as read_file:
         convert = ujson.loads(read_file.read())
+    storage = game.get_save_storage(clanname)
+    if storage.name == "packed":
+        clan_cats_json_path = storage.path
     try:
-        with open(clan_cats_json_path, "r") as read_file:
-            cat_data = ujson.loads(read_file.read())
+        cat_data = storage.read_cats()
     except PermissionError as e:
         game.switches["error_message"] = f"Can\t open {clan_cats_json_path}!"
         game.switches["traceback"] = e
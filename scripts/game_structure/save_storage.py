@@ -0,0 +1,328 @@
+"""
+
+Storage backends for the per-cat parts of a save: the cat list, relationships, histories,
+conditions and the events list.
+
+DirectoryStorage is the classic layout with one JSON file per record.
+PackedStorage keeps all of these records in a single SQLite file, clan_data.db in the Clan folder.
+It only writes the records which changed since they were last written, and the whole save is
+written in one transaction, instead of one fsync for every file.
+
+A Clan uses the packed format if clan_data.db exists in its folder.
+`convert_to_packed` and `convert_to_directory` move a Clan between the two formats.
+
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Callable, Dict, Optional, Set, Tuple
+
+import ujson
+
+PACKED_FILE_NAME = "clan_data.db"
+
+# record kind: (subfolder, file name pattern) in the directory layout
+DIRECTORY_LAYOUT = {
+    "relationships": ("relationships", "{}_relations.json"),
+    "history": ("history", "{}_history.json"),
+    "conditions": ("conditions", "{}_conditions.json"),
+}
+
+
+class DirectoryStorage:
+    """The classic save layout, one JSON file per record."""
+
+    name = "directory"
+
+    def __init__(self, clan_dir: str, safe_save: Callable):
+        self.clan_dir = clan_dir
+        self.safe_save = safe_save
+        self._saved_relationships: Optional[Set[str]] = None
+
+    def _path(self, kind: str, key: str) -> str:
+        folder, pattern = DIRECTORY_LAYOUT[kind]
+        return f"{self.clan_dir}/{folder}/{pattern.format(key)}"
+
+    def _read(self, path: str):
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as read_file:
+            return ujson.loads(read_file.read())
+
+    def read_cats(self) -> list:
+        """Raises FileNotFoundError if the Clan has no cat list."""
+        with open(f"{self.clan_dir}/clan_cats.json", "r") as read_file:
+            return ujson.loads(read_file.read())
+
+    def write_cats(self, cat_data: list):
+        self.safe_save(f"{self.clan_dir}/clan_cats.json", cat_data)
+
+    def read_record(self, kind: str, key: str):
+        """Returns the record, or None if there is none."""
+        return self._read(self._path(kind, key))
+
+    def write_record(self, kind: str, key: str, data):
+        if kind == "relationships" and self._saved_relationships is not None:
+            self._saved_relationships.add(key)
+        self.safe_save(self._path(kind, key), data)
+
+    def keep_record(self, kind: str, key: str):
+        """Keep a record which didn't change during this save, instead of writing it again."""
+        if kind == "relationships" and self._saved_relationships is not None:
+            self._saved_relationships.add(key)
+
+    def delete_record(self, kind: str, key: str):
+        path = self._path(kind, key)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def has_relationships(self) -> bool:
+        """False for saves from before relationships were saved."""
+        return os.path.exists(f"{self.clan_dir}/relationships")
+
+    def read_events(self) -> Optional[list]:
+        return self._read(f"{self.clan_dir}/events.json")
+
+    def write_events(self, events: list):
+        self.safe_save(f"{self.clan_dir}/events.json", events)
+
+    def start_cat_save(self):
+        """Called before all cats are saved. Relationships of cats which aren't saved or kept are dropped on commit."""
+        os.makedirs(f"{self.clan_dir}/relationships", exist_ok=True)
+        self._saved_relationships = set()
+
+    def commit(self):
+        """Every write is done right away, only the dropped relationships are removed here."""
+        if self._saved_relationships is None:
+            return
+        folder, pattern = DIRECTORY_LAYOUT["relationships"]
+        suffix = pattern.format("")
+        relationship_dir = f"{self.clan_dir}/{folder}"
+        for file_name in os.listdir(relationship_dir):
+            if file_name[: -len(suffix)] not in self._saved_relationships:
+                os.remove(os.path.join(relationship_dir, file_name))
+        self._saved_relationships = None
+
+
+class PackedStorage:
+    """
+    All records of a Clan in a single SQLite file. Writes are buffered until `commit`.
+    The storage is used from the loading thread, the main thread and the events thread,
+    so every access holds the lock.
+    """
+
+    name = "packed"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS records "
+            "(kind TEXT NOT NULL, key TEXT NOT NULL, data TEXT NOT NULL, PRIMARY KEY (kind, key))"
+        )
+        self.connection.commit()
+
+        # (kind, key): hash of the data as it is on disk, to find out which records changed
+        self._written: Dict[Tuple[str, str], int] = {}
+        self._pending: Dict[Tuple[str, str], Optional[str]] = {}  # None means delete
+        self._saved_relationships: Optional[Set[str]] = None
+        self.records_written = 0
+        self.records_skipped = 0
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+    def _read(self, kind: str, key: str):
+        with self._lock:
+            return self._read_locked(kind, key)
+
+    def _read_locked(self, kind: str, key: str):
+        if (kind, key) in self._pending:
+            data = self._pending[(kind, key)]
+        else:
+            row = self.connection.execute(
+                "SELECT data FROM records WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+            data = row[0] if row else None
+            if data is not None:
+                self._written[(kind, key)] = hash(data)
+        return ujson.loads(data) if data is not None else None
+
+    def _write(self, kind: str, key: str, data):
+        text = ujson.dumps(data)
+        with self._lock:
+            if self._written.get((kind, key)) == hash(text):
+                self._pending.pop((kind, key), None)
+                self.records_skipped += 1
+                return
+            self._pending[(kind, key)] = text
+
+    def read_cats(self) -> list:
+        cats = self._read("cats", "")
+        if cats is None:
+            raise FileNotFoundError(f"No cats in {self.path}")
+        return cats
+
+    def write_cats(self, cat_data: list):
+        self._write("cats", "", cat_data)
+
+    def read_record(self, kind: str, key: str):
+        return self._read(kind, key)
+
+    def write_record(self, kind: str, key: str, data):
+        self.keep_record(kind, key)
+        self._write(kind, key, data)
+
+    def keep_record(self, kind: str, key: str):
+        """Keep a record which didn't change during this save, instead of writing it again."""
+        with self._lock:
+            if kind == "relationships" and self._saved_relationships is not None:
+                self._saved_relationships.add(key)
+
+    def delete_record(self, kind: str, key: str):
+        with self._lock:
+            if (kind, key) in self._written or (
+                self.connection.execute(
+                    "SELECT 1 FROM records WHERE kind = ? AND key = ?", (kind, key)
+                ).fetchone()
+            ):
+                self._pending[(kind, key)] = None
+            else:
+                self._pending.pop((kind, key), None)
+
+    def has_relationships(self) -> bool:
+        return True
+
+    def read_events(self) -> Optional[list]:
+        return self._read("events", "")
+
+    def write_events(self, events: list):
+        self._write("events", "", events)
+
+    def start_cat_save(self):
+        with self._lock:
+            self._saved_relationships = set()
+
+    def commit(self):
+        """Write all changed records in one transaction."""
+        with self._lock:
+            self._commit_locked()
+
+    def _commit_locked(self):
+        if self._saved_relationships is not None:
+            stored = self.connection.execute(
+                "SELECT key FROM records WHERE kind = 'relationships'"
+            ).fetchall()
+            for (key,) in stored:
+                if key not in self._saved_relationships:
+                    self._pending[("relationships", key)] = None
+            self._saved_relationships = None
+
+        if not self._pending:
+            return
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO records (kind, key, data) VALUES (?, ?, ?)",
+                [
+                    (kind, key, text)
+                    for (kind, key), text in self._pending.items()
+                    if text is not None
+                ],
+            )
+            self.connection.executemany(
+                "DELETE FROM records WHERE kind = ? AND key = ?",
+                [key for key, text in self._pending.items() if text is None],
+            )
+
+        for key, text in self._pending.items():
+            if text is None:
+                self._written.pop(key, None)
+            else:
+                self._written[key] = hash(text)
+                self.records_written += 1
+        self._pending.clear()
+
+
+def is_packed(clan_dir: str) -> bool:
+    return os.path.exists(f"{clan_dir}/{PACKED_FILE_NAME}")
+
+
+def convert_to_packed(clan_dir: str):
+    """Move all records of a Clan in the directory layout into clan_data.db.
+    The converted files are removed afterwards."""
+    if is_packed(clan_dir):
+        print(f"{clan_dir} is already packed.")
+        return
+
+    directory = DirectoryStorage(clan_dir, safe_save=None)
+    packed = PackedStorage(f"{clan_dir}/{PACKED_FILE_NAME}")
+    converted_files = []
+    try:
+        packed.write_cats(directory.read_cats())
+        converted_files.append(f"{clan_dir}/clan_cats.json")
+
+        for kind, (folder, pattern) in DIRECTORY_LAYOUT.items():
+            suffix = pattern.format("")
+            folder_path = f"{clan_dir}/{folder}"
+            if not os.path.isdir(folder_path):
+                continue
+            for file_name in os.listdir(folder_path):
+                if not file_name.endswith(suffix):
+                    continue
+                key = file_name[: -len(suffix)]
+                packed.write_record(kind, key, directory.read_record(kind, key))
+                converted_files.append(f"{folder_path}/{file_name}")
+
+        events = directory.read_events()
+        if events is not None:
+            packed.write_events(events)
+            converted_files.append(f"{clan_dir}/events.json")
+
+        packed.commit()
+    except Exception:
+        packed.close()
+        os.remove(f"{clan_dir}/{PACKED_FILE_NAME}")
+        raise
+    packed.close()
+
+    for path in converted_files:
+        os.remove(path)
+    for folder, _ in DIRECTORY_LAYOUT.values():
+        folder_path = f"{clan_dir}/{folder}"
+        if os.path.isdir(folder_path) and not os.listdir(folder_path):
+            os.rmdir(folder_path)
+    print(f"Packed {len(converted_files)} files into {clan_dir}/{PACKED_FILE_NAME}")
+
+
+def convert_to_directory(clan_dir: str, safe_save: Callable):
+    """Write all records of clan_data.db back into the directory layout and remove clan_data.db."""
+    if not is_packed(clan_dir):
+        print(f"{clan_dir} is not packed.")
+        return
+
+    packed_path = f"{clan_dir}/{PACKED_FILE_NAME}"
+    directory = DirectoryStorage(clan_dir, safe_save)
+    connection = sqlite3.connect(packed_path)
+    count = 0
+    try:
+        for kind, key, data in connection.execute(
+            "SELECT kind, key, data FROM records"
+        ):
+            data = ujson.loads(data)
+            if kind == "cats":
+                directory.write_cats(data)
+            elif kind == "events":
+                directory.write_events(data)
+            else:
+                directory.write_record(kind, key, data)
+            count += 1
+    finally:
+        connection.close()
+    os.makedirs(f"{clan_dir}/relationships", exist_ok=True)
+
+    os.remove(packed_path)
+    print(f"Unpacked {count} records from {packed_path}")
@@ -13,11 +13,13 @@ from pygame_gui.core.text.text_box_layout import TextBoxLayout
 from pygame_gui.core.utility import translate
 from pygame_gui.elements import UIAutoResizingContainer
 
+from scripts.cat.sprite_cache import sprite_cache
 from scripts.game_structure import image_cache
 from scripts.game_structure.game_essentials import game
 from scripts.utility import (
     ui_scale,
     shorten_text_to_fit,
+    sprite_button_smoothscale,
     ui_scale_dimensions,
     ui_scale_value,
 )
@@ -627,18 +629,12 @@ class UISpriteButton:
         tool_tip_text=None,
         anchors=None,
     ):
-        input_sprite = sprite.premul_alpha()
         # if it's going to be small on the screen, smoothscale out the crunch
-        input_sprite = (
-            pygame.transform.smoothscale(input_sprite, relative_rect.size)
-            if (
-                (
-                    relative_rect.height <= ui_scale_value(sprite.get_height())
-                    or relative_rect.width <= ui_scale_value(sprite.get_height())
-                )
-                and not game.settings["no sprite antialiasing"]
-            )
-            else pygame.transform.scale(input_sprite, relative_rect.size)
+        # cached cat sprites keep their scaled versions, see prerender_sprites
+        input_sprite = sprite_cache.scaled(
+            sprite,
+            tuple(relative_rect.size),
+            sprite_button_smoothscale(sprite, relative_rect.size),
         )
 
         self.image = pygame_gui.elements.UIImage(
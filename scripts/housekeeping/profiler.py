@@ -0,0 +1,340 @@
+"""
+
+Opt-in instrumentation of the moon skip.
+
+The PhaseProfiler replaces functions of the moon skip with versions which record their wall time and
+call counts, in total and per cat. Timings are inclusive, so a phase which calls another one
+(one_moon_cat calls cat.thoughts) contains its time as well.
+
+While it is enabled, a JSON and a CSV report are written to the log folder after every moon
+(profile_<time>.json / profile_<time>.csv), and `profile` in the debug console shows the slowest phases.
+Nothing is wrapped while it is disabled, so it costs nothing then.
+
+The CodeProfiler runs cProfile around the next frames or the next moon skip, for the `cprofile` command
+of the debug console, and writes the result to the log folder as well (cprofile_<time>.prof / .txt).
+
+"""
+
+import cProfile
+import csv
+import inspect
+import io
+import os
+import pstats
+import threading
+import time
+from collections import defaultdict
+from typing import List, Optional, Tuple
+
+import ujson
+
+from scripts.housekeeping.datadir import get_log_dir
+
+
+def moon_skip_phases() -> List[Tuple[object, str, str, Optional[str]]]:
+    """
+    The functions timed by PhaseProfiler.enable.
+    :return: (owner, attribute, phase, name of the cat parameter or None)
+    """
+    # imported here, the events import most of the game
+    from scripts.cat.cats import Cat
+    from scripts.clan import Clan
+    from scripts.clan_resources.freshkill import FreshkillPile
+    from scripts.events import events_class
+    from scripts.events_module.condition_events import Condition_Events
+    from scripts.events_module.handle_short_events import handle_short_events
+    from scripts.events_module.relation_events import Relation_Events
+    from scripts.events_module.relationship.pregnancy_events import Pregnancy_Events
+    from scripts.game_structure.game_essentials import game
+
+    phases = [
+        (events_class, "one_moon", "one_moon", None),
+        (events_class, "one_moon_cat", "one_moon_cat", "cat"),
+        (events_class, "one_moon_outside_cat", "one_moon_outside_cat", "cat"),
+        (events_class, "get_moon_freshkill", "get_moon_freshkill", None),
+        (events_class, "handle_grief", "handle_grief", None),
+        (FreshkillPile, "time_skip", "freshkill_pile.time_skip", None),
+        (Cat, "thoughts", "cat.thoughts", "self"),
+        (Relation_Events, "handle_relationships", "Relation_Events.handle_relationships", "cat"),
+        (handle_short_events, "handle_event", "handle_short_events.handle_event", "main_cat"),
+        (Pregnancy_Events, "handle_having_kits", "Pregnancy_Events.handle_having_kits", "cat"),
+        (type(game), "save_cats", "saves", None),
+        (type(game), "save_events", "saves", None),
+        (Clan, "save_clan", "saves", None),
+        (Clan, "save_pregnancy", "saves", None),
+    ]
+    for attr, raw in vars(Condition_Events).items():
+        if attr.startswith("handle_") and isinstance(raw, staticmethod):
+            phases.append(
+                (Condition_Events, attr, f"Condition_Events.{attr}", "cat")
+            )
+    return phases
+
+
+class PhaseProfiler:
+    """Accumulates wall time and call counts for functions wrapped with `wrap`, in total and per cat."""
+
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+        self._wrapped = []
+        self.report_name: Optional[str] = None
+        self.write_reports = False
+
+    def reset(self):
+        self.totals = defaultdict(float)
+        self.calls = defaultdict(int)
+        # phase: cat ID: seconds / calls
+        self.cat_totals = defaultdict(lambda: defaultdict(float))
+        self.cat_calls = defaultdict(lambda: defaultdict(int))
+        self.moons = 0
+
+    def wrap(self, owner, attr: str, phase: str, cat_param: str = None):
+        """Replace owner.attr with a version that adds its run time to `phase`.
+        Works for functions, methods and staticmethods, on classes and instances.
+        If cat_param is given, the time is also added to the cat passed as that parameter."""
+        raw = inspect.getattr_static(owner, attr)
+        original = getattr(owner, attr)
+
+        cat_index = None
+        if cat_param is not None:
+            cat_index = list(inspect.signature(original).parameters).index(cat_param)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.totals[phase] += elapsed
+                self.calls[phase] += 1
+                if cat_index is not None:
+                    cat = (
+                        args[cat_index]
+                        if len(args) > cat_index
+                        else kwargs.get(cat_param)
+                    )
+                    cat_id = getattr(cat, "ID", None)
+                    if cat_id is not None:
+                        self.cat_totals[phase][cat_id] += elapsed
+                        self.cat_calls[phase][cat_id] += 1
+                if phase == "one_moon":
+                    self.moons += 1
+                    if self.write_reports:
+                        self.write_report()
+
+        self._wrapped.append((owner, attr, raw, attr in vars(owner)))
+        setattr(
+            owner, attr, staticmethod(timed) if isinstance(raw, staticmethod) else timed
+        )
+
+    def unwrap_all(self):
+        """Restore every function replaced by `wrap`."""
+        for owner, attr, raw, was_own in reversed(self._wrapped):
+            if was_own:
+                setattr(owner, attr, raw)
+            else:
+                delattr(owner, attr)
+        self._wrapped.clear()
+
+    def enable(self, write_reports=True):
+        """Start timing the phases of the moon skip, see moon_skip_phases."""
+        if self.enabled:
+            return
+        for owner, attr, phase, cat_param in moon_skip_phases():
+            self.wrap(owner, attr, phase, cat_param)
+        self.enabled = True
+        self.write_reports = write_reports
+        self.report_name = f"profile_{time.strftime('%Y%m%d_%H%M%S')}"
+
+    def disable(self):
+        """Stop timing. The recorded times are kept until `reset`."""
+        self.unwrap_all()
+        self.enabled = False
+
+    def slowest_phases(self) -> List[Tuple[str, int, float]]:
+        """(phase, calls, seconds), slowest first"""
+        return [
+            (phase, self.calls[phase], total)
+            for phase, total in sorted(self.totals.items(), key=lambda x: -x[1])
+        ]
+
+    def slowest_cats(self, phase: str, amount: int = 5) -> List[Tuple[str, int, float]]:
+        """(cat ID, calls, seconds) of the cats which took longest in the phase"""
+        cats = sorted(self.cat_totals[phase].items(), key=lambda x: -x[1])[:amount]
+        return [(cat_id, self.cat_calls[phase][cat_id], total) for cat_id, total in cats]
+
+    def report(self, moons: int = None) -> str:
+        moons = moons if moons is not None else self.moons
+        lines = [f"{'phase':<44}{'calls':>10}{'total s':>12}{'ms/moon':>12}"]
+        for phase, calls, total in self.slowest_phases():
+            lines.append(
+                f"{phase:<44}{calls:>10}{total:>12.3f}{total * 1000 / max(moons, 1):>12.2f}"
+            )
+        return "\n".join(lines)
+
+    def write_report(self, directory: str = None) -> Tuple[str, str]:
+        """
+        Write the recorded times as JSON and CSV.
+        The CSV has one row per phase with an empty cat ID, followed by a row per cat.
+        :return: the paths of the JSON and the CSV file
+        """
+        directory = directory or get_log_dir()
+        name = self.report_name or f"profile_{time.strftime('%Y%m%d_%H%M%S')}"
+        json_path = os.path.join(directory, f"{name}.json")
+        csv_path = os.path.join(directory, f"{name}.csv")
+
+        report = {
+            "moons": self.moons,
+            "phases": {
+                phase: {
+                    "calls": calls,
+                    "seconds": total,
+                    "ms_per_moon": total * 1000 / max(self.moons, 1),
+                    "cats": {
+                        cat_id: {
+                            "calls": self.cat_calls[phase][cat_id],
+                            "seconds": cat_total,
+                        }
+                        for cat_id, cat_total in self.cat_totals[phase].items()
+                    },
+                }
+                for phase, calls, total in self.slowest_phases()
+            },
+        }
+        with open(json_path, "w", encoding="utf-8") as write_file:
+            write_file.write(ujson.dumps(report, indent=4))
+
+        with open(csv_path, "w", encoding="utf-8", newline="") as write_file:
+            writer = csv.writer(write_file)
+            writer.writerow(["phase", "cat_id", "calls", "seconds"])
+            for phase, calls, total in self.slowest_phases():
+                writer.writerow([phase, "", calls, f"{total:.6f}"])
+                for cat_id, cat_total in sorted(
+                    self.cat_totals[phase].items(), key=lambda x: -x[1]
+                ):
+                    writer.writerow(
+                        [phase, cat_id, self.cat_calls[phase][cat_id], f"{cat_total:.6f}"]
+                    )
+        return json_path, csv_path
+
+
+profiler = PhaseProfiler()
+
+
+class CodeProfiler:
+    """A cProfile session around the next frames on the main thread, or around the next moon skip."""
+
+    def __init__(self):
+        self._profile: Optional[cProfile.Profile] = None
+        self.frames_left = 0
+        self.moon = False
+        self.last_report = ""
+        self._finished: Optional[str] = None
+        self._replaced = None
+        self._moon_wrapper = None  # the one_moon which profiles the next moon skip
+        self._lock = threading.Lock()
+        # where the results are written, the log folder if None
+        self.directory: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._profile is not None or self.moon
+
+    def start_frames(self, frames: int):
+        """Profile the main thread for the next frames. `frame` stops the session."""
+        self.stop()
+        self.frames_left = frames
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def start_moon(self):
+        """Profile the next call of Events.one_moon, on whichever thread runs it."""
+        from scripts.events import events_class
+
+        self.stop()
+        self.moon = True
+        original = events_class.one_moon
+        # e.g. the wrapper of the PhaseProfiler
+        self._replaced = vars(events_class).get("one_moon")
+
+        def profiled_one_moon(*args, **kwargs):
+            if self._moon_wrapper is not profiled_one_moon:
+                # the session was stopped or already profiled a moon skip, but something (e.g. the PhaseProfiler)
+                # wrapped this function afterwards, so it couldn't be taken out
+                return original(*args, **kwargs)
+            # only this moon skip is profiled
+            self._restore_one_moon()
+            profile = cProfile.Profile()
+            try:
+                return profile.runcall(original, *args, **kwargs)
+            finally:
+                self.moon = False
+                report = self.make_report(profile)
+                with self._lock:
+                    self._finished = report
+
+        self._moon_wrapper = profiled_one_moon
+        events_class.one_moon = profiled_one_moon
+
+    def _restore_one_moon(self):
+        """Take out the wrapper of start_moon, unless something else wrapped it since."""
+        from scripts.events import events_class
+
+        if vars(events_class).get("one_moon") is self._moon_wrapper:
+            if self._replaced is not None:
+                events_class.one_moon = self._replaced
+            else:
+                del events_class.one_moon
+        self._moon_wrapper = None
+        self._replaced = None
+
+    def stop(self) -> Optional[str]:
+        """End the running session. Returns its report, if there was one."""
+        if self.moon:
+            self._restore_one_moon()
+            self.moon = False
+        if self._profile is None:
+            return None
+        self._profile.disable()
+        profile, self._profile = self._profile, None
+        self.frames_left = 0
+        return self.make_report(profile)
+
+    def frame(self) -> Optional[str]:
+        """Called once per frame on the main thread. Returns the report of a session which finished."""
+        if self._profile is not None:
+            self.frames_left -= 1
+            if self.frames_left <= 0:
+                return self.stop()
+        if self._finished is not None:
+            with self._lock:
+                report, self._finished = self._finished, None
+            return report
+        return None
+
+    def make_report(self, profile: cProfile.Profile, amount: int = 20) -> str:
+        """The functions with the most cumulative time. The full stats are written to the log folder."""
+        directory = self.directory or get_log_dir()
+        name = f"cprofile_{time.strftime('%Y%m%d_%H%M%S')}"
+        stats = pstats.Stats(profile)
+        try:
+            stats.dump_stats(os.path.join(directory, f"{name}.prof"))
+        except OSError as e:
+            print(f"WARNING: couldn't write the profile: {e}")
+
+        text = io.StringIO()
+        stats.stream = text
+        stats.strip_dirs().sort_stats("cumulative").print_stats(amount)
+        self.last_report = text.getvalue().strip()
+        try:
+            with open(
+                os.path.join(directory, f"{name}.txt"), "w", encoding="utf-8"
+            ) as write_file:
+                write_file.write(self.last_report)
+        except OSError as e:
+            print(f"WARNING: couldn't write the profile: {e}")
+        return self.last_report
+
+
+code_profiler = CodeProfiler()
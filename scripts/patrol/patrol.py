@@ -5,7 +5,7 @@ from copy import deepcopy
 from itertools import repeat
 from os.path import exists as path_exists
 from random import choice, randint, choices
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 import pygame
 import ujson
@@ -13,6 +13,7 @@ import ujson
 from scripts.cat.cats import Cat
 from scripts.clan import Clan
 from scripts.game_structure.game_essentials import game
+from scripts.patrol.patrol_catalog import PatrolCatalog, patrol_catalog
 from scripts.patrol.patrol_event import PatrolEvent
 from scripts.patrol.patrol_outcome import PatrolOutcome
 from scripts.special_dates import get_special_date, contains_special_date_tag
@@ -241,33 +242,19 @@ class Patrol:
         season = current_season.lower()
         leaf = f"{season}"
         biome_dir = f"{biome}/"
-        self.update_resources(biome_dir, leaf)
 
         possible_patrols = []
         # This is for debugging purposes, load-in *ALL* the possible patrols when debug_override_patrol_stat_requirements is true. (May require longer loading time)
         if (game.config["patrol_generation"]["debug_override_patrol_stat_requirements"]):
             leaves = ["greenleaf", "leaf-bare", "leaf-fall", "newleaf", "any"]
-            for biome in game.clan.BIOME_TYPES:
-                for leaf in leaves:
-                    biome_dir = f"{biome.lower()}/"
-                    self.update_resources(biome_dir, leaf)
-                    possible_patrols.extend(self.generate_patrol_events(self.HUNTING))
-                    possible_patrols.extend(self.generate_patrol_events(self.HUNTING_SZN))
-                    possible_patrols.extend(self.generate_patrol_events(self.BORDER))
-                    possible_patrols.extend(self.generate_patrol_events(self.BORDER_SZN))
-                    possible_patrols.extend(self.generate_patrol_events(self.TRAINING))
-                    possible_patrols.extend(self.generate_patrol_events(self.TRAINING_SZN))
-                    possible_patrols.extend(self.generate_patrol_events(self.MEDCAT))
-                    possible_patrols.extend(self.generate_patrol_events(self.MEDCAT_SZN))
-                    possible_patrols.extend(self.generate_patrol_events(self.HUNTING_GEN))
-                    possible_patrols.extend(self.generate_patrol_events(self.BORDER_GEN))
-                    possible_patrols.extend(self.generate_patrol_events(self.TRAINING_GEN))
-                    possible_patrols.extend(self.generate_patrol_events(self.MEDCAT_GEN))
-                    possible_patrols.extend(self.generate_patrol_events(self.DISASTER))
-                    possible_patrols.extend(self.generate_patrol_events(self.NEW_CAT_WELCOMING))
-                    possible_patrols.extend(self.generate_patrol_events(self.NEW_CAT_HOSTILE))
-                    possible_patrols.extend(self.generate_patrol_events(self.OTHER_CLAN_ALLIES))
-                    possible_patrols.extend(self.generate_patrol_events(self.OTHER_CLAN_HOSTILE))
+            for _biome in game.clan.BIOME_TYPES:
+                for _leaf in leaves:
+                    _files = self.get_patrol_files(f"{_biome.lower()}/", _leaf)
+                    for key in ("HUNTING", "HUNTING_SZN", "BORDER", "BORDER_SZN", "TRAINING", "TRAINING_SZN",
+                                "MEDCAT", "MEDCAT_SZN", "HUNTING_GEN", "BORDER_GEN", "TRAINING_GEN", "MEDCAT_GEN",
+                                "DISASTER", "NEW_CAT_WELCOMING", "NEW_CAT_HOSTILE", "OTHER_CLAN_ALLIES",
+                                "OTHER_CLAN_HOSTILE"):
+                        possible_patrols.extend(patrol_catalog.get_patrols(_files[key]))
 
         # this next one is needed for Classic specifically
         patrol_type = (
@@ -275,7 +262,25 @@ class Patrol:
             if ["medicine cat", "medicine cat apprentice"] in self.patrol_status_list
             else patrol_type
         )
+        # This make sure general only gets hunting, border, or training patrols
+        # chose fix type will make it not depending on the content amount
+        if patrol_type == "general":
+            patrol_type = random.choice(["hunting", "border", "training"])
         patrol_size = len(self.patrol_cats)
+
+        patrol_files = self.get_patrol_files(biome_dir, leaf)
+
+        def get_patrols(key):
+            """Only the patrols of the file which fit biome, season, camp, type and patrol size"""
+            return patrol_catalog.get_patrols(
+                patrol_files[key],
+                biome=biome,
+                season=season,
+                camp=camp,
+                patrol_type=patrol_type,
+                patrol_size=patrol_size,
+            )
+
         reputation = game.clan.reputation  # reputation with outsiders
         other_clan = self.other_clan
         clan_relations = int(other_clan.relations) if other_clan else 0
@@ -321,48 +326,48 @@ class Patrol:
             welcoming_rep = True
             chance = welcoming_chance
 
-        possible_patrols.extend(self.generate_patrol_events(self.HUNTING))
-        possible_patrols.extend(self.generate_patrol_events(self.HUNTING_SZN))
-        possible_patrols.extend(self.generate_patrol_events(self.BORDER))
-        possible_patrols.extend(self.generate_patrol_events(self.BORDER_SZN))
-        possible_patrols.extend(self.generate_patrol_events(self.TRAINING))
-        possible_patrols.extend(self.generate_patrol_events(self.TRAINING_SZN))
-        possible_patrols.extend(self.generate_patrol_events(self.MEDCAT))
-        possible_patrols.extend(self.generate_patrol_events(self.MEDCAT_SZN))
-        possible_patrols.extend(self.generate_patrol_events(self.HUNTING_GEN))
-        possible_patrols.extend(self.generate_patrol_events(self.BORDER_GEN))
-        possible_patrols.extend(self.generate_patrol_events(self.TRAINING_GEN))
-        possible_patrols.extend(self.generate_patrol_events(self.MEDCAT_GEN))
+        possible_patrols.extend(get_patrols("HUNTING"))
+        possible_patrols.extend(get_patrols("HUNTING_SZN"))
+        possible_patrols.extend(get_patrols("BORDER"))
+        possible_patrols.extend(get_patrols("BORDER_SZN"))
+        possible_patrols.extend(get_patrols("TRAINING"))
+        possible_patrols.extend(get_patrols("TRAINING_SZN"))
+        possible_patrols.extend(get_patrols("MEDCAT"))
+        possible_patrols.extend(get_patrols("MEDCAT_SZN"))
+        possible_patrols.extend(get_patrols("HUNTING_GEN"))
+        possible_patrols.extend(get_patrols("BORDER_GEN"))
+        possible_patrols.extend(get_patrols("TRAINING_GEN"))
+        possible_patrols.extend(get_patrols("MEDCAT_GEN"))
 
         if game_setting_disaster:
             dis_chance = int(random.getrandbits(3))  # disaster patrol chance
             if dis_chance == 1:
-                possible_patrols.extend(self.generate_patrol_events(self.DISASTER))
+                possible_patrols.extend(get_patrols("DISASTER"))
 
         # new cat patrols
         if chance == 1:
             if welcoming_rep:
                 possible_patrols.extend(
-                    self.generate_patrol_events(self.NEW_CAT_WELCOMING)
+                    get_patrols("NEW_CAT_WELCOMING")
                 )
             elif neutral_rep:
-                possible_patrols.extend(self.generate_patrol_events(self.NEW_CAT))
+                possible_patrols.extend(get_patrols("NEW_CAT"))
             elif hostile_rep:
                 possible_patrols.extend(
-                    self.generate_patrol_events(self.NEW_CAT_HOSTILE)
+                    get_patrols("NEW_CAT_HOSTILE")
                 )
 
         # other Clan patrols
         if other_clan_chance == 1:
             if clan_neutral:
-                possible_patrols.extend(self.generate_patrol_events(self.OTHER_CLAN))
+                possible_patrols.extend(get_patrols("OTHER_CLAN"))
             elif clan_allies:
                 possible_patrols.extend(
-                    self.generate_patrol_events(self.OTHER_CLAN_ALLIES)
+                    get_patrols("OTHER_CLAN_ALLIES")
                 )
             elif clan_hostile:
                 possible_patrols.extend(
-                    self.generate_patrol_events(self.OTHER_CLAN_HOSTILE)
+                    get_patrols("OTHER_CLAN_HOSTILE")
                 )
 
         final_patrols, final_romance_patrols = self.get_filtered_patrols(
@@ -500,10 +505,6 @@ class Patrol:
         filtered_patrols = []
         romantic_patrols = []
         special_date = get_special_date()
-        # This make sure general only gets hunting, border, or training patrols
-        # chose fix type will make it not depending on the content amount
-        if patrol_type == "general":
-            patrol_type = random.choice(["hunting", "border", "training"])
 
         # makes sure that it grabs patrols in the correct biomes, season, with the correct number of cats
         for patrol in possible_patrols:
@@ -591,44 +592,7 @@ class Patrol:
         return filtered_patrols, romantic_patrols
 
     def generate_patrol_events(self, patrol_dict):
-        all_patrol_events = []
-        for patrol in patrol_dict:
-            patrol_event = PatrolEvent(
-                patrol_id=patrol.get("patrol_id"),
-                biome=patrol.get("biome"),
-                camp=patrol.get("camp"),
-                season=patrol.get("season"),
-                tags=patrol.get("tags"),
-                weight=patrol.get("weight", 20),
-                types=patrol.get("types"),
-                intro_text=patrol.get("intro_text"),
-                patrol_art=patrol.get("patrol_art"),
-                patrol_art_clean=patrol.get("patrol_art_clean"),
-                success_outcomes=PatrolOutcome.generate_from_info(
-                    patrol.get("success_outcomes")
-                ),
-                fail_outcomes=PatrolOutcome.generate_from_info(
-                    patrol.get("fail_outcomes"), success=False
-                ),
-                decline_text=patrol.get("decline_text"),
-                chance_of_success=patrol.get("chance_of_success"),
-                min_cats=patrol.get("min_cats", 1),
-                max_cats=patrol.get("max_cats", 6),
-                min_max_status=patrol.get("min_max_status"),
-                antag_success_outcomes=PatrolOutcome.generate_from_info(
-                    patrol.get("antag_success_outcomes"), antagonize=True
-                ),
-                antag_fail_outcomes=PatrolOutcome.generate_from_info(
-                    patrol.get("antag_fail_outcomes"), success=False, antagonize=True
-                ),
-                relationship_constraints=patrol.get("relationship_constraint"),
-                pl_skill_constraints=patrol.get("pl_skill_constraint"),
-                pl_trait_constraints=patrol.get("pl_trait_constraints"),
-            )
-
-            all_patrol_events.append(patrol_event)
-
-        return all_patrol_events
+        return PatrolCatalog.generate_patrol_events(patrol_dict)
 
     def determine_outcome(self, antagonize=False) -> Tuple[str, str, Optional[str]]:
         if self.patrol_event is None:
@@ -734,104 +698,38 @@ class Patrol:
 
         return (success_outcome if success else fail_outcome, success)
 
-    def update_resources(self, biome_dir, leaf):
+    @staticmethod
+    def get_patrol_files(biome_dir, leaf) -> Dict[str, str]:
+        """Returns the paths of all patrol files that can be used in this biome and season."""
         resource_dir = "resources/dicts/patrols/"
-        # HUNTING #
-        self.HUNTING_SZN = None
-        with open(
-            f"{resource_dir}{biome_dir}hunting/{leaf}.json", "r", encoding="ascii"
-        ) as read_file:
-            self.HUNTING_SZN = ujson.loads(read_file.read())
-        self.HUNTING = None
-        with open(
-            f"{resource_dir}{biome_dir}hunting/any.json", "r", encoding="ascii"
-        ) as read_file:
-            self.HUNTING = ujson.loads(read_file.read())
-        # BORDER #
-        self.BORDER_SZN = None
-        with open(
-            f"{resource_dir}{biome_dir}border/{leaf}.json", "r", encoding="ascii"
-        ) as read_file:
-            self.BORDER_SZN = ujson.loads(read_file.read())
-        self.BORDER = None
-        with open(
-            f"{resource_dir}{biome_dir}border/any.json", "r", encoding="ascii"
-        ) as read_file:
-            self.BORDER = ujson.loads(read_file.read())
-        # TRAINING #
-        self.TRAINING_SZN = None
-        with open(
-            f"{resource_dir}{biome_dir}training/{leaf}.json", "r", encoding="ascii"
-        ) as read_file:
-            self.TRAINING_SZN = ujson.loads(read_file.read())
-        self.TRAINING = None
-        with open(
-            f"{resource_dir}{biome_dir}training/any.json", "r", encoding="ascii"
-        ) as read_file:
-            self.TRAINING = ujson.loads(read_file.read())
-        # MED #
-        self.MEDCAT_SZN = None
-        with open(
-            f"{resource_dir}{biome_dir}med/{leaf}.json", "r", encoding="ascii"
-        ) as read_file:
-            self.MEDCAT_SZN = ujson.loads(read_file.read())
-        self.MEDCAT = None
-        with open(
-            f"{resource_dir}{biome_dir}med/any.json", "r", encoding="ascii"
-        ) as read_file:
-            self.MEDCAT = ujson.loads(read_file.read())
-        # NEW CAT #
-        self.NEW_CAT = None
-        with open(f"{resource_dir}new_cat.json", "r", encoding="ascii") as read_file:
-            self.NEW_CAT = ujson.loads(read_file.read())
-        self.NEW_CAT_HOSTILE = None
-        with open(
-            f"{resource_dir}new_cat_hostile.json", "r", encoding="ascii"
-        ) as read_file:
-            self.NEW_CAT_HOSTILE = ujson.loads(read_file.read())
-        self.NEW_CAT_WELCOMING = None
-        with open(
-            f"{resource_dir}new_cat_welcoming.json", "r", encoding="ascii"
-        ) as read_file:
-            self.NEW_CAT_WELCOMING = ujson.loads(read_file.read())
-        # OTHER CLAN #
-        self.OTHER_CLAN = None
-        with open(f"{resource_dir}other_clan.json", "r", encoding="ascii") as read_file:
-            self.OTHER_CLAN = ujson.loads(read_file.read())
-        self.OTHER_CLAN_ALLIES = None
-        with open(
-            f"{resource_dir}other_clan_allies.json", "r", encoding="ascii"
-        ) as read_file:
-            self.OTHER_CLAN_ALLIES = ujson.loads(read_file.read())
-        self.OTHER_CLAN_HOSTILE = None
-        with open(
-            f"{resource_dir}other_clan_hostile.json", "r", encoding="ascii"
-        ) as read_file:
-            self.OTHER_CLAN_HOSTILE = ujson.loads(read_file.read())
-        self.DISASTER = None
-        with open(f"{resource_dir}disaster.json", "r", encoding="ascii") as read_file:
-            self.DISASTER = ujson.loads(read_file.read())
-        # sighing heavily as I add general patrols back in
-        self.HUNTING_GEN = None
-        with open(
-            f"{resource_dir}general/hunting.json", "r", encoding="ascii"
-        ) as read_file:
-            self.HUNTING_GEN = ujson.loads(read_file.read())
-        self.BORDER_GEN = None
-        with open(
-            f"{resource_dir}general/border.json", "r", encoding="ascii"
-        ) as read_file:
-            self.BORDER_GEN = ujson.loads(read_file.read())
-        self.TRAINING_GEN = None
-        with open(
-            f"{resource_dir}general/training.json", "r", encoding="ascii"
-        ) as read_file:
-            self.TRAINING_GEN = ujson.loads(read_file.read())
-        self.MEDCAT_GEN = None
-        with open(
-            f"{resource_dir}general/medcat.json", "r", encoding="ascii"
-        ) as read_file:
-            self.MEDCAT_GEN = ujson.loads(read_file.read())
+        return {
+            # HUNTING #
+            "HUNTING_SZN": f"{resource_dir}{biome_dir}hunting/{leaf}.json",
+            "HUNTING": f"{resource_dir}{biome_dir}hunting/any.json",
+            # BORDER #
+            "BORDER_SZN": f"{resource_dir}{biome_dir}border/{leaf}.json",
+            "BORDER": f"{resource_dir}{biome_dir}border/any.json",
+            # TRAINING #
+            "TRAINING_SZN": f"{resource_dir}{biome_dir}training/{leaf}.json",
+            "TRAINING": f"{resource_dir}{biome_dir}training/any.json",
+            # MED #
+            "MEDCAT_SZN": f"{resource_dir}{biome_dir}med/{leaf}.json",
+            "MEDCAT": f"{resource_dir}{biome_dir}med/any.json",
+            # NEW CAT #
+            "NEW_CAT": f"{resource_dir}new_cat.json",
+            "NEW_CAT_HOSTILE": f"{resource_dir}new_cat_hostile.json",
+            "NEW_CAT_WELCOMING": f"{resource_dir}new_cat_welcoming.json",
+            # OTHER CLAN #
+            "OTHER_CLAN": f"{resource_dir}other_clan.json",
+            "OTHER_CLAN_ALLIES": f"{resource_dir}other_clan_allies.json",
+            "OTHER_CLAN_HOSTILE": f"{resource_dir}other_clan_hostile.json",
+            "DISASTER": f"{resource_dir}disaster.json",
+            # sighing heavily as I add general patrols back in
+            "HUNTING_GEN": f"{resource_dir}general/hunting.json",
+            "BORDER_GEN": f"{resource_dir}general/border.json",
+            "TRAINING_GEN": f"{resource_dir}general/training.json",
+            "MEDCAT_GEN": f"{resource_dir}general/medcat.json",
+        }
 
     def balance_hunting(self, possible_patrols: list):
         """Filter the incoming hunting patrol list to balance the different kinds of hunting patrols.
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: ascii -*-
+import os
+from typing import Dict, List, Optional, Set
+
+import ujson
+
+from scripts.patrol.patrol_event import PatrolEvent
+from scripts.patrol.patrol_outcome import PatrolOutcome
+
+resource_directory = "resources/dicts/patrols/"
+
+# patrol type chosen on the patrol screen -> tag the patrol needs in its "types"
+TYPE_TAGS = {
+    "hunting": "hunting",
+    "border": "border",
+    "training": "training",
+    "med": "herb_gathering",
+}
+
+
+class PatrolFileIndex:
+    """All PatrolEvents from one patrol file, bucketed by the cheap filters used in Patrol._filter_patrols.
+    Each bucket holds positions in self.events, so lookups can be intersected and then returned in file order.
+    """
+
+    def __init__(self, events: List[PatrolEvent], mtime: int):
+        self.events = events
+        self.mtime = mtime
+
+        self.biome: Dict[str, Set[int]] = {}
+        self.season: Dict[str, Set[int]] = {}
+        self.camp: Dict[str, Set[int]] = {}
+        self.types: Dict[str, Set[int]] = {}
+        self.cat_count: Dict[int, Set[int]] = {}
+
+        for i, patrol in enumerate(events):
+            for value in patrol.biome:
+                self.biome.setdefault(value, set()).add(i)
+            for value in patrol.season:
+                self.season.setdefault(value, set()).add(i)
+            for value in patrol.camp:
+                self.camp.setdefault(value, set()).add(i)
+            for value in patrol.types:
+                self.types.setdefault(value, set()).add(i)
+            for count in range(patrol.min_cats, patrol.max_cats + 1):
+                self.cat_count.setdefault(count, set()).add(i)
+
+        # value -> matching positions, including the "any" bucket
+        self._with_any = {}
+
+    def _matching(self, bucket_name: str, value: str) -> Set[int]:
+        key = (bucket_name, value)
+        if key not in self._with_any:
+            bucket = getattr(self, bucket_name)
+            self._with_any[key] = bucket.get(value, set()) | bucket.get("any", set())
+        return self._with_any[key]
+
+    def query(
+        self,
+        biome: str = None,
+        season: str = None,
+        camp: str = None,
+        patrol_type: str = None,
+        patrol_size: int = None,
+    ) -> List[PatrolEvent]:
+        """Returns the patrols which fit all given values, in file order. Values left as None are not filtered."""
+        found = None
+        for bucket_name, value in (
+            ("biome", biome),
+            ("season", season),
+            ("camp", camp),
+        ):
+            if value is None:
+                continue
+            matching = self._matching(bucket_name, value)
+            found = matching if found is None else found & matching
+
+        if patrol_type in TYPE_TAGS:
+            matching = self.types.get(TYPE_TAGS[patrol_type], set())
+            found = matching if found is None else found & matching
+
+        if patrol_size is not None:
+            matching = self.cat_count.get(patrol_size, set())
+            found = matching if found is None else found & matching
+
+        if found is None:
+            return list(self.events)
+        return [self.events[i] for i in sorted(found)]
+
+
+class PatrolCatalog:
+    """
+    Holds the PatrolEvents of every patrol file that has been used this session.
+    A file is only parsed again if it changed on disk since it was loaded.
+    """
+
+    def __init__(self):
+        self._files: Dict[str, PatrolFileIndex] = {}
+        self.loads = 0
+        self.hits = 0
+
+    def get_patrols(
+        self,
+        file_path: str,
+        biome: str = None,
+        season: str = None,
+        camp: str = None,
+        patrol_type: str = None,
+        patrol_size: int = None,
+    ) -> List[PatrolEvent]:
+        """Returns the patrols of the file which could be possible for the given values.
+        The returned PatrolEvents are shared, they must not be changed.
+
+        :param file_path: path of the patrol file, relative to the game directory
+        :param biome: lower case biome name
+        :param season: lower case season name
+        :param camp: lower case camp name
+        :param patrol_type: "hunting", "border", "training" or "med". Anything else is not filtered
+        :param patrol_size: amount of cats on the patrol
+        """
+        index = self.get_index(file_path)
+        if index is None:
+            return []
+        return index.query(biome, season, camp, patrol_type, patrol_size)
+
+    def get_index(self, file_path: str) -> Optional[PatrolFileIndex]:
+        try:
+            mtime = os.stat(file_path).st_mtime_ns
+        except OSError:
+            print(f"ERROR: Unable to find patrol file {file_path}.")
+            return None
+
+        index = self._files.get(file_path)
+        if index is not None and index.mtime == mtime:
+            self.hits += 1
+            return index
+
+        with open(file_path, "r", encoding="ascii") as read_file:
+            patrol_dicts = ujson.loads(read_file.read())
+        index = PatrolFileIndex(self.generate_patrol_events(patrol_dicts), mtime)
+        self._files[file_path] = index
+        self.loads += 1
+        return index
+
+    def clear(self):
+        self._files.clear()
+
+    @staticmethod
+    def generate_patrol_events(patrol_dict) -> List[PatrolEvent]:
+        all_patrol_events = []
+        for patrol in patrol_dict:
+            patrol_event = PatrolEvent(
+                patrol_id=patrol.get("patrol_id"),
+                biome=patrol.get("biome"),
+                camp=patrol.get("camp"),
+                season=patrol.get("season"),
+                tags=patrol.get("tags"),
+                weight=patrol.get("weight", 20),
+                types=patrol.get("types"),
+                intro_text=patrol.get("intro_text"),
+                patrol_art=patrol.get("patrol_art"),
+                patrol_art_clean=patrol.get("patrol_art_clean"),
+                success_outcomes=PatrolOutcome.generate_from_info(
+                    patrol.get("success_outcomes")
+                ),
+                fail_outcomes=PatrolOutcome.generate_from_info(
+                    patrol.get("fail_outcomes"), success=False
+                ),
+                decline_text=patrol.get("decline_text"),
+                chance_of_success=patrol.get("chance_of_success"),
+                min_cats=patrol.get("min_cats", 1),
+                max_cats=patrol.get("max_cats", 6),
+                min_max_status=patrol.get("min_max_status"),
+                antag_success_outcomes=PatrolOutcome.generate_from_info(
+                    patrol.get("antag_success_outcomes"), antagonize=True
+                ),
+                antag_fail_outcomes=PatrolOutcome.generate_from_info(
+                    patrol.get("antag_fail_outcomes"), success=False, antagonize=True
+                ),
+                relationship_constraints=patrol.get("relationship_constraint"),
+                pl_skill_constraints=patrol.get("pl_skill_constraint"),
+                pl_trait_constraints=patrol.get("pl_trait_constraints"),
+            )
+
+            all_patrol_events.append(patrol_event)
+
+        return all_patrol_events
+
+
+patrol_catalog = PatrolCatalog()
@@ -329,6 +329,9 @@ class PatrolOutcome:
     def _get_stat_cat(self, patrol: "Patrol"):
         """Sets the stat cat. Returns true if a stat cat was found, and False if a stat cat was not found"""
 
+        # Outcomes are shared between patrols, so clear the stat cat of the last patrol first
+        self.stat_cat = None
+
         print("---")
         print(
             f"Finding stat cat. Outcome Type: Success = {self.success}, Antag = {self.antagonize}"
@@ -1181,11 +1181,23 @@ class ChooseMateScreen(Screens):
     def get_valid_mates(self):
         """Get a list of valid mates for the current cat"""
 
+        if self.the_cat in Cat.mate_index:
+            # only the living Clan cats of a fitting age have to be checked, in the order of the list
+            candidates = {
+                i.ID
+                for i in self.the_cat.mate_candidates(
+                    age_restriction=False, include_no_mates=True
+                )
+            }
+        else:
+            candidates = None
+
         # Behold! The uglest list comprehension ever created!
         valid_mates = [
             i
             for i in Cat.all_cats_list
-            if not i.faded
+            if (candidates is None or i.ID in candidates)
+            and not i.faded
             and self.the_cat.is_potential_mate(
                 i, for_love_interest=False, age_restriction=False, ignore_no_mates=True
             )
@@ -1,11 +1,12 @@
 from math import ceil
-from typing import Union, Dict, Optional
+from typing import Union, Dict, List, Optional
 
 import pygame
 import pygame_gui
 from pygame_gui.core import ObjectID
 
 from scripts.cat.cats import Cat
+from scripts.cat.name_index import NameIndex
 from scripts.game_structure.game_essentials import game
 from scripts.game_structure.screen_settings import game_screen_size, MANAGER
 from scripts.game_structure.ui_elements import (
@@ -45,6 +46,16 @@ class ListScreen(Screens):
         self.full_cat_list = []
         self.current_listed_cats = []
 
+        # the full_cat_list the caches below were made for
+        self.cached_cat_list = None
+        # sort type: full_cat_list sorted that way, cats don't change while the list is shown
+        self.sorted_cat_lists: Dict[str, List[Cat]] = {}
+        self.all_cats_sort_type = None
+        self.name_index = NameIndex()
+        self.name_index_outdated = True
+        # (search text, sorted list, cats found) of the last search
+        self.last_search = None
+
         self.list_screen_container = None
 
         self.cat_list_bar = None
@@ -622,28 +633,42 @@ class ListScreen(Screens):
         """
         self.current_listed_cats = []
 
+        if self.full_cat_list is not self.cached_cat_list:
+            # another group was chosen or the screen was opened again, the cats may have changed
+            self.cached_cat_list = self.full_cat_list
+            self.sorted_cat_lists = {}
+            self.all_cats_sort_type = None
+            self.name_index_outdated = True
+            self.last_search = None
+
         # make sure cat list is the same every where else in the game.
-        Cat.sort_cats(self.full_cat_list)
-        Cat.sort_cats(Cat.all_cats_list)
+        if self.all_cats_sort_type != game.sort_type:
+            Cat.sort_cats(Cat.all_cats_list)
+            self.all_cats_sort_type = game.sort_type
+
+        sorted_cats = self.sorted_cat_lists.get(game.sort_type)
+        if sorted_cats is None:
+            Cat.sort_cats(self.full_cat_list)
+
+            # adding in the guide if necessary, this ensures the guide isn't affected by sorting as we always want
+            # them to be the first cat on the list
+            if (self.current_group == "df" and game.clan.instructor.df) or (
+                self.current_group == "sc" and not game.clan.instructor.df
+            ):
+                if game.clan.instructor in self.full_cat_list:
+                    self.full_cat_list.remove(game.clan.instructor)
+                self.full_cat_list.insert(0, game.clan.instructor)
 
-        # adding in the guide if necessary, this ensures the guide isn't affected by sorting as we always want them to
-        # be the first cat on the list
-        if (self.current_group == "df" and game.clan.instructor.df) or (
-            self.current_group == "sc" and not game.clan.instructor.df
-        ):
-            if game.clan.instructor in self.full_cat_list:
-                self.full_cat_list.remove(game.clan.instructor)
-            self.full_cat_list.insert(0, game.clan.instructor)
+            sorted_cats = self.full_cat_list.copy()
+            self.sorted_cat_lists[game.sort_type] = sorted_cats
 
         search_text = search_text.strip()
         if search_text not in ["", "name search"]:
-            self.current_listed_cats = [
-                cat
-                for cat in self.full_cat_list
-                if search_text.lower() in str(cat.name).lower()
-            ]
+            self.current_listed_cats = self.search_cats(
+                search_text.lower(), sorted_cats
+            )
         else:
-            self.current_listed_cats = self.full_cat_list.copy()
+            self.current_listed_cats = sorted_cats.copy()
 
         self.all_pages = (
             int(ceil(len(self.current_listed_cats) / 20.0))
@@ -658,6 +683,32 @@ class ListScreen(Screens):
         Cat.ordered_cat_list = self.current_listed_cats
         self._update_cat_display()
 
+    def search_cats(self, search_text: str, sorted_cats: List[Cat]) -> List[Cat]:
+        """
+        The cats of sorted_cats whose name contains the lower-cased search text, in the same order.
+        While the search text only grows, the cats found last time are filtered further.
+        """
+        if self.name_index_outdated:
+            # only the names which changed since the last search are indexed again
+            self.name_index.refresh(self.full_cat_list, Cat.all_cats)
+            self.name_index_outdated = False
+
+        if self.last_search is not None:
+            last_text, last_sorted_cats, last_found = self.last_search
+            if last_sorted_cats is sorted_cats and last_text in search_text:
+                found = [
+                    cat
+                    for cat in last_found
+                    if self.name_index.matches(cat.ID, search_text)
+                ]
+                self.last_search = (search_text, sorted_cats, found)
+                return found.copy()
+
+        found_ids = self.name_index.search(search_text)
+        found = [cat for cat in sorted_cats if cat.ID in found_ids]
+        self.last_search = (search_text, sorted_cats, found)
+        return found.copy()
+
     def _update_cat_display(self):
         """
         updates the cat display, includes the page number display
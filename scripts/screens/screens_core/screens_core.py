@@ -1,3 +1,6 @@
+from collections import OrderedDict
+from functools import partial
+from threading import RLock
 from typing import Optional, Tuple
 
 import pygame
@@ -21,6 +24,7 @@ from scripts.utility import (
     ui_scale_blit,
     get_text_box_theme,
     ui_scale_value,
+    get_current_season,
 )
 
 game_frame: Optional[pygame.Surface] = None
@@ -329,97 +333,128 @@ def rebuild_bgs():
         dropshadow.blit(game_box, ui_scale_blit((-15, -15)))
         del game_box
 
-    bg = pygame.Surface(scripts.game_structure.screen_settings.game_screen_size)
-    bg.fill(game.config["theme"]["light_mode_background"])
-    bg_dark = pygame.Surface(scripts.game_structure.screen_settings.game_screen_size)
-    bg_dark.fill(game.config["theme"]["dark_mode_background"])
+    default_game_bgs = {"light": {}, "dark": {}}
+    default_fullscreen_bgs = {"light": BackgroundDict(), "dark": BackgroundDict()}
+    for theme in ["light", "dark"]:
+        bg = pygame.Surface(scripts.game_structure.screen_settings.game_screen_size)
+        bg.fill(game.config["theme"][f"{theme}_mode_background"])
+        default_game_bgs[theme]["default"] = bg
+        default_fullscreen_bgs[theme].register(
+            "default",
+            theme,
+            tuple(bg.get_at((0, 0))),
+            bg.copy,
+            vignette_strength=0,
+            fade_color=None,
+        )
 
-    default_game_bgs = {
-        "light": {"default": bg},
-        "dark": {"default": bg_dark},
-    }
+        for name, (path, blur_radius, alpha) in fullscreen_bg_files.items():
+            default_fullscreen_bgs[theme].register(
+                name,
+                theme,
+                path,
+                partial(load_bg, path, alpha),
+                blur_radius=blur_radius,
+            )
 
-    temp_screen_size = scripts.game_structure.screen_settings.screen.get_size()
+        for name, path in get_camp_bg_files()[theme].items():
+            default_fullscreen_bgs[theme].register(
+                name, theme, path, partial(load_bg, path, False)
+            )
 
-    default_fullscreen_bgs = {
-        "light": {
-            "default": pygame.transform.scale(bg, temp_screen_size),
-            "mainmenu_bg": pygame.transform.scale(
-                pygame.image.load("resources/images/menu_logoless.png").convert(),
-                temp_screen_size,
-            ),
-            "starclan": pygame.transform.scale(
-                pygame.image.load("resources/images/starclanbg.png").convert_alpha(),
-                temp_screen_size,
-            ),
-            "darkforest": pygame.transform.scale(
-                pygame.image.load("resources/images/darkforestbg.png").convert_alpha(),
-                temp_screen_size,
-            ),
-            "unknown_residence": pygame.transform.scale(
-                pygame.image.load("resources/images/urbg.png").convert(),
-                temp_screen_size,
-            ),
-        },
-        "dark": {
-            "default": pygame.transform.scale(bg_dark, temp_screen_size),
-            "mainmenu_bg": pygame.transform.scale(
-                pygame.image.load("resources/images/menu_logoless.png").convert(),
-                temp_screen_size,
-            ),
-            "starclan": pygame.transform.scale(
-                pygame.image.load("resources/images/starclanbg.png").convert_alpha(),
-                temp_screen_size,
-            ),
-            "darkforest": pygame.transform.scale(
-                pygame.image.load("resources/images/darkforestbg.png").convert_alpha(),
-                temp_screen_size,
-            ),
-            "unknown_residence": pygame.transform.scale(
-                pygame.image.load("resources/images/urbg.png").convert(),
-                temp_screen_size,
-            ),
-        },
-    }
 
-    for theme in ["light", "dark"]:
-        for name, bg in default_fullscreen_bgs[theme].items():
-            if name not in [
-                "default",
-                "mainmenu_bg",
-                "darkforest",
-                "unknown_residence",
-                "starclan",
-            ]:
-                default_fullscreen_bgs[theme][name] = process_blur_bg(
-                    default_fullscreen_bgs[theme][name], theme=theme
-                )
-            elif name == "default":
-                default_fullscreen_bgs[theme][name] = process_blur_bg(
-                    default_fullscreen_bgs[theme][name],
-                    theme=theme,
-                    vignette_strength=0,
-                    fade_color=None,
-                )
-            elif name in ["mainmenu_bg", "darkforest", "unknown_residence"]:
-                default_fullscreen_bgs[theme][name] = process_blur_bg(
-                    default_fullscreen_bgs[theme][name], theme=theme, blur_radius=10
-                )
-            elif name == "starclan":
-                default_fullscreen_bgs[theme][name] = process_blur_bg(
-                    default_fullscreen_bgs[theme][name], theme=theme, blur_radius=2
-                )
-
-    camp_bgs = get_camp_bgs()
+def prewarm_bgs():
+    """
+    Process the camp background of the current season and theme, and the default one, ahead of time.
+    Called on the loading thread, so the first screen after loading doesn't have to.
+    """
+    theme = "dark" if game.settings["dark mode"] else "light"
+    try:
+        season = get_current_season()
+    except AttributeError:
+        season = "Newleaf"
+    for name in ("default", season):
+        _ = default_fullscreen_bgs[theme][name]
 
-    for theme in ["light", "dark"]:
-        for name, camp_bg in camp_bgs[theme].items():
-            default_fullscreen_bgs[theme][name] = process_blur_bg(camp_bg, theme=theme)
 
+class BackgroundDict(dict):
+    """The processed fullscreen backgrounds of one theme by name. A background is processed when it's first looked up."""
+
+    def __init__(self):
+        super().__init__()
+        self.sources = {}  # name: (theme, source, load, processing arguments)
+
+    def register(self, name, theme, source, load, **process_args):
+        """Add a background, see get_processed_bg for the arguments."""
+        self.pop(name, None)
+        self.sources[name] = (theme, source, load, process_args)
+
+    def __missing__(self, name):
+        if name not in self.sources:
+            raise KeyError(name)
+        theme, source, load, process_args = self.sources[name]
+        bg = self[name] = get_processed_bg(theme, source, load, **process_args)
+        return bg
+
+    def __contains__(self, name):
+        return dict.__contains__(self, name) or name in self.sources
 
-def get_camp_bgs():
+
+# name: (file, blur radius, keep transparency)
+fullscreen_bg_files = {
+    "mainmenu_bg": ("resources/images/menu_logoless.png", 10, False),
+    "starclan": ("resources/images/starclanbg.png", 2, True),
+    "darkforest": ("resources/images/darkforestbg.png", 10, True),
+    "unknown_residence": ("resources/images/urbg.png", 10, False),
+}
+
+# (screen size, theme, source, processing arguments): processed background
+processed_bgs = OrderedDict()
+PROCESSED_BGS_MAX = 48
+# process_blur_bg changes the shared vignette, fade and dropshadow, and backgrounds are prewarmed on the loading thread
+_bg_lock = RLock()
+
+
+def load_bg(path, alpha) -> pygame.Surface:
+    image = pygame.image.load(path)
+    return image.convert_alpha() if alpha else image.convert()
+
+
+def get_processed_bg(theme, source, load, **process_args) -> pygame.Surface:
+    """
+    Returns the background processed by process_blur_bg for the current screen size.
+    Processed backgrounds are kept, so toggling fullscreen or switching back to a camp doesn't process them again.
+    :param theme: "light" or "dark"
+    :param source: What the background is made from, e.g. its file
+    :param load: Returns the unprocessed background, only called if it isn't cached
+    """
+    key = (
+        scripts.game_structure.screen_settings.screen.get_size(),
+        scripts.game_structure.screen_settings.screen_scale,
+        theme,
+        source,
+        tuple(sorted(process_args.items())),
+    )
+    with _bg_lock:
+        if key in processed_bgs:
+            processed_bgs.move_to_end(key)
+            return processed_bgs[key]
+
+        processed_bgs[key] = process_blur_bg(load(), theme=theme, **process_args)
+        while len(processed_bgs) > PROCESSED_BGS_MAX:
+            processed_bgs.popitem(last=False)
+        return processed_bgs[key]
+
+
+def get_camp_bg_files():
+    """Returns the files of the camp backgrounds of the Clan, by theme and season."""
     camp_bg_base_dir = "resources/images/camp_bg/"
-    leaves = ["newleaf", "greenleaf", "leafbare", "leaffall"]
+    leaves = {
+        "Newleaf": "newleaf",
+        "Greenleaf": "greenleaf",
+        "Leaf-bare": "leafbare",
+        "Leaf-fall": "leaffall",
+    }
     available_biome = ["forest", "mountainous", "plains", "beach"]
 
     try:
@@ -429,51 +464,12 @@ def get_camp_bgs():
         camp_nr = "camp1"
         biome = available_biome[0]
 
-    all_backgrounds = []
-    for light_dark in ["light", "dark"]:
-        for leaf in leaves:
-            platform_dir = (
-                f"{camp_bg_base_dir}/{biome}/{leaf}_{camp_nr}_{light_dark}.png"
-            )
-            all_backgrounds.append(platform_dir)
-
     return {
-        "light": {
-            "Newleaf": pygame.transform.scale(
-                pygame.image.load(all_backgrounds[0]).convert(),
-                scripts.game_structure.screen_settings.screen.get_size(),
-            ),
-            "Greenleaf": pygame.transform.scale(
-                pygame.image.load(all_backgrounds[1]).convert(),
-                scripts.game_structure.screen_settings.screen.get_size(),
-            ),
-            "Leaf-bare": pygame.transform.scale(
-                pygame.image.load(all_backgrounds[2]).convert(),
-                scripts.game_structure.screen_settings.screen.get_size(),
-            ),
-            "Leaf-fall": pygame.transform.scale(
-                pygame.image.load(all_backgrounds[3]).convert(),
-                scripts.game_structure.screen_settings.screen.get_size(),
-            ),
-        },
-        "dark": {
-            "Newleaf": pygame.transform.scale(
-                pygame.image.load(all_backgrounds[4]).convert(),
-                scripts.game_structure.screen_settings.screen.get_size(),
-            ),
-            "Greenleaf": pygame.transform.scale(
-                pygame.image.load(all_backgrounds[5]).convert(),
-                scripts.game_structure.screen_settings.screen.get_size(),
-            ),
-            "Leaf-bare": pygame.transform.scale(
-                pygame.image.load(all_backgrounds[6]).convert(),
-                scripts.game_structure.screen_settings.screen.get_size(),
-            ),
-            "Leaf-fall": pygame.transform.scale(
-                pygame.image.load(all_backgrounds[7]).convert(),
-                scripts.game_structure.screen_settings.screen.get_size(),
-            ),
-        },
+        light_dark: {
+            season: f"{camp_bg_base_dir}/{biome}/{leaf}_{camp_nr}_{light_dark}.png"
+            for season, leaf in leaves.items()
+        }
+        for light_dark in ["light", "dark"]
     }
 
 
@@ -522,18 +518,22 @@ def process_blur_bg(
 
 def feather_surface(surface, feather_width):
     """
-    Run a per-pixel effect to make a fun fade-to-transparent border
+    Make a fun fade-to-transparent border, by filling the rings of pixels at the same distance from the edge
     :param surface: The surface to add a feathered edge to
     :param feather_width: How fat to make the edge
     :return: None
     """
     width, height = surface.get_size()
-    for x in range(width):
-        for y in range(height):
-            distance = min(x, y, width - x - 1, height - y - 1)
-            if distance < feather_width:
-                alpha = int(255 * (distance / feather_width))
-                surface.set_at((x, y), (0, 0, 0, alpha))
+    for distance in range(feather_width):
+        ring_width = width - 2 * distance
+        ring_height = height - 2 * distance
+        if ring_width <= 0 or ring_height <= 0:
+            break
+        colour = (0, 0, 0, int(255 * (distance / feather_width)))
+        surface.fill(colour, (distance, distance, ring_width, 1))
+        surface.fill(colour, (distance, height - distance - 1, ring_width, 1))
+        surface.fill(colour, (distance, distance, 1, ring_height))
+        surface.fill(colour, (width - distance - 1, distance, 1, ring_height))
 
 
 rebuild_core()
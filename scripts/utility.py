@@ -7,12 +7,15 @@ TODO: Docs
 """  # pylint: enable=line-too-long
 
 import logging
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from itertools import combinations
 from math import floor
 from random import choice, choices, randint, random, sample, randrange, getrandbits
-from sys import exit as sys_exit
-from typing import List, Tuple
+from sys import byteorder, exit as sys_exit
+from typing import List, Optional, Tuple
 
 import pygame
 import ujson
@@ -23,7 +26,13 @@ from scripts.game_structure import image_cache
 from scripts.cat.history import History
 from scripts.cat.names import names
 from scripts.cat.pelts import Pelt
+from scripts.cat.sprite_atlas import sprite_atlas
+from scripts.cat.sprite_cache import sprite_cache
 from scripts.cat.sprites import sprites
+from scripts.cat_relations.relationship_matrix import (
+    VALUE_NAMES,
+    compile_value_constraints,
+)
 from scripts.game_structure.game_essentials import game
 import scripts.game_structure.screen_settings  # must be done like this to get updates when we change screen size etc
 
@@ -159,12 +168,7 @@ def get_cats_same_age(Cat, cat, age_range=10):
 def get_free_possible_mates(cat):
     """Returns a list of available cats, which are possible mates for the given cat."""
     cats = []
-    for inter_cat in cat.all_cats.values():
-        if inter_cat.dead or inter_cat.outside or inter_cat.exiled:
-            continue
-        if inter_cat.ID == cat.ID:
-            continue
-
+    for inter_cat in cat.mate_candidates():
         if inter_cat.ID not in cat.relationships:
             cat.create_one_relationship(inter_cat)
             if cat.ID not in inter_cat.relationships:
@@ -965,23 +969,30 @@ def create_new_cat(
 def get_highest_romantic_relation(
     relationships, exclude_mate=False, potential_mate=False
 ):
-    """Returns the relationship with the highest romantic value."""
-    max_love_value = 0
-    current_max_relationship = None
-    for rel in relationships:
-        if rel.romantic_love < 0:
-            continue
+    """Returns the relationship with the highest romantic value.
+
+    :param relationships: The relationships to check. If `cat.relationships` is passed, the candidates are
+    found in the relationship matrix, and only the relationships with the highest values are checked.
+    """
+    if hasattr(relationships, "sorted_by"):
+        candidates = relationships.sorted_by("romantic_love")
+    else:
+        candidates = sorted(
+            (rel for rel in relationships if rel.romantic_love > 0),
+            key=lambda rel: rel.romantic_love,
+            reverse=True,
+        )
+
+    for rel in candidates:
         if exclude_mate and rel.cat_from.ID in rel.cat_to.mate:
             continue
         if potential_mate and not rel.cat_to.is_potential_mate(
             rel.cat_from, for_love_interest=True
         ):
             continue
-        if rel.romantic_love > max_love_value:
-            current_max_relationship = rel
-            max_love_value = rel.romantic_love
+        return rel
 
-    return current_max_relationship
+    return None
 
 
 def check_relationship_value(cat_from, cat_to, rel_value=None):
@@ -1084,45 +1095,15 @@ def get_amount_of_cats_with_relation_value_towards(cat, value, all_cats):
     :param value: value which has to be reached
     :param all_cats: list of cats which has to be checked
     """
+    matrix = cat.relationships.matrix
+    to_slot = matrix.slot(cat)
+    if to_slot is None:
+        return dict.fromkeys(VALUE_NAMES, 0)
 
-    # collect all true or false if the value is reached for the cat or not
-    # later count or sum can be used to get the amount of cats
-    # this will be handled like this, because it is easier / shorter to check
-    relation_dict = {
-        "romantic_love": [],
-        "platonic_like": [],
-        "dislike": [],
-        "admiration": [],
-        "comfortable": [],
-        "jealousy": [],
-        "trust": [],
-    }
-
-    for inter_cat in all_cats:
-        if cat.ID in inter_cat.relationships:
-            relation = inter_cat.relationships[cat.ID]
-        else:
-            continue
-
-        relation_dict["romantic_love"].append(relation.romantic_love >= value)
-        relation_dict["platonic_like"].append(relation.platonic_like >= value)
-        relation_dict["dislike"].append(relation.dislike >= value)
-        relation_dict["admiration"].append(relation.admiration >= value)
-        relation_dict["comfortable"].append(relation.comfortable >= value)
-        relation_dict["jealousy"].append(relation.jealousy >= value)
-        relation_dict["trust"].append(relation.trust >= value)
-
-    return_dict = {
-        "romantic_love": sum(relation_dict["romantic_love"]),
-        "platonic_like": sum(relation_dict["platonic_like"]),
-        "dislike": sum(relation_dict["dislike"]),
-        "admiration": sum(relation_dict["admiration"]),
-        "comfortable": sum(relation_dict["comfortable"]),
-        "jealousy": sum(relation_dict["jealousy"]),
-        "trust": sum(relation_dict["trust"]),
-    }
-
-    return return_dict
+    from_slots = (matrix.slot(inter_cat) for inter_cat in all_cats)
+    return matrix.count_towards(
+        to_slot, [slot for slot in from_slots if slot is not None], value
+    )
 
 
 def filter_relationship_type(
@@ -1151,16 +1132,6 @@ def filter_relationship_type(
         "app/mentor",
     ]
 
-    possible_value_types = [
-        "romantic",
-        "platonic",
-        "dislike",
-        "comfortable",
-        "jealousy",
-        "trust",
-        "admiration",
-    ]
-
     if "siblings" in filter_types:
         test_cat = group[0]
         testing_cats = [cat for cat in group if cat.ID != test_cat.ID]
@@ -1254,104 +1225,25 @@ def filter_relationship_type(
             return False
 
     # Filtering relationship values
-    break_loop = False
-    for v_type in possible_value_types:
-        # first get all tags for current value types
-        tags = [constraint for constraint in filter_types if v_type in constraint]
-
-        # If there is not a tag for the current value type, check next one
-        if len(tags) == 0:
-            continue
-
-            # there should be only one value constraint for each value type
-        elif len(tags) > 1:
-            print(
-                f"ERROR: event {event_id} has multiple relationship constraints for the value {v_type}."
-            )
-            break_loop = True
-            break
-
-        # try to extract the value/threshold from the text
-        try:
-            threshold = int(tags[0].split("_")[1])
-        except:
-            print(
-                f"ERROR: event {event_id} with the relationship constraint for the value does not {v_type} follow the formatting guidelines."
-            )
-            break_loop = True
-            break
-
-        if threshold > 100:
-            print(
-                f"ERROR: event {event_id} has a relationship constraint for the value {v_type}, which is higher than the max value of a relationship."
-            )
-            break_loop = True
-            break
-
-        if threshold <= 0:
-            print(
-                f"ERROR: event {event_id} has a relationship constraint for the value {v_type}, which is lower than the min value of a relationship or 0."
-            )
-            break_loop = True
-            break
+    conditions, error = compile_value_constraints(tuple(filter_types))
+    if error:
+        messages = {
+            "multiple": f"ERROR: event {event_id} has multiple relationship constraints for the value {error.value_tag}.",
+            "format": f"ERROR: event {event_id} with the relationship constraint for the value does not {error.value_tag} follow the formatting guidelines.",
+            "high": f"ERROR: event {event_id} has a relationship constraint for the value {error.value_tag}, which is higher than the max value of a relationship.",
+            "low": f"ERROR: event {event_id} has a relationship constraint for the value {error.value_tag}, which is lower than the min value of a relationship or 0.",
+        }
+        print(messages[error.problem])
+        return False
 
-        # each cat has to have relationships with this relationship value above the threshold
-        fulfilled = True
+    # each cat has to have relationships towards all other cats of the group, which fulfill all conditions
+    if conditions:
         for inter_cat in group:
-            rel_above_threshold = []
-            group_ids = [cat.ID for cat in group]
-            relevant_relationships = list(
-                filter(
-                    lambda rel: rel.cat_to.ID in group_ids
-                    and rel.cat_to.ID != inter_cat.ID,
-                    list(inter_cat.relationships.values()),
-                )
-            )
-
-            # get the relationships depending on the current value type + threshold
-            if v_type == "romantic":
-                rel_above_threshold = [
-                    i for i in relevant_relationships if i.romantic_love >= threshold
-                ]
-            elif v_type == "platonic":
-                rel_above_threshold = [
-                    i for i in relevant_relationships if i.platonic_like >= threshold
-                ]
-            elif v_type == "dislike":
-                rel_above_threshold = [
-                    i for i in relevant_relationships if i.dislike >= threshold
-                ]
-            elif v_type == "comfortable":
-                rel_above_threshold = [
-                    i for i in relevant_relationships if i.comfortable >= threshold
-                ]
-            elif v_type == "jealousy":
-                rel_above_threshold = [
-                    i for i in relevant_relationships if i.jealousy >= threshold
-                ]
-            elif v_type == "trust":
-                rel_above_threshold = [
-                    i for i in relevant_relationships if i.trust >= threshold
-                ]
-            elif v_type == "admiration":
-                rel_above_threshold = [
-                    i for i in relevant_relationships if i.admiration >= threshold
-                ]
-
-            # if the lengths are not equal, one cat has not the relationship value which is needed to another cat of
-            # the event
-            if len(rel_above_threshold) + 1 != len(group):
-                fulfilled = False
-                break
-
-        if not fulfilled:
-            break_loop = True
-            break
-
-    # if break is used in the loop, the condition are not fulfilled
-    # and this event should not be added to the filtered list
-    if break_loop:
-        return False
+            for other_cat in group:
+                if other_cat.ID == inter_cat.ID:
+                    continue
+                if not inter_cat.relationships.fulfills(other_cat.ID, conditions):
+                    return False
 
     return True
 
@@ -1717,17 +1609,10 @@ def get_other_clan_relation(relation):
         return "hostile"
 
 
-def pronoun_repl(m, cat_pronouns_dict, raise_exception=False):
-    """Helper function for add_pronouns. If raise_exception is
-    False, any error in pronoun formatting will not raise an
+def render_pronoun_tag(tag, inner_details, cat_pronouns_dict, raise_exception=False):
+    """Returns the text for a pronoun or verb tag, already split at "/" into inner_details.
+    If raise_exception is False, any error in pronoun formatting will not raise an
     exception, and will use a simple replacement "error" """
-
-    # Add protection about the "insert" sometimes used
-    if m.group(0) == "{insert}":
-        return m.group(0)
-
-    inner_details = m.group(1).split("/")
-
     try:
         d = cat_pronouns_dict[inner_details[1]][1]
         if inner_details[0].upper() == "PRONOUN":
@@ -1740,37 +1625,108 @@ def pronoun_repl(m, cat_pronouns_dict, raise_exception=False):
 
         if raise_exception:
             raise KeyError(
-                f"Pronoun tag: {m.group(1)} is not properly"
+                f"Pronoun tag: {tag} is not properly"
                 "indicated as a PRONOUN or VERB tag."
             )
 
-        print("Failed to find pronoun:", m.group(1))
+        print("Failed to find pronoun:", tag)
         return "error1"
     except (KeyError, IndexError) as e:
         if raise_exception:
             raise
 
-        logger.exception("Failed to find pronoun: " + m.group(1))
-        print("Failed to find pronoun:", m.group(1))
+        logger.exception("Failed to find pronoun: " + tag)
+        print("Failed to find pronoun:", tag)
         return "error2"
 
 
-def name_repl(m, cat_dict):
-    """Name replacement"""
-    return cat_dict[m.group(0)][0]
-
+# kinds of template segments, see parse_text_template
+TEMPLATE_NAME = 0
+TEMPLATE_TAG = 1
+TEMPLATE_ABBR = 2
+
+
+@lru_cache(maxsize=256)
+def get_text_pattern(cat_abbrs: tuple, abbrs: tuple = ()):
+    """
+    Returns the compiled pattern finding the pronoun tags and abbreviations in a text.
+    :param cat_abbrs: Abbreviations of cats, replaced with their names. Pronoun tags are only found if there are any.
+    :param abbrs: Other abbreviations, replaced with plain text
+    """
+    alternatives = []
+    if cat_abbrs:
+        alternatives.append(r"\{(?P<tag>.*?)\}")
+        names = "|".join(re.escape(l) for l in cat_abbrs)
+        alternatives.append(r"(?<!\{)(?P<name>" + names + r")(?!\})")
+    if abbrs:
+        # longest first, so o_c_n isn't taken for c_n
+        abbrs = "|".join(re.escape(l) for l in sorted(abbrs, key=len, reverse=True))
+        alternatives.append("(?P<abbr>" + abbrs + ")")
+    return re.compile("|".join(alternatives))
+
+
+@lru_cache(maxsize=16384)
+def parse_text_template(text: str, cat_abbrs: tuple, abbrs: tuple = ()) -> tuple:
+    """
+    Splits a text into the parts which stay as they are and the slots which are filled in by render_text_template.
+    Event, thought and interaction texts are only parsed once for every set of abbreviations used with them.
+    :return: The segments of the text. A segment is either a string, (TEMPLATE_NAME, abbreviation),
+    (TEMPLATE_TAG, tag, parts of the tag) or (TEMPLATE_ABBR, abbreviation)
+    """
+    if not cat_abbrs and not abbrs:
+        return (text,)
+
+    segments = []
+    position = 0
+    for match in get_text_pattern(cat_abbrs, abbrs).finditer(text):
+        if match.start() > position:
+            segments.append(text[position : match.start()])
+        position = match.end()
+
+        kind = match.lastgroup
+        if kind == "name":
+            segments.append((TEMPLATE_NAME, match.group(0)))
+        elif kind == "abbr":
+            segments.append((TEMPLATE_ABBR, match.group(0)))
+        elif match.group(0) == "{insert}":
+            # Add protection about the "insert" sometimes used
+            segments.append(match.group(0))
+        else:
+            tag = match.group("tag")
+            segments.append((TEMPLATE_TAG, tag, tuple(tag.split("/"))))
+    if position < len(text):
+        segments.append(text[position:])
+    return tuple(segments)
+
+
+def render_text_template(
+    segments: tuple, cat_dict: dict, replacements: dict = None, raise_exception=False
+) -> str:
+    """Fill the slots of a text parsed by parse_text_template."""
+    parts = []
+    for segment in segments:
+        if segment.__class__ is str:
+            parts.append(segment)
+        elif segment[0] == TEMPLATE_NAME:
+            parts.append(cat_dict[segment[1]][0])
+        elif segment[0] == TEMPLATE_ABBR:
+            parts.append(replacements[segment[1]])
+        else:
+            parts.append(
+                render_pronoun_tag(segment[1], segment[2], cat_dict, raise_exception)
+            )
+    return "".join(parts)
 
-def process_text(text, cat_dict, raise_exception=False):
-    """Add the correct name and pronouns into a string."""
-    adjust_text = re.sub(
-        r"\{(.*?)\}", lambda x: pronoun_repl(x, cat_dict, raise_exception), text
-    )
 
-    name_patterns = [r"(?<!\{)" + re.escape(l) + r"(?!\})" for l in cat_dict]
-    adjust_text = re.sub(
-        "|".join(name_patterns), lambda x: name_repl(x, cat_dict), adjust_text
+def process_text(text, cat_dict, raise_exception=False, replacements=None):
+    """
+    Add the correct name and pronouns into a string.
+    :param replacements: Other abbreviations to replace in the same pass, abbreviation: text
+    """
+    segments = parse_text_template(
+        text, tuple(cat_dict), tuple(replacements) if replacements else ()
     )
-    return adjust_text
+    return render_text_template(segments, cat_dict, replacements, raise_exception)
 
 
 def adjust_list_text(list_of_items) -> str:
@@ -1791,6 +1747,16 @@ def adjust_list_text(list_of_items) -> str:
     return insert
 
 
+def adjust_article(text, abbr, name) -> str:
+    """
+    Turns "a" in front of the abbreviation into "an", if the name it stands for starts with a vowel
+    (i.e. "a o_c_n warrior" becomes "an o_c_n warrior" for EmberClan)
+    """
+    if not name.startswith(("A", "E", "I", "O", "U")):
+        return text
+    return re.sub(r"(?<!\S)a(?=\s+" + re.escape(abbr) + ")", "an", text)
+
+
 def adjust_prey_abbr(patrol_text):
     """
     checks for prey abbreviations and returns adjusted text
@@ -1934,27 +1900,8 @@ def history_text_adjust(text, other_clan_name, clan, other_cat_rc=None):
     we want to handle history text on its own because it needs to preserve the pronoun tags and cat abbreviations.
     this is so that future pronoun changes or name changes will continue to be reflected in history
     """
-    vowels = ["A", "E", "I", "O", "U"]
-
     if "o_c_n" in text:
-        pos = 0
-        for x in range(text.count("o_c_n")):
-            if "o_c_n" in text:
-                for y in vowels:
-                    if str(other_clan_name).startswith(y):
-                        modify = text.split()
-                        if "o_c_n" in modify:
-                            pos = modify.index("o_c_n")
-                        if "o_c_n's" in modify:
-                            pos = modify.index("o_c_n's")
-                        if "o_c_n." in modify:
-                            pos = modify.index("o_c_n.")
-                        if modify[pos - 1] == "a":
-                            modify.remove("a")
-                            modify.insert(pos - 1, "an")
-                        text = " ".join(modify)
-                        break
-
+        text = adjust_article(text, "o_c_n", str(other_clan_name))
         text = text.replace("o_c_n", str(other_clan_name))
 
     if "c_n" in text:
@@ -2052,8 +1999,6 @@ def event_text_adjust(
     :param OtherClan other_clan: OtherClan object for other_clan (o_c_n), if present
     :param str chosen_herb: string of chosen_herb (chosen_herb), if present
     """
-    vowels = ["A", "E", "I", "O", "U"]
-
     if not text:
         text = "This should not appear, report as a bug please! Tried to adjust the text, but no text was provided."
         print("WARNING: Tried to adjust text, but no text was provided.")
@@ -2151,87 +2096,57 @@ def event_text_adjust(
         med = choice(get_alive_status_cats(Cat, ["medicine cat"], working=True))
         replace_dict["med_name"] = (str(med.name), choice(med.pronouns))
 
-    # assign all names and pronouns
-    if replace_dict:
-        text = process_text(text, replace_dict)
+    # the other abbreviations are replaced in the same pass as the names and pronouns
+    replacements = {}
 
     # multi_cat
     if "multi_cat" in text:
         name_list = []
         for _cat in multi_cats:
             name_list.append(str(_cat.name))
-        list_text = adjust_list_text(name_list)
-        text = text.replace("multi_cat", list_text)
+        replacements["multi_cat"] = adjust_list_text(name_list)
 
     # other_clan_name
     if "o_c_n" in text:
-        other_clan_name = other_clan.name
-        pos = 0
-        for x in range(text.count("o_c_n")):
-            if "o_c_n" in text:
-                for y in vowels:
-                    if str(other_clan_name).startswith(y):
-                        modify = text.split()
-                        if "o_c_n" in modify:
-                            pos = modify.index("o_c_n")
-                        if "o_c_n's" in modify:
-                            pos = modify.index("o_c_n's")
-                        if "o_c_n." in modify:
-                            pos = modify.index("o_c_n.")
-                        if modify[pos - 1] == "a":
-                            modify.remove("a")
-                            modify.insert(pos - 1, "an")
-                        text = " ".join(modify)
-                        break
-
-        text = text.replace("o_c_n", str(other_clan_name) + "Clan")
+        other_clan_name = str(other_clan.name)
+        text = adjust_article(text, "o_c_n", other_clan_name)
+        replacements["o_c_n"] = other_clan_name + "Clan"
 
     # clan_name
-    if "c_n" in text:
+    if text.count("c_n") > text.count("o_c_n"):
         try:
             clan_name = clan.name
         except AttributeError:
             clan_name = game.switches["clan_list"][0]
 
-        pos = 0
-        for x in range(text.count("c_n")):
-            if "c_n" in text:
-                for y in vowels:
-                    if str(clan_name).startswith(y):
-                        modify = text.split()
-                        if "c_n" in modify:
-                            pos = modify.index("c_n")
-                        if "c_n's" in modify:
-                            pos = modify.index("c_n's")
-                        if "c_n." in modify:
-                            pos = modify.index("c_n.")
-                        if modify[pos - 1] == "a":
-                            modify.remove("a")
-                            modify.insert(pos - 1, "an")
-                        text = " ".join(modify)
-                        break
-
-        text = text.replace("c_n", str(clan_name) + "Clan")
+        text = adjust_article(text, "c_n", str(clan_name))
+        replacements["c_n"] = str(clan_name) + "Clan"
 
     # prey lists
-    text = adjust_prey_abbr(text)
+    for abbr, list_name in PREY_LISTS["abbreviations"].items():
+        if abbr in text:
+            replacements[abbr] = choice(PREY_LISTS[list_name])
 
     # acc_plural (only works for main_cat's acc)
     if "acc_plural" in text:
-        text = text.replace(
-            "acc_plural", str(ACC_DISPLAY[main_cat.pelt.accessory]["plural"])
+        replacements["acc_plural"] = str(
+            ACC_DISPLAY[main_cat.pelt.accessory]["plural"]
         )
 
     # acc_singular (only works for main_cat's acc)
     if "acc_singular" in text:
-        text = text.replace(
-            "acc_singular", str(ACC_DISPLAY[main_cat.pelt.accessory]["singular"])
+        replacements["acc_singular"] = str(
+            ACC_DISPLAY[main_cat.pelt.accessory]["singular"]
         )
 
     if "given_herb" in text:
         if "_" in chosen_herb:
             chosen_herb = chosen_herb.replace("_", " ")
-        text = text.replace("given_herb", str(chosen_herb))
+        replacements["given_herb"] = str(chosen_herb)
+
+    # assign all names and pronouns
+    if replace_dict or replacements:
+        text = process_text(text, replace_dict, replacements=replacements)
 
     return text
 
@@ -2515,12 +2430,135 @@ def update_sprite(cat):
         # Don't update the sprite if the cat is faded.
         return
 
+    # sprites are only generated again if something that affects them changed
+    key = sprite_cache_key(cat)
+    new_sprite = sprite_cache.get(cat.ID, key)
+    if new_sprite is None:
+        new_sprite = sprite_atlas.get(cat.ID, key)
+        if new_sprite is None:
+            new_sprite = try_generate_sprite(cat)
+            if new_sprite is not None:
+                sprite_atlas.put(cat.ID, key, new_sprite)
+            else:
+                new_sprite = error_placeholder_sprite()
+        sprite_cache.put(cat.ID, key, new_sprite)
+
     # apply
-    cat.sprite = generate_sprite(cat)
+    cat.sprite = new_sprite
     # update class dictionary
     cat.all_cats[cat.ID] = cat
 
 
+def sprite_button_smoothscale(sprite: pygame.Surface, size: Tuple[int, int]) -> bool:
+    """True if a cat sprite shown at this size by UISpriteButton is smoothscaled, to smooth out the crunch."""
+    return (
+        size[1] <= ui_scale_value(sprite.get_height())
+        or size[0] <= ui_scale_value(sprite.get_height())
+    ) and not game.settings["no sprite antialiasing"]
+
+
+def get_sprite_names(cat) -> List[str]:
+    """Returns the names of the sprites generate_sprite(cat) is made from, for Sprites.prewarm."""
+    pelt = cat.pelt
+    cat_sprite = get_sprite_index(cat)
+    names = [
+        "lines" + cat_sprite,
+        "lineartdead" + cat_sprite,
+        "lineartdf" + cat_sprite,
+        "shaders" + cat_sprite,
+        "lighting" + cat_sprite,
+        "skin" + pelt.skin + cat_sprite,
+        "eyes" + pelt.eye_colour + cat_sprite,
+    ]
+    if pelt.name not in ["Tortie", "Calico"]:
+        names.append(pelt.get_sprites_name() + pelt.colour + cat_sprite)
+    else:
+        tortie_pattern = (
+            "SingleColour" if pelt.tortiepattern == "Single" else pelt.tortiepattern
+        )
+        names.append(pelt.tortiebase + pelt.colour + cat_sprite)
+        names.append(tortie_pattern + pelt.tortiecolour + cat_sprite)
+        names.append("tortiemask" + pelt.pattern + cat_sprite)
+    for white in (pelt.white_patches, pelt.points, pelt.vitiligo):
+        if white:
+            names.append("white" + white + cat_sprite)
+    if pelt.eye_colour2 != None:
+        names.append("eyes2" + pelt.eye_colour2 + cat_sprite)
+    names.extend("scars" + scar + cat_sprite for scar in pelt.scars)
+    if pelt.accessory in pelt.plant_accessories:
+        names.append("acc_herbs" + pelt.accessory + cat_sprite)
+    elif pelt.accessory in pelt.wild_accessories:
+        names.append("acc_wild" + pelt.accessory + cat_sprite)
+    elif pelt.accessory in pelt.collars:
+        names.append("collars" + pelt.accessory + cat_sprite)
+    if cat.dead:
+        names.extend(
+            f"{fade}{stage}{cat_sprite}"
+            for fade in ("fademask", "fadestarclan", "fadedf")
+            for stage in range(3)
+        )
+    return names
+
+
+def prewarm_sprite_sheets(cats):
+    """Load the spritesheets the sprites of these cats are made from, e.g. on the loading thread."""
+    names = set()
+    for cat in cats:
+        if not cat.faded:
+            names.update(get_sprite_names(cat))
+    sprites.prewarm(names)
+
+
+def prerender_sprites(cats, button_sizes=(), workers=1):
+    """
+    Compose the sprites of the cats into the sprite cache, along with the versions scaled for UISpriteButton.
+    Meant to run on the loading thread, so the first screens don't have to compose every cat on the main thread.
+    Sprites which are already cached for their current key are skipped, sprites in the sprite atlas aren't composed again.
+
+    :param cats: The cats to render, faded cats are skipped
+    :param button_sizes: The sizes the sprites will be shown at by UISpriteButton
+    :param workers: The number of worker threads, 1 by default. The shared layers of the sprites aren't locked, and no
+        gain from more threads has been measured, so only use more for testing.
+    """
+    jobs = []
+    for cat in cats:
+        if cat.faded:
+            continue
+        key = sprite_cache_key(cat)
+        if not sprite_cache.contains(cat.ID, key):
+            jobs.append((cat, key, sprite_atlas.get(cat.ID, key)))
+    if not jobs:
+        return
+
+    def render(job):
+        cat, key, sprite = job
+        composed = sprite is None
+        if composed:
+            sprite = try_generate_sprite(cat)
+            if sprite is None:
+                # not stored in the atlas
+                composed = False
+                sprite = error_placeholder_sprite()
+        scaled = {}
+        for size in button_sizes:
+            smooth = sprite_button_smoothscale(sprite, size)
+            scaled[(size, smooth)] = sprite_cache.make_scaled(sprite, size, smooth)
+        return cat, key, sprite, scaled, composed
+
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(render, jobs))
+    else:
+        results = map(render, jobs)
+
+    # the caches are only changed on this thread
+    for cat, key, sprite, scaled, composed in results:
+        sprite_cache.put(cat.ID, key, sprite, scaled)
+        if composed:
+            sprite_atlas.put(cat.ID, key, sprite)
+        cat.sprite = sprite
+
+
 def clan_symbol_sprite(clan, return_string=False, force_light=False):
     """
     returns the clan symbol for the given clan_name, if no symbol exists then random symbol is chosen
@@ -2571,36 +2609,18 @@ def clan_symbol_sprite(clan, return_string=False, force_light=False):
             )
 
 
-def generate_sprite(
-    cat,
-    life_state=None,
-    scars_hidden=False,
-    acc_hidden=False,
-    always_living=False,
-    no_not_working=False,
-) -> pygame.Surface:
+def get_sprite_index(cat, life_state=None, no_not_working=False) -> str:
     """
-    Generates the sprite for a cat, with optional arguments that will override certain things.
+    Returns the index of the pose used for the sprite of the cat, as a string.
 
-    :param life_state: sets the age life_stage of the cat, overriding the one set by its age. Set to string.
-    :param scars_hidden: If True, doesn't display the cat's scars. If False, display cat scars.
-    :param acc_hidden: If True, hide the accessory. If false, show the accessory.
-    :param always_living: If True, always show the cat with living lineart
-    :param no_not_working: If true, never use the not_working lineart.
-                    If false, use the cat.not_working() to determine the no_working art.
+    :param life_state: sets the age life_stage of the cat, overriding the one set by its age.
+    :param no_not_working: If true, never use the not_working pose.
     """
-
     if life_state is not None:
         age = life_state
     else:
         age = cat.age
 
-    if always_living:
-        dead = False
-    else:
-        dead = cat.dead
-
-    # setting the cat_sprite (bc this makes things much easier)
     if (
         not no_not_working
         and cat.not_working()
@@ -2628,6 +2648,138 @@ def generate_sprite(
         else:
             cat_sprite = str(cat.pelt.cat_sprites[age])
 
+    return cat_sprite
+
+
+def get_fade_stage(cat, dead):
+    """Returns the fading fog stage ("0", "1" or "2") of a dead cat, or None if it isn't fading."""
+    if not (
+        cat.pelt.opacity <= 97
+        and not cat.prevent_fading
+        and game.clan.clan_settings["fading"]
+        and dead
+    ):
+        return None
+    if 80 >= cat.pelt.opacity > 45:
+        # Stage 1
+        return "1"
+    if cat.pelt.opacity <= 45:
+        # Stage 2
+        return "2"
+    return "0"
+
+
+def sprite_cache_key(cat) -> tuple:
+    """Returns everything that affects the sprite of the cat made by generate_sprite(cat), as a tuple."""
+    pelt = cat.pelt
+    return (
+        get_sprite_index(cat),
+        cat.dead,
+        cat.df,
+        game.settings["shaders"],
+        get_fade_stage(cat, cat.dead),
+        pelt.reverse,
+        pelt.name,
+        pelt.colour,
+        pelt.tortiebase,
+        pelt.tortiepattern,
+        pelt.tortiecolour,
+        pelt.pattern,
+        pelt.tint,
+        pelt.white_patches,
+        pelt.white_patches_tint,
+        pelt.points,
+        pelt.vitiligo,
+        pelt.eye_colour,
+        pelt.eye_colour2,
+        tuple(pelt.scars),
+        pelt.skin,
+        pelt.accessory,
+        sprites.size,
+    )
+
+
+def _make_combined_layer(bottom_name, top_name, special_flags=0):
+    layer = sprites.sprites[bottom_name].copy()
+    layer.blit(sprites.sprites[top_name], (0, 0), special_flags=special_flags)
+    return layer
+
+
+def _make_tinted_layer(sprite_name, colour):
+    layer = sprites.sprites[sprite_name].copy()
+    layer.blit(
+        sprites.tint_layer(colour), (0, 0), special_flags=pygame.BLEND_RGB_MULT
+    )
+    return layer
+
+
+def _get_white_layer(white_name, white_patches_tint, cat_sprite):
+    """Returns the white patches or points sprite, with the white patches tint applied."""
+    sprite_name = "white" + white_name + cat_sprite
+    if (
+        white_patches_tint == "none"
+        or white_patches_tint not in sprites.white_patches_tints["tint_colours"]
+    ):
+        return sprites.sprites[sprite_name]
+    return sprites.get_layer(
+        ("white", white_name, white_patches_tint, cat_sprite),
+        _make_tinted_layer,
+        sprite_name,
+        sprites.white_patches_tints["tint_colours"][white_patches_tint],
+    )
+
+
+def generate_sprite(
+    cat,
+    life_state=None,
+    scars_hidden=False,
+    acc_hidden=False,
+    always_living=False,
+    no_not_working=False,
+) -> pygame.Surface:
+    """
+    Generates the sprite for a cat, with optional arguments that will override certain things.
+    If the sprite can't be made, the error placeholder is returned, see try_generate_sprite.
+
+    :param life_state: sets the age life_stage of the cat, overriding the one set by its age. Set to string.
+    :param scars_hidden: If True, doesn't display the cat's scars. If False, display cat scars.
+    :param acc_hidden: If True, hide the accessory. If false, show the accessory.
+    :param always_living: If True, always show the cat with living lineart
+    :param no_not_working: If true, never use the not_working lineart.
+                    If false, use the cat.not_working() to determine the no_working art.
+    """
+    new_sprite = try_generate_sprite(
+        cat, life_state, scars_hidden, acc_hidden, always_living, no_not_working
+    )
+    if new_sprite is None:
+        new_sprite = error_placeholder_sprite()
+    return new_sprite
+
+
+def error_placeholder_sprite() -> pygame.Surface:
+    return image_cache.load_image(f"sprites/error_placeholder.png").convert_alpha()
+
+
+def try_generate_sprite(
+    cat,
+    life_state=None,
+    scars_hidden=False,
+    acc_hidden=False,
+    always_living=False,
+    no_not_working=False,
+) -> Optional[pygame.Surface]:
+    """
+    Generates the sprite for a cat like generate_sprite, but returns None if it can't be made.
+    Sprites which failed must not be stored in the sprite atlas.
+    """
+
+    if always_living:
+        dead = False
+    else:
+        dead = cat.dead
+
+    cat_sprite = get_sprite_index(cat, life_state, no_not_working)
+
     new_sprite = pygame.Surface(
         (sprites.size, sprites.size), pygame.HWSURFACE | pygame.SRCALPHA
     )
@@ -2654,13 +2806,18 @@ def generate_sprite(
             else:
                 tortie_pattern = cat.pelt.tortiepattern
 
-            patches = sprites.sprites[
-                tortie_pattern + cat.pelt.tortiecolour + cat_sprite
-            ].copy()
-            patches.blit(
-                sprites.sprites["tortiemask" + cat.pelt.pattern + cat_sprite],
-                (0, 0),
-                special_flags=pygame.BLEND_RGBA_MULT,
+            patches = sprites.get_layer(
+                (
+                    "tortie",
+                    tortie_pattern,
+                    cat.pelt.tortiecolour,
+                    cat.pelt.pattern,
+                    cat_sprite,
+                ),
+                _make_combined_layer,
+                tortie_pattern + cat.pelt.tortiecolour + cat_sprite,
+                "tortiemask" + cat.pelt.pattern + cat_sprite,
+                pygame.BLEND_RGBA_MULT,
             )
 
             # Add patches onto cat.
@@ -2674,59 +2831,30 @@ def generate_sprite(
             # Multiply with alpha does not work as you would expect - it just lowers the alpha of the
             # entire surface. To get around this, we first blit the tint onto a white background to dull it,
             # then blit the surface onto the sprite with pygame.BLEND_RGB_MULT
-            tint = pygame.Surface((sprites.size, sprites.size)).convert_alpha()
-            tint.fill(tuple(sprites.cat_tints["tint_colours"][cat.pelt.tint]))
+            tint = sprites.tint_layer(sprites.cat_tints["tint_colours"][cat.pelt.tint])
             new_sprite.blit(tint, (0, 0), special_flags=pygame.BLEND_RGB_MULT)
         if (
             cat.pelt.tint != "none"
             and cat.pelt.tint in sprites.cat_tints["dilute_tint_colours"]
         ):
-            tint = pygame.Surface((sprites.size, sprites.size)).convert_alpha()
-            tint.fill(tuple(sprites.cat_tints["dilute_tint_colours"][cat.pelt.tint]))
+            tint = sprites.tint_layer(
+                sprites.cat_tints["dilute_tint_colours"][cat.pelt.tint]
+            )
             new_sprite.blit(tint, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
 
         # draw white patches
         if cat.pelt.white_patches is not None:
-            white_patches = sprites.sprites[
-                "white" + cat.pelt.white_patches + cat_sprite
-            ].copy()
-
-            # Apply tint to white patches.
-            if (
-                cat.pelt.white_patches_tint != "none"
-                and cat.pelt.white_patches_tint
-                in sprites.white_patches_tints["tint_colours"]
-            ):
-                tint = pygame.Surface((sprites.size, sprites.size)).convert_alpha()
-                tint.fill(
-                    tuple(
-                        sprites.white_patches_tints["tint_colours"][
-                            cat.pelt.white_patches_tint
-                        ]
-                    )
-                )
-                white_patches.blit(tint, (0, 0), special_flags=pygame.BLEND_RGB_MULT)
-
+            white_patches = _get_white_layer(
+                cat.pelt.white_patches, cat.pelt.white_patches_tint, cat_sprite
+            )
             new_sprite.blit(white_patches, (0, 0))
 
         # draw vit & points
 
         if cat.pelt.points:
-            points = sprites.sprites["white" + cat.pelt.points + cat_sprite].copy()
-            if (
-                cat.pelt.white_patches_tint != "none"
-                and cat.pelt.white_patches_tint
-                in sprites.white_patches_tints["tint_colours"]
-            ):
-                tint = pygame.Surface((sprites.size, sprites.size)).convert_alpha()
-                tint.fill(
-                    tuple(
-                        sprites.white_patches_tints["tint_colours"][
-                            cat.pelt.white_patches_tint
-                        ]
-                    )
-                )
-                points.blit(tint, (0, 0), special_flags=pygame.BLEND_RGB_MULT)
+            points = _get_white_layer(
+                cat.pelt.points, cat.pelt.white_patches_tint, cat_sprite
+            )
             new_sprite.blit(points, (0, 0))
 
         if cat.pelt.vitiligo:
@@ -2735,11 +2863,15 @@ def generate_sprite(
             )
 
         # draw eyes & scars1
-        eyes = sprites.sprites["eyes" + cat.pelt.eye_colour + cat_sprite].copy()
         if cat.pelt.eye_colour2 != None:
-            eyes.blit(
-                sprites.sprites["eyes2" + cat.pelt.eye_colour2 + cat_sprite], (0, 0)
+            eyes = sprites.get_layer(
+                ("eyes", cat.pelt.eye_colour, cat.pelt.eye_colour2, cat_sprite),
+                _make_combined_layer,
+                "eyes" + cat.pelt.eye_colour + cat_sprite,
+                "eyes2" + cat.pelt.eye_colour2 + cat_sprite,
             )
+        else:
+            eyes = sprites.sprites["eyes" + cat.pelt.eye_colour + cat_sprite]
         new_sprite.blit(eyes, (0, 0))
 
         if not scars_hidden:
@@ -2799,20 +2931,8 @@ def generate_sprite(
                 )
 
         # Apply fading fog
-        if (
-            cat.pelt.opacity <= 97
-            and not cat.prevent_fading
-            and game.clan.clan_settings["fading"]
-            and dead
-        ):
-            stage = "0"
-            if 80 >= cat.pelt.opacity > 45:
-                # Stage 1
-                stage = "1"
-            elif cat.pelt.opacity <= 45:
-                # Stage 2
-                stage = "2"
-
+        stage = get_fade_stage(cat, dead)
+        if stage is not None:
             new_sprite.blit(
                 sprites.sprites["fademask" + stage + cat_sprite],
                 (0, 0),
@@ -2834,21 +2954,38 @@ def generate_sprite(
 
     except (TypeError, KeyError):
         logger.exception("Failed to load sprite")
-
-        # Placeholder image
-        new_sprite = image_cache.load_image(
-            f"sprites/error_placeholder.png"
-        ).convert_alpha()
+        return None
 
     return new_sprite
 
 
 def apply_opacity(surface, opacity):
-    for x in range(surface.get_width()):
-        for y in range(surface.get_height()):
-            pixel = list(surface.get_at((x, y)))
-            pixel[3] = int(pixel[3] * opacity / 100)
-            surface.set_at((x, y), tuple(pixel))
+    """
+    Scale the alpha of every pixel of the surface by opacity percent.
+    The alpha bytes of 32 bit surfaces are mapped in one go, through a lookup table.
+    """
+    if surface.get_bytesize() != 4 or not surface.get_masks()[3]:
+        for x in range(surface.get_width()):
+            for y in range(surface.get_height()):
+                pixel = list(surface.get_at((x, y)))
+                pixel[3] = int(pixel[3] * opacity / 100)
+                surface.set_at((x, y), tuple(pixel))
+        return surface
+
+    table = bytes(min(int(alpha * opacity / 100), 255) for alpha in range(256))
+    alpha_index = surface.get_shifts()[3] // 8
+    if byteorder == "big":
+        alpha_index = 3 - alpha_index
+    pitch = surface.get_pitch()
+    row_bytes = surface.get_width() * 4
+
+    buffer = surface.get_buffer()
+    pixels = bytearray(buffer.raw)
+    for start in range(0, len(pixels), pitch):
+        row = slice(start + alpha_index, start + row_bytes, 4)
+        pixels[row] = pixels[row].translate(table)
+    buffer.write(bytes(pixels))
+    del buffer
     return surface
 
 
@@ -2884,6 +3021,7 @@ def quit(savesettings=False, clearevents=False):
         game.save_settings(None)
     if clearevents:
         game.cur_events_list.clear()
+    game.close_save_storages()
     game.rpc.close_rpc.set()
     game.rpc.update_rpc.set()
     pygame.display.quit()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+
+# pylint: disable=line-too-long
+"""
+
+Sprite compositing microbenchmark.
+
+Loads the sprite sheets and a save, and builds the sprite of every cat of the Clan with generate_sprite
+a number of times, without the sprite cache. Reports the time per sprite for the first round, where the
+shared layers are made, and for the following rounds, where they are reused.
+
+Usage:
+    python sprite_benchmark.py
+    python sprite_benchmark.py --clan Thunder --rounds 20
+
+No save is shipped for this. To make a benchmark Clan, start the game, create a new Clan (e.g. "Bench")
+and save it, then let it grow without the game window:
+    python headless.py --clan Bench -n 40 --seed 1
+The numbers in the commit messages were measured on such a Clan with 44 cats.
+
+"""  # pylint: enable=line-too-long
+# The dummy drivers have to be set before pygame is imported anywhere.
+import os
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import argparse
+import sys
+import time
+
+import pygame
+
+from scripts.housekeeping.datadir import setup_data_dir
+
+try:
+    directory = os.path.dirname(__file__)
+except NameError:
+    directory = os.getcwd()
+if directory:
+    os.chdir(directory)
+
+setup_data_dir()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time generate_sprite for all cats of a save."
+    )
+    parser.add_argument(
+        "--clan", default=None, help="name of the Clan to load (default: current Clan)"
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=10, help="how often every sprite is built"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # convert_alpha needs a display
+    pygame.display.set_mode((1, 1))
+
+    from scripts.cat.cats import Cat
+    from scripts.cat.sprites import sprites
+    from scripts.clan import clan_class
+    from scripts.game_structure.game_essentials import game
+    from scripts.game_structure.load_cat import load_cats
+    from scripts.utility import generate_sprite
+
+    clan_list = game.read_clans()
+    if not clan_list:
+        print("No Clans found in the save directory.")
+        return 1
+    if args.clan:
+        if args.clan not in clan_list:
+            print(f"Clan {args.clan} not found. Available: {', '.join(clan_list)}")
+            return 1
+        clan_list.remove(args.clan)
+        clan_list.insert(0, args.clan)
+    game.switches["clan_list"] = clan_list
+
+    start = time.perf_counter()
+    sprites.load_all()
+    print(f"Loaded sprite sheets in {time.perf_counter() - start:.2f}s")
+
+    load_cats()
+    clan_class.load_clan()
+    cats = [cat for cat in Cat.all_cats.values() if not cat.faded]
+    if not cats:
+        print("The Clan has no cats.")
+        return 1
+
+    times = []
+    for _ in range(max(args.rounds, 1)):
+        start = time.perf_counter()
+        for cat in cats:
+            generate_sprite(cat)
+        times.append(time.perf_counter() - start)
+
+    print(f"{len(cats)} cats, {len(sprites.layers)} shared layers")
+    print(f"first round:  {times[0] * 1000000 / len(cats):>8.1f} us/sprite")
+    if len(times) > 1:
+        later = sum(times[1:]) / (len(times) - 1)
+        print(f"later rounds: {later * 1000000 / len(cats):>8.1f} us/sprite")
+    total = sprites.layer_hits + sprites.layer_misses
+    print(
+        f"layer hit rate: {sprites.layer_hits / total if total else 0:.0%} "
+        f"({sprites.layer_hits} hits, {sprites.layer_misses} misses)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -87,6 +87,31 @@ class TestRelativesFunction(unittest.TestCase):
         self.assertFalse(kit.is_grandparent(grand_parent))
         self.assertTrue(grand_parent.is_grandparent(kit))
 
+    # test that is_cousin returns True for cats whose parents are siblings and False otherwise
+    def test_is_cousin(self):
+        grand_parent = Cat()
+        sibling1 = Cat(parent1=grand_parent.ID)
+        sibling2 = Cat(parent1=grand_parent.ID)
+        kit1 = Cat(parent1=sibling1.ID)
+        kit2 = Cat(parent1=sibling2.ID)
+        self.assertFalse(kit1.is_cousin(sibling2))
+        self.assertTrue(kit1.is_cousin(kit2))
+        self.assertTrue(kit2.is_cousin(kit1))
+
+    # test that relatives are found through parents which were added after the cat was created
+    def test_adoptive_parent_added_later(self):
+        parent = Cat()
+        kit1 = Cat(parent1=parent.ID)
+        kit2 = Cat()
+        kit2.set_adoptive_parent(parent)
+        kit1.create_inheritance_new_cat()
+        self.assertTrue(parent.is_parent(kit2))
+        self.assertTrue(kit1.is_sibling(kit2))
+
+        kit2.unset_adoptive_parent(parent)
+        self.assertFalse(parent.is_parent(kit2))
+        self.assertFalse(kit1.is_sibling(kit2))
+
 
 class TestPossibleMateFunction(unittest.TestCase):
 
@@ -121,6 +146,28 @@ class TestPossibleMateFunction(unittest.TestCase):
         self.assertFalse(sibling1.is_potential_mate(kit, for_love_interest=True))
         self.assertFalse(sibling2.is_potential_mate(sibling1, for_love_interest=True))
 
+    # test that the sets of relatives are updated when a kit is born
+    def test_forbidden_mates_new_kit(self):
+        grand_parent = Cat()
+        parent1 = Cat(parent1=grand_parent.ID)
+        parent2 = Cat(parent1=grand_parent.ID)
+        for cat in [grand_parent, parent1, parent2]:
+            cat.create_inheritance_new_cat()
+        self.assertEqual(grand_parent.inheritance.relatives, {parent1.ID, parent2.ID})
+
+        kit = Cat(parent1=parent1.ID)
+        kit.create_inheritance_new_cat()
+        cousin = Cat(parent1=parent2.ID)
+        cousin.create_inheritance_new_cat()
+
+        self.assertIn(kit.ID, grand_parent.inheritance.relatives)
+        self.assertIn(kit.ID, parent2.inheritance.forbidden_mates(True))
+        self.assertIn(cousin.ID, kit.inheritance.forbidden_mates(False))
+        self.assertNotIn(cousin.ID, kit.inheritance.forbidden_mates(True))
+        self.assertIn(kit.ID, kit.inheritance.forbidden_mates(True))
+        self.assertTrue(kit.is_related(cousin, False))
+        self.assertFalse(kit.is_related(cousin, True))
+
     # test is_potential_mate for age checks
     def test_age_mating(self):
         kitten_cat2 = Cat(moons=1)
@@ -421,3 +468,119 @@ class TestUpdateMentor(unittest.TestCase):
         self.assertFalse(app.ID in mentor.apprentice)
         self.assertTrue(app.ID in mentor.former_apprentices)
         self.assertIsNone(app.mentor)
+
+
+class TestCatPools(unittest.TestCase):
+
+    # test that a cat is moved between pools when it leaves, dies or is faded out
+    def test_pool_follows_cat(self):
+        cat = Cat(moons=20, status="warrior")
+        self.assertIn(cat, Cat.clan_pool)
+
+        cat.exiled = True
+        cat.outside = True
+        self.assertIn(cat, Cat.outside_pool)
+        self.assertNotIn(cat, Cat.clan_pool)
+
+        cat.dead = True
+        self.assertIn(cat, Cat.unknown_pool)
+
+        cat.outside = False
+        cat.exiled = False
+        self.assertIn(cat, Cat.starclan_pool)
+
+        cat.df = True
+        self.assertIn(cat, Cat.darkforest_pool)
+        self.assertEqual(1, sum(cat in pool for pool in Cat.all_pools()))
+
+        Cat.all_cats.pop(cat.ID).remove_from_pool()
+        self.assertFalse(any(cat in pool for pool in Cat.all_pools()))
+
+    # test that a cat is never chosen when it's excluded
+    def test_choice_excludes_cat(self):
+        first = Cat(moons=20, status="warrior")
+        second = Cat(moons=20, status="warrior")
+
+        for _ in range(50):
+            self.assertNotEqual(first, Cat.clan_pool.choice(exclude=first))
+        self.assertIsNotNone(Cat.clan_pool.choice(exclude=second))
+
+    # test that the mate index follows the age of a cat and leaves it out once it dies
+    def test_mate_index_follows_cat(self):
+        cat = Cat(moons=20, status="warrior")
+        same_age = Cat(moons=21, status="warrior")
+        self.assertIn(cat, Cat.mate_index)
+        self.assertIn(same_age, cat.mate_candidates())
+        self.assertNotIn(cat, cat.mate_candidates())
+
+        cat.moons = 150
+        self.assertNotIn(same_age, cat.mate_candidates())
+        self.assertIn(same_age, cat.mate_candidates(age_restriction=False))
+
+        same_age.no_mates = True
+        self.assertNotIn(same_age, cat.mate_candidates(age_restriction=False))
+        self.assertIn(
+            same_age,
+            cat.mate_candidates(age_restriction=False, include_no_mates=True),
+        )
+
+        cat.dead = True
+        self.assertNotIn(cat, Cat.mate_index)
+        self.assertNotIn(cat, same_age.mate_candidates(age_restriction=False))
+
+    # test that the index finds every cat which is_potential_mate allows
+    def test_mate_candidates_contain_potential_mates(self):
+        cats = [Cat(moons=moons, status="warrior") for moons in range(0, 200, 7)]
+        cats += [Cat(moons=moons, status="kitten") for moons in (1, 3, 5)]
+        for cat in cats:
+            for age_restriction in (True, False):
+                candidates = cat.mate_candidates(age_restriction=age_restriction)
+                expected = [
+                    other_cat
+                    for other_cat in Cat.clan_pool
+                    if cat.is_potential_mate(
+                        other_cat, age_restriction=age_restriction
+                    )
+                ]
+                for other_cat in expected:
+                    self.assertIn(other_cat, candidates)
+
+
+class TestChangeTracking(unittest.TestCase):
+
+    # test that relationships are only reported as changed after something was changed
+    def test_relationship_changes(self):
+        cat1 = Cat(moons=20, status="warrior")
+        cat2 = Cat(moons=20, status="warrior")
+        relationship = Relationship(cat1, cat2)
+        cat1.relationships[cat2.ID] = relationship
+        cat1.mark_relationships_saved()
+        self.assertFalse(cat1.relationships_changed())
+
+        relationship.platonic_like = 0
+        self.assertFalse(cat1.relationships_changed())
+
+        relationship.platonic_like += 10
+        self.assertTrue(cat1.relationships_changed())
+        self.assertEqual({"platonic_like"}, relationship.changed_fields)
+
+        cat1.mark_relationships_saved()
+        relationship.log.append("They shared a mouse.")
+        self.assertTrue(cat1.relationships_changed())
+        self.assertEqual({"log"}, relationship.changed_fields)
+
+        cat1.mark_relationships_saved()
+        del cat1.relationships[cat2.ID]
+        self.assertTrue(cat1.relationships_changed())
+
+    # test that a cat which died has to save its relationships again if it returns
+    def test_dead_cat_relationships(self):
+        cat = Cat(moons=20, status="warrior")
+        cat.mark_relationships_saved()
+        cat.mark_saved()
+
+        cat.dead = True
+        self.assertIn("dead", cat.changed_fields)
+        cat.mark_saved()
+        cat.dead = False
+        self.assertTrue(cat.relationships_changed())
@@ -0,0 +1,79 @@
+import os
+import shutil
+import unittest
+
+import ujson
+
+from scripts.cat.cats import Cat
+from scripts.cat.faded_cat_cache import FadedCatCache
+from scripts.game_structure.game_essentials import game
+from scripts.housekeeping.datadir import get_save_dir
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+
+class TestFadedCatCache(unittest.TestCase):
+    def test_least_recently_used_is_evicted(self):
+        cache = FadedCatCache(max_size=2)
+        cache.put("Clan", "1", "one")
+        cache.put("Clan", "2", "two")
+        cache.get("Clan", "1")
+        cache.put("Clan", "3", "three")
+
+        self.assertEqual((True, "one"), cache.get("Clan", "1"))
+        self.assertEqual((False, None), cache.get("Clan", "2"))
+        self.assertEqual(2, cache.hits)
+        self.assertEqual(1, cache.misses)
+
+    def test_invalidate(self):
+        cache = FadedCatCache()
+        cache.put("Clan", "1", "one")
+        cache.invalidate("Clan", "1")
+        self.assertEqual((False, None), cache.get("Clan", "1"))
+
+
+class TestLoadFadedCat(unittest.TestCase):
+    def setUp(self):
+        self.clan_name = "FadedCacheTest"
+        self.old_clan, self.old_clan_list = game.clan, game.switches["clan_list"]
+        game.clan = None
+        game.switches["clan_list"] = [self.clan_name]
+        self.directory = f"{get_save_dir()}/{self.clan_name}/faded_cats"
+        os.makedirs(self.directory, exist_ok=True)
+        with open(f"{self.directory}/90001.json", "w", encoding="utf-8") as write_file:
+            write_file.write(
+                ujson.dumps(
+                    {
+                        "ID": "90001",
+                        "name_prefix": "Ash",
+                        "name_suffix": "fur",
+                        "status": "warrior",
+                        "moons": 50,
+                        "parent1": None,
+                        "parent2": None,
+                        "faded_offspring": [],
+                    }
+                )
+            )
+        Cat.faded_cache.clear()
+
+    def tearDown(self):
+        shutil.rmtree(f"{get_save_dir()}/{self.clan_name}")
+        game.clan, game.switches["clan_list"] = self.old_clan, self.old_clan_list
+        Cat.faded_cache.clear()
+
+    def test_faded_cat_is_read_once(self):
+        first = Cat.fetch_cat("90001")
+        second = Cat.fetch_cat("90001")
+
+        self.assertIsNotNone(first)
+        self.assertTrue(first.faded)
+        self.assertIs(first, second)
+        self.assertEqual(1, Cat.faded_cache.misses)
+        self.assertEqual(1, Cat.faded_cache.hits)
+
+    def test_missing_faded_cat(self):
+        self.assertIsNone(Cat.fetch_cat("90002"))
+        self.assertIsNone(Cat.fetch_cat("90002"))
+        self.assertEqual(1, Cat.faded_cache.misses)
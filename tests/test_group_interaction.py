@@ -1,9 +1,10 @@
 import os
+import time
 import unittest
 
 from scripts.cat.cats import Cat, Relationship
 from scripts.cat.skills import Skill, SkillPath
-from scripts.events_module.relationship.group_events import GroupEvents, GroupInteraction
+from scripts.events_module.relationship.group_events import CatEligibility, GroupEvents, GroupInteraction
 
 os.environ["SDL_VIDEODRIVER"] = "dummy"
 os.environ["SDL_AUDIODRIVER"] = "dummy"
@@ -318,41 +319,40 @@ class OtherFiltering(unittest.TestCase):
 
 
 class Abbreviations(unittest.TestCase):
-    def test_get_abbreviation_possibilities_all(self):
+    def test_eligibility(self):
         # given
-        main_cat = Cat()
-        main_cat.status = "warrior"
-
         random1 = Cat()
         random1.status = "warrior"
         random2 = Cat()
         random2.status = "warrior"
         random3 = Cat()
-        random3.status = "warrior"
+        random3.status = "medicine cat"
 
         interaction1 = GroupInteraction("1")
         interaction1.status_constraint = {"r_c1": ["warrior"]}
 
         interaction2 = GroupInteraction("2")
-        interaction2.status_constraint = {"r_c1": ["healer", "warrior"]}
-        
+        interaction2.status_constraint = {"r_c1": ["healer", "medicine cat"]}
+
         # when
-        all_interactions = [interaction1, interaction2]
-        interaction_cats = [random1, random2]
-        abbreviations_possibilities, cat_abbreviations_counter = GroupEvents().get_abbreviations_possibilities(
-            all_interactions, 3, interaction_cats
-        )
+        eligibility = CatEligibility([random1, random2, random3])
 
         # then
-        self.assertEqual(len(abbreviations_possibilities), 2)
-        # all cats would fit in
-        self.assertEqual(len(abbreviations_possibilities["1"]), 3)
-        self.assertEqual(len(abbreviations_possibilities["2"]), 3)
+        self.assertEqual(eligibility.slot(interaction1, "r_c1"), 0b011)
+        self.assertEqual(eligibility.slot(interaction2, "r_c1"), 0b100)
+        # no constraint, all cats would fit in
+        self.assertEqual(eligibility.slot(interaction1, "r_c2"), 0b111)
+        self.assertEqual(sorted(eligibility.indices(0b101)), [0, 2])
 
-    def test_get_abbreviation_possibilities_not_all(self):
+    def test_assign_cats(self):
         # given
         main_cat = Cat()
         main_cat.status = "warrior"
+        abbreviations_cat_id = {
+            "m_c": main_cat.ID,
+            "r_c1": None,
+            "r_c2": None
+        }
 
         random1 = Cat()
         random1.status = "warrior"
@@ -361,89 +361,108 @@ class Abbreviations(unittest.TestCase):
         random3 = Cat()
         random3.status = "medicine cat"
 
-        interaction1 = GroupInteraction("1")
-        interaction1.status_constraint = {"r_c1": ["warrior"]}
+        interaction = GroupInteraction("1")
+        interaction.status_constraint = {"r_c2": ["medicine cat", "warrior"], "r_c1": ["medicine cat"]}
 
-        interaction2 = GroupInteraction("2")
-        interaction2.status_constraint = {"r_c1": ["medicine cat"]}
-        
         # when
-        all_interactions = [interaction1, interaction2]
-        interaction_cats = [random1, random2, random3]
-        abbreviations_possibilities, cat_abbreviations_counter = GroupEvents().get_abbreviations_possibilities(
-            all_interactions, 3, interaction_cats
-        )
+        eligibility = CatEligibility([random1, random2, random3])
+        assigned = GroupEvents.assign_cats(interaction, abbreviations_cat_id, eligibility)
 
         # then
-        self.assertEqual(len(abbreviations_possibilities), 2)
-        # all cats would fit in
-        self.assertEqual(len(abbreviations_possibilities["1"]["r_c1"]), 2)
-        self.assertEqual(len(abbreviations_possibilities["2"]["r_c1"]), 1)
+        self.assertEqual(assigned["m_c"], main_cat.ID)
+        self.assertEqual(assigned["r_c1"], random3.ID)
+        self.assertIn(assigned["r_c2"], [random1.ID, random2.ID])
 
-    def test_remove_abbreviations_missing_cats(self):
+    def test_assign_cats_relationship(self):
         # given
-        abbreviations_possibilities = {
-            "1": {
-                "r_c1": ["1", "2"],
-                "r_c2": ["1", "2"],
-            },
-            "2": {
-                "r_c1": ["1", "2"],
-                "r_c2": [],
-            },
-        }
-        
+        main_cat = Cat()
+        abbreviations_cat_id = {"m_c": main_cat.ID, "r_c1": None, "r_c2": None}
+        random1 = Cat()
+        random2 = Cat()
+        random3 = Cat()
+        # order: romantic, platonic, dislike, admiration, comfortable, jealousy, trust
+        for cat_from in [random1, random2, random3]:
+            for cat_to in [random1, random2, random3]:
+                if cat_from is not cat_to:
+                    cat_from.relationships[cat_to.ID] = Relationship(
+                        cat_from, cat_to, False, False, 0, 0, 0, 0, 0, 0, 0
+                    )
+        random2.relationships[random3.ID].trust = 50
+
+        interaction = GroupInteraction("1")
+        interaction.relationship_constraint = {"r_c1_to_r_c2": ["trust_40"]}
+
         # when
-        new_possibilities = GroupEvents().remove_abbreviations_missing_cats(
-            abbreviations_possibilities
-        )
+        eligibility = CatEligibility([random1, random2, random3])
+        assigned = GroupEvents.assign_cats(interaction, abbreviations_cat_id, eligibility)
 
         # then
-        self.assertNotEqual(len(abbreviations_possibilities), len(new_possibilities))
-        self.assertIn("1", new_possibilities)
-        self.assertNotIn("2", new_possibilities)
+        self.assertEqual(assigned["r_c1"], random2.ID)
+        self.assertEqual(assigned["r_c2"], random3.ID)
 
-    def test_set_abbreviations_cats(self):
+    def test_no_assignment(self):
+        # given
+        main_cat = Cat()
+        abbreviations_cat_id = {"m_c": main_cat.ID, "r_c1": None, "r_c2": None}
+        random1 = Cat()
+        random1.status = "warrior"
+        random2 = Cat()
+        random2.status = "apprentice"
+
+        # both abbreviations need the only warrior
+        interaction = GroupInteraction("1")
+        interaction.status_constraint = {"r_c1": ["warrior"], "r_c2": ["warrior"]}
+
+        # when
+        eligibility = CatEligibility([random1, random2])
+
+        # then
+        self.assertIsNone(GroupEvents.assign_cats(interaction, abbreviations_cat_id, eligibility))
+        self.assertEqual(
+            GroupEvents.choose_interaction([interaction], [random1, random2], abbreviations_cat_id),
+            (None, None)
+        )
+
+    def test_unsatisfiable_relationship_constraint(self):
         # given
         main_cat = Cat()
         main_cat.status = "warrior"
+        cats = []
+        for _ in range(100):
+            cat = Cat()
+            cat.status = "warrior"
+            cats.append(cat)
+        # order: romantic, platonic, dislike, admiration, comfortable, jealousy, trust
+        for cat_from in cats + [main_cat]:
+            for cat_to in cats + [main_cat]:
+                if cat_from is not cat_to:
+                    cat_from.relationships[cat_to.ID] = Relationship(
+                        cat_from, cat_to, False, False, 0, 0, 0, 0, 0, 0, 0
+                    )
         abbreviations_cat_id = {
             "m_c": main_cat.ID,
             "r_c1": None,
-            "r_c2": None
+            "r_c2": None,
+            "r_c3": None,
+            "r_c4": None,
         }
 
-        random1 = Cat()
-        random1.status = "warrior"
-        random2 = Cat()
-        random2.status = "warrior"
-        random3 = Cat()
-        random3.status = "medicine cat"
+        # no two cats have a romantic relationship, the constraint doesn't involve the main cat
+        interaction = GroupInteraction("1")
+        interaction.relationship_constraint = {
+            "m_c_to_r_c1": ["platonic_0"],
+            "r_c3_to_r_c4": ["romantic_1"],
+        }
 
         # when
-        interaction_cats = [random1, random2, random3]
-        cat_abbreviations_counter = {
-            random1.ID: {
-                "r_c1": 2,
-                "r_c2": 2
-            },
-            random2.ID: {
-                "r_c1": 2,
-                "r_c2": 2
-            },
-            random3.ID: {
-                "r_c1": 1,
-                "r_c2": 2
-            }
-        }
-        abbreviations_cat_id = GroupEvents().set_abbreviations_cats(
-            interaction_cats, abbreviations_cat_id, cat_abbreviations_counter)
+        eligibility = CatEligibility(cats)
+        start = time.perf_counter()
+        assigned = GroupEvents.assign_cats(interaction, abbreviations_cat_id, eligibility)
+        elapsed = time.perf_counter() - start
 
         # then
-        self.assertIsNotNone(abbreviations_cat_id["r_c1"])
-        self.assertIsNotNone(abbreviations_cat_id["r_c2"])
-        self.assertIn(abbreviations_cat_id["r_c1"], [random1.ID, random2.ID])
-        self.assertNotIn(abbreviations_cat_id["r_c1"], [random3.ID])
+        self.assertIsNone(assigned)
+        self.assertLess(elapsed, 1)
 
 
 class OtherCatsFiltering(unittest.TestCase):
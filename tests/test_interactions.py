@@ -4,6 +4,8 @@ from scripts.cat.cats import Cat, Relationship
 from scripts.cat.skills import SkillPath, Skill
 from scripts.cat_relations.interaction import (
     SingleInteraction,
+    build_interaction_index,
+    get_interactions,
     rel_fulfill_rel_constraints,
     cats_fulfill_single_interaction_constraints
 )
@@ -223,3 +225,39 @@ class SingleInteractionCatConstraints(unittest.TestCase):
 
             self.assertTrue(cats_fulfill_single_interaction_constraints(clan, clan, clan_to_all, game_mode))
             self.assertTrue(cats_fulfill_single_interaction_constraints(clan, clan, all_to_clan, game_mode))
+
+
+class InteractionIndex(unittest.TestCase):
+    def test_buckets(self):
+        # given
+        anywhere = SingleInteraction("anywhere", intensity="low")
+        forest_leafbare = SingleInteraction(
+            "forest_leafbare", biome=["forest"], season=["leaf-bare"], intensity="low"
+        )
+        newleaf = SingleInteraction("newleaf", season=["newleaf"], intensity="high")
+        neutral = SingleInteraction("neutral", intensity="high")
+        master_dict = {"trust": {"increase": [anywhere, forest_leafbare, newleaf], "decrease": []}}
+
+        # when
+        index = build_interaction_index(
+            master_dict, [neutral], {"forest"}, {"leaf-bare", "newleaf", "greenleaf"}
+        )
+
+        # then
+        self.assertEqual(
+            index[("trust", "increase", "low", "forest", "leaf-bare")],
+            (anywhere, forest_leafbare),
+        )
+        self.assertEqual(index[("trust", "increase", "low", None, "leaf-bare")], (anywhere,))
+        self.assertEqual(index[("trust", "increase", "low", "forest", None)], (anywhere,))
+        self.assertEqual(index[("trust", "increase", "high", None, "newleaf")], (newleaf,))
+        self.assertEqual(index[("trust", "increase", "high", None, "greenleaf")], ())
+        self.assertEqual(index[("trust", "decrease", "low", None, None)], ())
+        self.assertEqual(index[(None, "neutral", None, "forest", "newleaf")], (neutral,))
+
+    def test_get_interactions(self):
+        # an unknown biome only gets the interactions which are allowed everywhere
+        interactions = get_interactions("trust", "neutral", "low", "unknown biome", "newleaf")
+        self.assertTrue(interactions)
+        for interaction in interactions:
+            self.assertTrue(interaction.biome <= {"Any", "any"})
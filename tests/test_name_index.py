@@ -0,0 +1,51 @@
+import os
+import unittest
+
+from scripts.cat.cats import Cat
+from scripts.cat.name_index import NameIndex
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+
+class TestNameIndex(unittest.TestCase):
+    def setUp(self):
+        self.cats = [
+            Cat(prefix=prefix, suffix=suffix, status="warrior", moons=30)
+            for prefix, suffix in (
+                ("Fire", "heart"),
+                ("Sand", "storm"),
+                ("Bramble", "claw"),
+                ("Tawny", "pelt"),
+                ("Leaf", "pool"),
+            )
+        ]
+        self.index = NameIndex()
+        self.index.refresh(self.cats)
+
+    # test that the index finds the same cats as looking at every name
+    def test_search_matches_scan(self):
+        for text in ("", "e", "a", "ar", "FIRE", "heart", "ambl", "rm", "eaf", "x", "lep"):
+            expected = {
+                cat.ID for cat in self.cats if text.lower() in str(cat.name).lower()
+            }
+            self.assertEqual(expected, self.index.search(text), text)
+
+    # test that a renamed cat is found under its new name only
+    def test_rename(self):
+        cat = self.cats[0]
+        cat.name.prefix = "Ash"
+        self.index.refresh(self.cats)
+
+        self.assertNotIn(cat.ID, self.index.search("fire"))
+        self.assertIn(cat.ID, self.index.search("ashheart"))
+        self.assertTrue(self.index.matches(cat.ID, "ash"))
+
+    # test that cats which are gone are forgotten
+    def test_refresh_forgets_cats(self):
+        gone = self.cats[1]
+        self.index.refresh(self.cats, {cat.ID for cat in self.cats if cat is not gone})
+
+        self.assertNotIn(gone.ID, self.index)
+        self.assertEqual(set(), self.index.search("sandstorm"))
+        self.assertEqual(len(self.cats) - 1, len(self.index))
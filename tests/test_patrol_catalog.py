@@ -0,0 +1,55 @@
+import os
+import unittest
+
+from scripts.patrol.patrol_catalog import PatrolCatalog, TYPE_TAGS
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+
+class TestPatrolCatalog(unittest.TestCase):
+    def setUp(self):
+        self.catalog = PatrolCatalog()
+        self.file_path = "resources/dicts/patrols/general/hunting.json"
+
+    def test_file_is_loaded_once(self):
+        first = self.catalog.get_patrols(self.file_path)
+        second = self.catalog.get_patrols(self.file_path)
+
+        self.assertTrue(first)
+        self.assertEqual(1, self.catalog.loads)
+        self.assertEqual(1, self.catalog.hits)
+        for a, b in zip(first, second):
+            self.assertIs(a, b)
+
+    def test_missing_file(self):
+        self.assertEqual([], self.catalog.get_patrols("resources/dicts/patrols/nope.json"))
+
+    def test_query_matches_full_scan(self):
+        all_patrols = self.catalog.get_patrols(self.file_path)
+
+        for biome in ["forest", "beach"]:
+            for season in ["newleaf", "leaf-bare"]:
+                for patrol_type in ["hunting", "border", "med"]:
+                    for patrol_size in [1, 2, 6]:
+                        with self.subTest(
+                            biome=biome, season=season, type=patrol_type, size=patrol_size
+                        ):
+                            expected = [
+                                p
+                                for p in all_patrols
+                                if (biome in p.biome or "any" in p.biome)
+                                and (season in p.season or "any" in p.season)
+                                and ("camp1" in p.camp or "any" in p.camp)
+                                and TYPE_TAGS[patrol_type] in p.types
+                                and p.min_cats <= patrol_size <= p.max_cats
+                            ]
+                            found = self.catalog.get_patrols(
+                                self.file_path,
+                                biome=biome,
+                                season=season,
+                                camp="camp1",
+                                patrol_type=patrol_type,
+                                patrol_size=patrol_size,
+                            )
+                            self.assertEqual(expected, found)
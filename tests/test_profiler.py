@@ -0,0 +1,116 @@
+import csv
+import os
+import tempfile
+import unittest
+
+import ujson
+
+from scripts.cat.cats import Cat
+from scripts.housekeeping.profiler import CodeProfiler, PhaseProfiler
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+
+class Phases:
+    @staticmethod
+    def handle(cat, value=None):
+        return value
+
+    def per_moon(self):
+        return "moon"
+
+
+class TestPhaseProfiler(unittest.TestCase):
+    def test_times_per_phase_and_cat(self):
+        profiler = PhaseProfiler()
+        original = Phases.__dict__["handle"]
+        cat = Cat()
+        profiler.wrap(Phases, "handle", "handle", "cat")
+
+        self.assertEqual(Phases.handle(cat, 1), 1)
+        self.assertEqual(Phases.handle(cat=cat), None)
+        Phases.handle(None)
+
+        self.assertEqual(profiler.calls["handle"], 3)
+        self.assertEqual(profiler.cat_calls["handle"][cat.ID], 2)
+        self.assertEqual([c[0] for c in profiler.slowest_cats("handle")], [cat.ID])
+
+        profiler.unwrap_all()
+        self.assertIs(Phases.__dict__["handle"], original)
+
+    def test_instance_and_report(self):
+        profiler = PhaseProfiler()
+        phases = Phases()
+        profiler.wrap(phases, "per_moon", "one_moon")
+
+        self.assertEqual(phases.per_moon(), "moon")
+        self.assertEqual(profiler.moons, 1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            json_path, csv_path = profiler.write_report(directory)
+            with open(json_path, "r", encoding="utf-8") as read_file:
+                report = ujson.loads(read_file.read())
+            with open(csv_path, "r", encoding="utf-8") as read_file:
+                rows = list(csv.reader(read_file))
+
+        self.assertEqual(report["moons"], 1)
+        self.assertEqual(report["phases"]["one_moon"]["calls"], 1)
+        self.assertEqual(rows[0], ["phase", "cat_id", "calls", "seconds"])
+        self.assertEqual(rows[1][:3], ["one_moon", "", "1"])
+
+        profiler.unwrap_all()
+        self.assertNotIn("per_moon", vars(phases))
+
+
+class TestCodeProfiler(unittest.TestCase):
+    def test_frames(self):
+        profiler = CodeProfiler()
+        with tempfile.TemporaryDirectory() as directory:
+            profiler.directory = directory
+            profiler.start_frames(2)
+            self.assertTrue(profiler.running)
+
+            sorted(range(1000), key=str)
+            self.assertIsNone(profiler.frame())
+            report = profiler.frame()
+
+            self.assertFalse(profiler.running)
+            self.assertIn("cumulative", report)
+            self.assertEqual(profiler.last_report, report)
+            self.assertEqual(
+                sorted(os.path.splitext(name)[1] for name in os.listdir(directory)),
+                [".prof", ".txt"],
+            )
+        self.assertIsNone(profiler.frame())
+        self.assertIsNone(profiler.stop())
+
+    def test_moon_with_phase_profiler(self):
+        from scripts.events import events_class
+
+        calls = []
+        events_class.one_moon = lambda: calls.append(1)
+        code_profiler = CodeProfiler()
+        phase_profiler = PhaseProfiler()
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                code_profiler.directory = directory
+                code_profiler.start_moon()
+                # the phase profiler wraps the one_moon of the code profiler
+                phase_profiler.wrap(events_class, "one_moon", "one_moon")
+
+                events_class.one_moon()
+                self.assertIsNotNone(code_profiler.frame())
+                events_class.one_moon()
+                self.assertIsNone(code_profiler.frame())
+                self.assertEqual(2, phase_profiler.calls["one_moon"])
+
+                code_profiler.start_moon()
+                code_profiler.stop()
+                phase_profiler.unwrap_all()
+                events_class.one_moon()
+                self.assertEqual(3, len(calls))
+                self.assertFalse(code_profiler.running)
+        finally:
+            if "one_moon" in vars(events_class):
+                del events_class.one_moon
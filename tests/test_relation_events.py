@@ -5,6 +5,7 @@ from unittest.mock import patch
 from scripts.cat.cats import Cat
 from scripts.cat_relations.relationship import Relationship
 from scripts.clan import Clan
+from scripts.events_module.relation_events import Relation_Events
 from scripts.events_module.relationship.pregnancy_events import Pregnancy_Events
 from scripts.events_module.relationship.romantic_events import Romantic_Events
 
@@ -181,3 +182,26 @@ class Mates(unittest.TestCase):
 
         # then
         self.assertFalse(Romantic_Events.check_if_new_mate(cat1, cat2)[0])
+
+
+class RelationshipConstraints(unittest.TestCase):
+    def test_admiration_constraint(self):
+        # given
+        main_cat = Cat()
+        admirer = Cat()
+        other = Cat()
+        # order: romantic, platonic, dislike, admiration, comfortable, jealousy, trust
+        main_cat.relationships[admirer.ID] = Relationship(
+            main_cat, admirer, False, False, 0, 0, 0, 50, 0, 0, 0
+        )
+        main_cat.relationships[other.ID] = Relationship(
+            main_cat, other, False, False, 0, 0, 0, 10, 0, 0, 0
+        )
+
+        # when
+        cats = Relation_Events.cats_with_relationship_constraints(
+            main_cat, ["admiration_40"]
+        )
+
+        # then
+        self.assertEqual([admirer], cats)
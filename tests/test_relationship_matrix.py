@@ -0,0 +1,128 @@
+import gc
+import os
+import unittest
+
+from scripts.cat.cats import Cat
+from scripts.cat_relations.relationship import Relationship
+from scripts.cat_relations.relationship_matrix import (
+    ValueCondition,
+    compile_value_constraints,
+)
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+
+class TestRelationshipMatrix(unittest.TestCase):
+    def test_relationship_becomes_view(self):
+        cat1 = Cat()
+        cat2 = Cat()
+        relationship = Relationship(cat1, cat2, platonic_like=20, trust=150)
+        cat1.relationships[cat2.ID] = relationship
+
+        relationship.platonic_like += 10
+        self.assertEqual(30, cat1.relationships[cat2.ID].platonic_like)
+        self.assertEqual(100, cat1.relationships[cat2.ID].trust)
+
+        cat1.relationships[cat2.ID].dislike = 5
+        self.assertEqual(5, relationship.dislike)
+        self.assertEqual([cat2.ID], list(cat1.relationships))
+        self.assertNotIn(cat1.ID, cat2.relationships)
+
+    def test_flags_and_log(self):
+        cat1 = Cat()
+        cat2 = Cat()
+        cat3 = Cat()
+        cat1.relationships[cat2.ID] = Relationship(cat1, cat2, mates=True)
+        cat1.relationships[cat3.ID] = Relationship(cat1, cat3, family=True)
+
+        self.assertTrue(cat1.relationships[cat2.ID].mates)
+        self.assertFalse(cat1.relationships[cat2.ID].family)
+        self.assertTrue(cat1.relationships[cat3.ID].family)
+
+        self.assertEqual([], cat1.relationships[cat2.ID].log)
+        cat1.relationships[cat2.ID].log.append("They shared a mouse.")
+        self.assertEqual(["They shared a mouse."], cat1.relationships[cat2.ID].log)
+        self.assertEqual([], cat1.relationships[cat3.ID].log)
+
+        del cat1.relationships[cat2.ID]
+        self.assertEqual(1, len(cat1.relationships))
+        self.assertIsNone(cat1.relationships.get(cat2.ID))
+
+    def test_opposite_relationship(self):
+        cat1 = Cat()
+        cat2 = Cat()
+        cat1.relationships[cat2.ID] = Relationship(cat1, cat2)
+        relationship = cat1.relationships[cat2.ID]
+        self.assertIsNone(relationship.opposite_relationship)
+
+        relationship.link_relationship()
+        self.assertEqual(cat2.relationships[cat1.ID], relationship.opposite_relationship)
+
+    def test_slot_released_with_cat(self):
+        cat1 = Cat()
+        cat2 = Cat()
+        cat1.relationships[cat2.ID] = Relationship(cat1, cat2, romantic_love=10)
+        cat2_id = cat2.ID
+        Cat.all_cats.pop(cat2_id).remove_from_pool()
+        Cat.all_cats_list.remove(cat2)
+        del cat2
+        gc.collect()
+
+        self.assertNotIn(cat2_id, cat1.relationships)
+        self.assertEqual([], cat1.relationships.values())
+
+
+class TestRelationshipQueries(unittest.TestCase):
+    def test_compile_value_constraints(self):
+        conditions, error = compile_value_constraints(("mates", "platonic_50", "trust_20"))
+        self.assertIsNone(error)
+        self.assertEqual(
+            (ValueCondition("platonic_like", 50), ValueCondition("trust", 20)),
+            conditions,
+        )
+
+        conditions, error = compile_value_constraints(
+            ("dislike_10_lower_than",), strict=False
+        )
+        self.assertIsNone(error)
+        self.assertEqual((ValueCondition("dislike", 10, True),), conditions)
+
+        self.assertEqual(
+            "multiple", compile_value_constraints(("trust_10", "trust_20"))[1].problem
+        )
+        self.assertEqual("format", compile_value_constraints(("trust_x",))[1].problem)
+        self.assertEqual("high", compile_value_constraints(("trust_200",))[1].problem)
+        self.assertEqual("low", compile_value_constraints(("trust_0",))[1].problem)
+
+    def test_select_and_sort(self):
+        cat1 = Cat()
+        cat2 = Cat()
+        cat3 = Cat()
+        cat4 = Cat()
+        cat1.relationships[cat2.ID] = Relationship(cat1, cat2, romantic_love=30, dislike=5)
+        cat1.relationships[cat3.ID] = Relationship(
+            cat1, cat3, mates=True, romantic_love=60, dislike=20
+        )
+        cat1.relationships[cat4.ID] = Relationship(cat1, cat4, romantic_love=30)
+
+        romantic_30 = (ValueCondition("romantic_love", 30),)
+        self.assertEqual([cat2, cat3, cat4], cat1.relationships.select(romantic_30))
+        self.assertEqual([cat3], cat1.relationships.select(romantic_30, mates=True))
+        self.assertEqual(
+            [cat2, cat4],
+            cat1.relationships.select(
+                (ValueCondition("dislike", 10, lower_than=True),), mates=False
+            ),
+        )
+        self.assertTrue(cat1.relationships.fulfills(cat3.ID, romantic_30))
+        self.assertFalse(cat1.relationships.fulfills(cat3.ID, (ValueCondition("trust", 1),)))
+        self.assertFalse(cat2.relationships.fulfills(cat1.ID, ()))
+
+        self.assertEqual(
+            [cat3, cat2, cat4],
+            [rel.cat_to for rel in cat1.relationships.sorted_by("romantic_love")],
+        )
+        self.assertEqual(
+            [cat3, cat2], [rel.cat_to for rel in cat1.relationships.sorted_by("dislike")]
+        )
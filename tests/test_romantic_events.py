@@ -1,4 +1,6 @@
+import random
 import unittest
+from unittest.mock import patch
 
 from scripts.cat.cats import Cat, Relationship
 from scripts.events_module.relationship.romantic_events import Romantic_Events
@@ -31,3 +33,40 @@ class RelationshipConditions(unittest.TestCase):
 
         # then
         self.assertTrue(Romantic_Events.relationship_fulfill_condition(rel_fulfill, condition))
+
+
+class NewMateEvents(unittest.TestCase):
+    # test that a third of the related living Clan cats are tried, not a third of all Clan cats
+    def test_picked_from_related_cats(self):
+        cat = Cat(moons=20, status="warrior")
+        candidate = Cat(moons=21, status="warrior")
+        related = [candidate, Cat(moons=3, status="kitten"), Cat(moons=4, status="kitten")]
+        for other_cat in related:
+            cat.relationships[other_cat.ID] = Relationship(cat, other_cat)
+        # cats which aren't related to the cat don't count
+        for _ in range(20):
+            Cat(moons=30, status="warrior")
+
+        population_sizes = []
+        real_sample = random.sample
+
+        def sample(population, k):
+            population_sizes.append(len(population))
+            return real_sample(population, k)
+
+        with patch.object(
+            Romantic_Events, "handle_confession", return_value=False
+        ), patch.object(
+            Romantic_Events, "handle_new_mates", return_value=False
+        ) as handle_new_mates, patch.object(
+            random, "sample", side_effect=sample
+        ):
+            tries = 0
+            for _ in range(300):
+                Romantic_Events.handle_new_mate_events(cat)
+                tries += handle_new_mates.call_count
+                handle_new_mates.reset_mock()
+
+        self.assertEqual(300 * [len(related)], population_sizes)
+        # the candidate is tried when it gets the first of the three positions
+        self.assertTrue(50 < tries < 150, tries)
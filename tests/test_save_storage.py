@@ -0,0 +1,172 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import ujson
+
+from scripts.game_structure.game_essentials import Game
+from scripts.game_structure.save_storage import (
+    DirectoryStorage,
+    PackedStorage,
+    PACKED_FILE_NAME,
+    convert_to_directory,
+    convert_to_packed,
+    is_packed,
+)
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+
+class TestPackedStorage(unittest.TestCase):
+    def setUp(self):
+        self.clan_dir = tempfile.mkdtemp()
+        self.storage = PackedStorage(f"{self.clan_dir}/{PACKED_FILE_NAME}")
+
+    def tearDown(self):
+        self.storage.close()
+        shutil.rmtree(self.clan_dir)
+
+    def test_only_changed_records_are_written(self):
+        self.storage.write_record("history", "1", {"died_by": []})
+        self.storage.write_record("history", "2", {"died_by": []})
+        self.storage.commit()
+        self.assertEqual(2, self.storage.records_written)
+
+        self.storage.write_record("history", "1", {"died_by": []})
+        self.storage.write_record("history", "2", {"died_by": ["fell"]})
+        self.storage.commit()
+        self.assertEqual(3, self.storage.records_written)
+        self.assertEqual(1, self.storage.records_skipped)
+        self.assertEqual({"died_by": ["fell"]}, self.storage.read_record("history", "2"))
+
+    def test_relationships_not_saved_again_are_dropped(self):
+        self.storage.start_cat_save()
+        self.storage.write_record("relationships", "1", [])
+        self.storage.write_record("relationships", "2", [])
+        self.storage.commit()
+
+        self.storage.start_cat_save()
+        self.storage.write_record("relationships", "1", [])
+        self.storage.commit()
+
+        self.assertEqual([], self.storage.read_record("relationships", "1"))
+        self.assertIsNone(self.storage.read_record("relationships", "2"))
+
+    def test_kept_relationships_are_not_dropped(self):
+        self.storage.start_cat_save()
+        self.storage.write_record("relationships", "1", [])
+        self.storage.write_record("relationships", "2", [])
+        self.storage.commit()
+
+        self.storage.start_cat_save()
+        self.storage.keep_record("relationships", "2")
+        self.storage.commit()
+
+        self.assertIsNone(self.storage.read_record("relationships", "1"))
+        self.assertEqual([], self.storage.read_record("relationships", "2"))
+
+    def test_missing_cats(self):
+        with self.assertRaises(FileNotFoundError):
+            self.storage.read_cats()
+
+    def test_used_from_other_threads(self):
+        # the storage is made on the loading thread and saved on the main or the events thread
+        storages = []
+        loader = threading.Thread(
+            target=lambda: storages.append(
+                PackedStorage(f"{self.clan_dir}/other_{PACKED_FILE_NAME}")
+            )
+        )
+        loader.start()
+        loader.join()
+        storage = storages[0]
+
+        storage.write_record("history", "1", {"died_by": []})
+        storage.commit()
+
+        errors = []
+
+        def save():
+            try:
+                storage.write_record("history", "2", {"died_by": []})
+                storage.delete_record("history", "1")
+                storage.commit()
+            except Exception as e:  # pylint: disable=broad-except
+                errors.append(e)
+
+        saver = threading.Thread(target=save)
+        saver.start()
+        saver.join()
+        storage.close()
+
+        self.assertEqual([], errors)
+        storage = PackedStorage(f"{self.clan_dir}/other_{PACKED_FILE_NAME}")
+        self.assertIsNone(storage.read_record("history", "1"))
+        self.assertEqual({"died_by": []}, storage.read_record("history", "2"))
+        storage.close()
+
+
+class TestDirectoryStorage(unittest.TestCase):
+    def setUp(self):
+        self.clan_dir = tempfile.mkdtemp()
+        self.storage = DirectoryStorage(self.clan_dir, Game.safe_save)
+
+    def tearDown(self):
+        shutil.rmtree(self.clan_dir)
+
+    def test_kept_relationships_are_not_dropped(self):
+        self.storage.start_cat_save()
+        self.storage.write_record("relationships", "1", [])
+        self.storage.write_record("relationships", "2", [])
+        self.storage.write_record("relationships", "3", [])
+        self.storage.commit()
+
+        self.storage.start_cat_save()
+        self.storage.write_record("relationships", "1", [{"cat_to_id": "2"}])
+        self.storage.keep_record("relationships", "2")
+        self.storage.commit()
+
+        self.assertEqual(
+            [{"cat_to_id": "2"}], self.storage.read_record("relationships", "1")
+        )
+        self.assertEqual([], self.storage.read_record("relationships", "2"))
+        self.assertIsNone(self.storage.read_record("relationships", "3"))
+
+
+class TestConvertSave(unittest.TestCase):
+    def setUp(self):
+        self.clan_dir = tempfile.mkdtemp()
+        directory = DirectoryStorage(self.clan_dir, Game.safe_save)
+        directory.write_cats([{"ID": "1"}, {"ID": "2"}])
+        directory.write_record("relationships", "1", [{"cat_to_id": "2"}])
+        directory.write_record("conditions", "2", {"injuries": {}})
+        directory.write_record("history", "1", {"died_by": []})
+        directory.write_events([{"text": "An event"}])
+
+    def tearDown(self):
+        shutil.rmtree(self.clan_dir)
+
+    def test_round_trip(self):
+        with open(f"{self.clan_dir}/relationships/1_relations.json") as read_file:
+            relationships = ujson.loads(read_file.read())
+
+        convert_to_packed(self.clan_dir)
+        self.assertTrue(is_packed(self.clan_dir))
+        self.assertFalse(os.path.exists(f"{self.clan_dir}/clan_cats.json"))
+
+        packed = PackedStorage(f"{self.clan_dir}/{PACKED_FILE_NAME}")
+        self.assertEqual([{"ID": "1"}, {"ID": "2"}], packed.read_cats())
+        self.assertEqual(relationships, packed.read_record("relationships", "1"))
+        self.assertEqual([{"text": "An event"}], packed.read_events())
+        packed.close()
+
+        convert_to_directory(self.clan_dir, Game.safe_save)
+        self.assertFalse(is_packed(self.clan_dir))
+        directory = DirectoryStorage(self.clan_dir, Game.safe_save)
+        self.assertEqual([{"ID": "1"}, {"ID": "2"}], directory.read_cats())
+        self.assertEqual(relationships, directory.read_record("relationships", "1"))
+        self.assertEqual({"injuries": {}}, directory.read_record("conditions", "2"))
+        self.assertEqual({"died_by": []}, directory.read_record("history", "1"))
@@ -0,0 +1,184 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import pygame
+
+from scripts.cat.cats import Cat
+from scripts.cat.sprite_atlas import SpriteAtlas
+from scripts.cat.sprite_cache import SpriteCache
+from scripts.cat.sprites import Sprites
+from scripts.utility import prerender_sprites, sprite_cache_key, update_sprite
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+
+class TestSpriteCache(unittest.TestCase):
+    def test_outdated_key_is_a_miss(self):
+        cache = SpriteCache()
+        sprite = pygame.Surface((50, 50), pygame.SRCALPHA)
+        cache.put("1", ("key", 1), sprite)
+
+        self.assertIs(sprite, cache.get("1", ("key", 1)))
+        self.assertIsNone(cache.get("1", ("key", 2)))
+        self.assertIsNone(cache.get("1", ("key", 1)))
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(2, cache.misses)
+        self.assertEqual(1, cache.invalidations)
+        self.assertEqual(0, cache.bytes_used)
+
+    def test_memory_cap(self):
+        sprite_bytes = SpriteCache.surface_bytes(
+            pygame.Surface((50, 50), pygame.SRCALPHA)
+        )
+        cache = SpriteCache(max_bytes=2 * sprite_bytes)
+        for cat_id in ("1", "2", "3"):
+            cache.put(cat_id, (), pygame.Surface((50, 50), pygame.SRCALPHA))
+
+        self.assertEqual(2, len(cache))
+        self.assertEqual(2 * sprite_bytes, cache.bytes_used)
+        self.assertIsNone(cache.get("1", ()))
+        self.assertIsNotNone(cache.get("3", ()))
+
+    def test_scaled_versions_are_kept(self):
+        cache = SpriteCache()
+        sprite = pygame.Surface((50, 50), pygame.SRCALPHA)
+        cache.put("1", (), sprite)
+        sprite_bytes = cache.bytes_used
+
+        scaled = cache.scaled(sprite, (100, 100), True)
+        self.assertEqual((100, 100), scaled.get_size())
+        self.assertIs(scaled, cache.scaled(sprite, (100, 100), True))
+        self.assertIsNot(scaled, cache.scaled(sprite, (100, 100), False))
+        self.assertEqual(
+            sprite_bytes + 2 * SpriteCache.surface_bytes(scaled), cache.bytes_used
+        )
+
+        # sprites which aren't cached are scaled, but not kept
+        other = pygame.Surface((50, 50), pygame.SRCALPHA)
+        self.assertIsNot(
+            cache.scaled(other, (100, 100), True), cache.scaled(other, (100, 100), True)
+        )
+
+        cache.invalidate("1")
+        self.assertEqual(0, cache.bytes_used)
+
+    def test_key_follows_appearance(self):
+        cat = Cat(status="warrior")
+        key = sprite_cache_key(cat)
+        self.assertEqual(key, sprite_cache_key(cat))
+
+        cat.pelt.scars.append("ONE")
+        self.assertNotEqual(key, sprite_cache_key(cat))
+        key = sprite_cache_key(cat)
+
+        cat.dead = True
+        self.assertNotEqual(key, sprite_cache_key(cat))
+
+
+class TestSpriteAtlas(unittest.TestCase):
+    def test_sprites_survive_a_reload(self):
+        sprite = pygame.Surface((50, 50), pygame.SRCALPHA)
+        sprite.fill((10, 20, 30, 40))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sprite_atlas.bin")
+            atlas = SpriteAtlas()
+            atlas.signature = "sheets"
+            atlas.load(path)
+            self.assertIsNone(atlas.get("1", ("key", 1)))
+            atlas.put("1", ("key", 1), sprite)
+            atlas.put("2", ("key", 2), sprite)
+            atlas.save(path, ["1"])
+
+            atlas = SpriteAtlas()
+            atlas.signature = "sheets"
+            atlas.load(path)
+            self.assertEqual(1, len(atlas))
+            loaded = atlas.get("1", ("key", 1))
+            self.assertEqual((10, 20, 30, 40), tuple(loaded.get_at((0, 0))))
+            self.assertIsNone(atlas.get("1", ("key", 2)))
+
+            # sprites made from other sprite sheets are ignored
+            atlas = SpriteAtlas()
+            atlas.signature = "other sheets"
+            atlas.load(path)
+            self.assertIsNone(atlas.get("1", ("key", 1)))
+
+    def test_failed_sprites_are_not_stored(self):
+        pygame.display.set_mode((1, 1))
+        atlas = SpriteAtlas()
+        atlas.signature = "sheets"
+        cat = Cat()
+        with patch("scripts.utility.sprite_atlas", atlas), patch(
+            "scripts.utility.sprite_cache", SpriteCache()
+        ), patch("scripts.utility.try_generate_sprite", return_value=None):
+            update_sprite(cat)
+            self.assertEqual(0, len(atlas))
+            self.assertEqual((50, 50), cat.sprite.get_size())
+
+        with patch("scripts.utility.sprite_atlas", atlas), patch(
+            "scripts.utility.sprite_cache", SpriteCache()
+        ), patch("scripts.utility.try_generate_sprite", return_value=None):
+            prerender_sprites([cat], workers=1)
+            self.assertEqual(0, len(atlas))
+
+
+class TestLazySprites(unittest.TestCase):
+    def test_sheets_are_loaded_when_needed(self):
+        pygame.display.set_mode((1, 1))
+        # load_all adds the clan symbols to the list shared by all instances
+        self.addCleanup(
+            Sprites.clan_symbols.__setitem__, slice(None), list(Sprites.clan_symbols)
+        )
+        sprites = Sprites()
+        sprites.load_all()
+        self.assertEqual({}, sprites.spritesheets)
+        self.assertIn("lines0", sprites.sprites)
+
+        self.assertEqual((50, 50), sprites.sprites["lines0"].get_size())
+        self.assertEqual(["lineart"], list(sprites.spritesheets))
+        with self.assertRaises(KeyError):
+            sprites.sprites["not a sprite"]
+
+        sprites.prewarm(["eyesYELLOW0", "skinBLACK0"])
+        self.assertEqual({"lineart", "eyes", "skin"}, set(sprites.spritesheets))
+
+    def test_sheet_loaded_by_several_threads(self):
+        pygame.display.set_mode((1, 1))
+        self.addCleanup(
+            Sprites.clan_symbols.__setitem__, slice(None), list(Sprites.clan_symbols)
+        )
+        sprites = Sprites()
+        sprites.load_all()
+
+        # the first thread is still cutting the sheet when the second one looks up a sprite of it
+        cutting = threading.Event()
+        cut_group = sprites._cut_group
+
+        def slow_cut_group(*args):
+            cutting.set()
+            time.sleep(0.01)
+            return cut_group(*args)
+
+        sprites._cut_group = slow_cut_group
+        results = []
+
+        def look_up(name):
+            try:
+                results.append(sprites.sprites[name].get_size())
+            except KeyError as e:
+                results.append(e)
+
+        first = threading.Thread(target=look_up, args=("fademask00",))
+        first.start()
+        cutting.wait()
+        second = threading.Thread(target=look_up, args=("fademask220",))
+        second.start()
+        first.join()
+        second.join()
+
+        self.assertEqual([(50, 50), (50, 50)], results)
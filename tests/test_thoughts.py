@@ -2,7 +2,7 @@ import os
 import unittest
 
 from scripts.cat.cats import Cat
-from scripts.cat.thoughts import Thoughts
+from scripts.cat.thoughts import Thoughts, ThoughtIndex
 
 os.environ["SDL_VIDEODRIVER"] = "dummy"
 os.environ["SDL_AUDIODRIVER"] = "dummy"
@@ -68,6 +68,46 @@ class TestNotWorkingThoughts(unittest.TestCase):
         self.assertEqual({"test_not_working_any", "test_not_working_true"}, self.available_thought_ids())
 
 
+class TestThoughtIndex(unittest.TestCase):
+    def setUp(self):
+        self.thoughts = [
+            {"id": "no_constraints", "thoughts": []},
+            {"id": "forest_only", "thoughts": [], "biome": ["Forest"]},
+            {"id": "newleaf_only", "thoughts": [], "season": ["Newleaf"]},
+            {"id": "warrior_only", "thoughts": [], "main_status_constraint": ["warrior"]},
+            {"id": "any_status", "thoughts": [], "main_status_constraint": ["any"]},
+            {"id": "elder_only", "thoughts": [], "main_status_constraint": ["elder"]},
+            {"id": "senior_only", "thoughts": [], "main_age_constraint": ["senior"]},
+            {"id": "not_working", "thoughts": [], "not_working": True},
+            {"id": "working", "thoughts": [], "not_working": False},
+        ]
+        self.index = ThoughtIndex(self.thoughts)
+
+    def test_index_matches_constraint_check(self):
+        cats = [Cat(status="warrior", moons=30), Cat(status="elder", moons=130)]
+        cats[1].injuries["test-injury-1"] = {"severity": "major"}
+
+        for cat in cats:
+            for biome in ["Forest", "Beach"]:
+                for season in ["Newleaf", "Leaf-bare"]:
+                    with self.subTest(status=cat.status, biome=biome, season=season):
+                        expected = [
+                            thought["id"]
+                            for thought in self.thoughts
+                            if Thoughts.thought_fulfill_indexed_constraints(cat, thought, biome, season, "camp1")
+                        ]
+                        found = [
+                            thought["id"]
+                            for thought in self.index.get_thoughts(cat, biome, season, "camp1")
+                        ]
+                        self.assertEqual(expected, found)
+
+    def test_thought_files_are_loaded_once(self):
+        path = "resources/dicts/thoughts/alive/warrior.json"
+        self.assertIs(Thoughts.load_thought_file(path), Thoughts.load_thought_file(path))
+        self.assertIs(Thoughts.get_thought_index(path), Thoughts.get_thought_index(path))
+
+
 class TestsGetStatusThought(unittest.TestCase):
 
     def test_medicine_thought(self):
@@ -1,13 +1,18 @@
 import os
 import unittest
 
+import pygame
+
 from scripts.cat.cats import Cat
 from scripts.cat_relations.relationship import Relationship
 from scripts.utility import (
     get_highest_romantic_relation,
     get_personality_compatibility,
     get_amount_of_cats_with_relation_value_towards,
-    get_alive_clan_queens
+    get_alive_clan_queens,
+    apply_opacity,
+    process_text,
+    adjust_article
 )
 
 os.environ["SDL_VIDEODRIVER"] = "dummy"
@@ -337,3 +342,75 @@ class TestGetQueens(unittest.TestCase):
         # then
         living_cats = [self.test_cat1, self.test_cat2, self.test_cat3, self.test_cat4, self.test_cat5, self.test_cat6]
         self.assertEqual([self.test_cat2.ID], list(get_alive_clan_queens(living_cats)[0].keys()))
+
+
+class TestApplyOpacity(unittest.TestCase):
+    def test_scales_alpha(self):
+        surface = pygame.Surface((3, 2), pygame.SRCALPHA)
+        surface.fill((10, 20, 30, 200))
+        surface.set_at((1, 1), (10, 20, 30, 55))
+
+        apply_opacity(surface, 50)
+
+        self.assertEqual(surface.get_at((0, 0)), pygame.Color(10, 20, 30, 100))
+        self.assertEqual(surface.get_at((1, 1)), pygame.Color(10, 20, 30, 27))
+
+    def test_subsurface(self):
+        surface = pygame.Surface((10, 10), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 255))
+
+        apply_opacity(surface.subsurface((2, 2, 3, 3)), 0)
+
+        self.assertEqual(surface.get_at((2, 2)).a, 0)
+        self.assertEqual(surface.get_at((4, 4)).a, 0)
+        self.assertEqual(surface.get_at((1, 2)).a, 255)
+        self.assertEqual(surface.get_at((5, 4)).a, 255)
+
+
+class TestProcessText(unittest.TestCase):
+    def setUp(self):
+        self.cat_dict = {
+            "m_c": ("Firepaw", Cat.default_pronouns[1]),
+            "r_c": ("Graystripe", Cat.default_pronouns[0]),
+        }
+
+    def test_names_and_tags(self):
+        text = "m_c tells r_c that {PRONOUN/m_c/subject} {VERB/m_c/were/was} right. {PRONOUN/r_c/subject/CAP} {VERB/r_c/agree/agrees}."
+        self.assertEqual(
+            process_text(text, self.cat_dict),
+            "Firepaw tells Graystripe that she was right. They agree.",
+        )
+        # the parsed template is reused
+        self.assertEqual(
+            process_text(text, self.cat_dict),
+            "Firepaw tells Graystripe that she was right. They agree.",
+        )
+
+    def test_braces(self):
+        self.assertEqual(
+            process_text("{insert} m_c} {m_c r_c", self.cat_dict),
+            "{insert} m_c} {m_c Graystripe",
+        )
+
+    def test_bad_tag(self):
+        with self.assertRaises(KeyError):
+            process_text("{PRONOUN/p_l/subject}", self.cat_dict, True)
+
+    def test_replacements(self):
+        self.assertEqual(
+            process_text(
+                "m_c looks at o_c_n and c_n.",
+                self.cat_dict,
+                replacements={"c_n": "ThunderClan", "o_c_n": "RiverClan"},
+            ),
+            "Firepaw looks at RiverClan and ThunderClan.",
+        )
+
+    def test_adjust_article(self):
+        self.assertEqual(
+            adjust_article("a o_c_n warrior and a c_n cat", "o_c_n", "Ember"),
+            "an o_c_n warrior and a c_n cat",
+        )
+        self.assertEqual(
+            adjust_article("a o_c_n warrior", "o_c_n", "Pine"), "a o_c_n warrior"
+        )